@@ -0,0 +1,126 @@
+"""
+Logging overhead benchmark.
+
+Measures the time a request thread spends logging (two INFO messages per request, as the
+handlers in src/api do) with the previous synchronous Logger and with the queue-backed Logger,
+including a slow stream to simulate stderr back-pressure. Each simulated request then waits
+--io-wait-us, standing in for the database round trip during which the listener drains the queue.
+
+Usage:
+    python -m benchmarks.bench_logging [--requests 5000] [--slow-write-us 20] [--io-wait-us 200]
+"""
+import argparse
+import io
+import logging
+import os
+import queue
+import time
+from datetime import datetime
+
+from benchmarks.environment import apply_defaults
+
+apply_defaults()
+
+from src.utils.logger import DrainingQueueListener, JSONFormatter, Logger, NonBlockingQueueHandler  # noqa: E402
+
+
+class SlowStream(io.TextIOBase):
+    """Text stream that takes a fixed time per write, like a congested stderr pipe."""
+
+    def __init__(self, delay_us: float):
+        self.delay = delay_us / 1e6
+
+    def write(self, value):
+        deadline = time.perf_counter() + self.delay
+        while time.perf_counter() < deadline:
+            pass
+        return len(value)
+
+
+class LegacyLogger:
+    """The previous Logger: f-string formatting and a synchronous StreamHandler."""
+
+    def __init__(self, stream):
+        self.logger = logging.getLogger(f'legacy-{id(self)}')
+        self.logger.setLevel(logging.DEBUG)
+        self.logger.propagate = False
+        self.logger.addHandler(logging.StreamHandler(stream))
+
+    def log(self, level, message):
+        timestamp = datetime.now().isoformat()
+        self.logger.info(f'{timestamp} [{level}] {message}')
+
+
+def queue_logger(stream, level=logging.DEBUG, info_sample_rate=1.0):
+    handler = NonBlockingQueueHandler(queue.Queue(maxsize=10000))
+    stream_handler = logging.StreamHandler(stream)
+    stream_handler.setFormatter(JSONFormatter())
+    listener = DrainingQueueListener(handler.queue, stream_handler)
+
+    logger = object.__new__(Logger)
+    logger.logger = logging.getLogger(f'queue-{id(handler)}')
+    logger.logger.setLevel(level)
+    logger.logger.propagate = False
+    logger.logger.addHandler(handler)
+    logger.info_sample_rate = info_sample_rate
+    logger.handler = handler
+    logger.listener = listener
+    listener.start()
+    return logger
+
+
+def run_legacy(logger, requests, io_wait):
+    spent = 0.0
+    for id in range(requests):
+        start = time.perf_counter()
+        logger.log('INFO', f"[/api/v1/customers/{id}] [GET] Retreiving customer with ID {id} from database")
+        logger.log('INFO', f"[/api/v1/customers/{id}] [GET] [200] Customer with ID {id} retreived successfully")
+        spent += time.perf_counter() - start
+        time.sleep(io_wait)
+    return spent / requests * 1e6
+
+
+def run_queue(logger, requests, io_wait):
+    spent = 0.0
+    for id in range(requests):
+        start = time.perf_counter()
+        logger.log('INFO', "[/api/v1/customers/%s] [GET] Retreiving customer with ID %s from database", id, id)
+        logger.log('INFO', "[/api/v1/customers/%s] [GET] [200] Customer with ID %s retreived successfully", id, id)
+        spent += time.perf_counter() - start
+        time.sleep(io_wait)
+    return spent / requests * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--requests', type=int, default=5000, help='Simulated requests per case')
+    parser.add_argument('--slow-write-us', type=float, default=20, help='Time per write of the slow stream')
+    parser.add_argument('--io-wait-us', type=float, default=200, help='Simulated I/O wait per request')
+    args = parser.parse_args()
+    io_wait = args.io_wait_us / 1e6
+
+    devnull = open(os.devnull, 'w')
+    rows = []
+
+    rows.append(('sync, /dev/null', run_legacy(LegacyLogger(devnull), args.requests, io_wait), 0))
+    rows.append(('sync, slow stream', run_legacy(LegacyLogger(SlowStream(args.slow_write_us)), args.requests, io_wait), 0))
+
+    cases = [
+        ('queue, /dev/null', dict(stream=devnull)),
+        ('queue, slow stream', dict(stream=SlowStream(args.slow_write_us))),
+        ('queue, INFO sampled 10%', dict(stream=devnull, info_sample_rate=0.1)),
+        ('queue, INFO disabled', dict(stream=devnull, level=logging.WARNING)),
+    ]
+    for name, options in cases:
+        logger = queue_logger(**options)
+        per_request = run_queue(logger, args.requests, io_wait)
+        logger.listener.stop()
+        rows.append((name, per_request, logger.handler.dropped))
+
+    print(f"{'logger':<26}{'per request (us)':>18}{'dropped':>10}")
+    for name, per_request, dropped in rows:
+        print(f"{name:<26}{per_request:>18.2f}{dropped:>10}")
+
+
+if __name__ == '__main__':
+    main()
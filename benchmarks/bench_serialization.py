@@ -0,0 +1,104 @@
+"""
+Serialization benchmark for the response envelopes.
+
+Compares the previous response path (model_dump() -> dict -> stdlib json via JSONResponse, and
+per-row CustomerBase conversion plus jsonable_encoder for the listing) against the EnvelopeResponse
+path (pydantic-core serialization straight to bytes, one batched row conversion for the listing).
+
+Usage:
+    python -m benchmarks.bench_serialization [--number 2000]
+"""
+import argparse
+import timeit
+from datetime import datetime
+from types import SimpleNamespace
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from fastapi_pagination import Page
+from pydantic import TypeAdapter
+
+from src.schemas.customers import CustomerBase
+from src.schemas.responses import SuccessResponse
+from src.utils.responses import EnvelopeResponse
+
+customers_adapter = TypeAdapter(list[CustomerBase])
+
+
+def build_rows(count: int) -> list[SimpleNamespace]:
+    now = datetime(2025, 1, 1, 12, 0, 0)
+    return [
+        SimpleNamespace(
+            id=index,
+            first_name='John',
+            last_name='Doe',
+            email=f'customer{index}@example.com',
+            password='Asdfghjk1',
+            phone='+1234567890',
+            created_at=now,
+            updated_at=now,
+        )
+        for index in range(1, count + 1)
+    ]
+
+
+def page_legacy(rows):
+    items = [CustomerBase.model_validate(row) for row in rows]
+    page = Page[CustomerBase](items=items, total=len(rows), page=1, size=len(rows), pages=1)
+    return JSONResponse(content=jsonable_encoder(page))
+
+
+def page_envelope(rows):
+    items = customers_adapter.validate_python(rows, from_attributes=True)
+    page = Page[CustomerBase](items=items, total=len(rows), page=1, size=len(rows), pages=1)
+    return EnvelopeResponse(content=page)
+
+
+def single_legacy(row):
+    response = SuccessResponse(data={
+        'id': row.id,
+        'first_name': row.first_name,
+        'last_name': row.last_name,
+        'email': row.email,
+        'phone': row.phone,
+    })
+    return JSONResponse(content=response.model_dump())
+
+
+def single_envelope(row):
+    response = SuccessResponse(data={
+        'id': row.id,
+        'first_name': row.first_name,
+        'last_name': row.last_name,
+        'email': row.email,
+        'phone': row.phone,
+    })
+    return EnvelopeResponse(content=response)
+
+
+def measure(func, arg, number: int) -> float:
+    return min(timeit.repeat(lambda: func(arg), number=number, repeat=5)) / number * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--number', type=int, default=2000, help='Calls per repetition for the single-customer case')
+    args = parser.parse_args()
+
+    rows = build_rows(100)
+    assert page_legacy(rows).body.count(b'"id"') == page_envelope(rows).body.count(b'"id"') == 100
+
+    cases = [
+        ('100-row page', page_legacy, page_envelope, rows, max(args.number // 50, 1)),
+        ('single customer', single_legacy, single_envelope, rows[0], args.number),
+    ]
+
+    print(f"{'case':<18}{'legacy (us)':>14}{'envelope (us)':>16}{'speedup':>10}")
+    for name, legacy, envelope, arg, number in cases:
+        legacy_us = measure(legacy, arg, number)
+        envelope_us = measure(envelope, arg, number)
+        print(f"{name:<18}{legacy_us:>14.1f}{envelope_us:>16.1f}{legacy_us / envelope_us:>9.2f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,94 @@
+"""
+Request body validation benchmark.
+
+Compares the previous path (FastAPI parses the body into a dict, the handler builds
+CustomerRequestBody(**request) with Python AfterValidator functions) against the current one
+(CustomerRequestBody.model_validate_json on the raw bytes, constraints checked by pydantic-core).
+
+Usage:
+    python -m benchmarks.bench_validation [--number 20000]
+"""
+import argparse
+import json
+import timeit
+from typing import Annotated
+
+from pydantic import AfterValidator, BaseModel, Field
+
+from src.schemas.requests import CustomerRequestBody, Login
+from src.schemas.validators import validate_email, validate_only_letters, validate_phone_number
+
+
+def legacy_validate_password(value: str):
+    if len(value) < 8:
+        raise ValueError('Password should be at least 8 characters long')
+    elif not any(char.isupper() for char in value):
+        raise ValueError('Password should contain at least one uppercase letter')
+    elif not any(char.islower() for char in value):
+        raise ValueError('Password should contain at least one lowercase letter')
+    elif not any(char.isdigit() for char in value):
+        raise ValueError('Password should contain at least one digit')
+    return value
+
+
+LegacyAlphaStr = Annotated[str, AfterValidator(validate_only_letters)]
+LegacyEmailStr = Annotated[str, AfterValidator(validate_email)]
+LegacyPhoneNumberStr = Annotated[str, AfterValidator(validate_phone_number)]
+LegacyPasswordStr = Annotated[str, AfterValidator(legacy_validate_password)]
+
+
+class LegacyLogin(BaseModel):
+    email: LegacyEmailStr = Field(...)
+    password: LegacyPasswordStr = Field(...)
+
+
+class LegacyCustomerRequestBody(BaseModel):
+    first_name: LegacyAlphaStr = Field(...)
+    last_name: LegacyAlphaStr = Field(...)
+    email: LegacyEmailStr = Field(...)
+    password: LegacyPasswordStr = Field(...)
+    phone: LegacyPhoneNumberStr = Field(...)
+
+
+CUSTOMER_BODY = json.dumps({
+    'first_name': 'John',
+    'last_name': 'Doe',
+    'email': 'john.doe@example.com',
+    'password': 'Asdfghjk1Asdfghjk1',
+    'phone': '+1234567890',
+}).encode()
+
+LOGIN_BODY = json.dumps({'email': 'john.doe@example.com', 'password': 'Asdfghjk1Asdfghjk1'}).encode()
+
+
+def measure(func, number: int) -> float:
+    return min(timeit.repeat(func, number=number, repeat=5)) / number * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--number', type=int, default=20000, help='Validations per repetition')
+    args = parser.parse_args()
+
+    cases = [
+        (
+            'CustomerRequestBody',
+            lambda: LegacyCustomerRequestBody(**json.loads(CUSTOMER_BODY)),
+            lambda: CustomerRequestBody.model_validate_json(CUSTOMER_BODY),
+        ),
+        (
+            'Login',
+            lambda: LegacyLogin(**json.loads(LOGIN_BODY)),
+            lambda: Login.model_validate_json(LOGIN_BODY),
+        ),
+    ]
+
+    print(f"{'model':<22}{'legacy (us)':>14}{'native (us)':>14}{'saved (us)':>13}")
+    for name, legacy, native in cases:
+        legacy_us = measure(legacy, args.number)
+        native_us = measure(native, args.number)
+        print(f"{name:<22}{legacy_us:>14.2f}{native_us:>14.2f}{legacy_us - native_us:>13.2f}")
+
+
+if __name__ == '__main__':
+    main()
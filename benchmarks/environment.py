@@ -0,0 +1,29 @@
+"""
+Default settings for benchmarks that import modules reading Config.
+
+Values already present in the environment are kept, so a benchmark can still be pointed at a
+real database by exporting the variables before running it.
+"""
+import os
+import tempfile
+
+DEFAULTS = {
+    'APP_NAME': 'Customers API Benchmarks',
+    'HOST': '127.0.0.1',
+    'PORT': '3000',
+    'DATABASE_HOST': 'localhost',
+    'DATABASE_PORT': '3306',
+    'DATABASE_NAME': 'customers',
+    'DATABASE_USER': 'benchmarks',
+    'DATABASE_PASSWORD': 'benchmarks',
+    # Modules importing src.database.models create the tables of the configured database.
+    'DATABASE_URL': f'sqlite:///{os.path.join(tempfile.gettempdir(), "customers-benchmarks.db")}',
+    'TOKEN_SECRET_KEY': 'benchmarks-secret-key',
+    'TOKEN_ALGORITHM': 'HS256',
+    'TOKEN_EXPIRATION_IN_MINUTES': '10',
+}
+
+
+def apply_defaults():
+    for key, value in DEFAULTS.items():
+        os.environ.setdefault(key, value)
@@ -0,0 +1,321 @@
+"""
+End-to-end load test of the API.
+
+Starts the application with uvicorn in a subprocess against a local database (a throwaway
+SQLite file by default, or any DATABASE_URL such as a disposable MySQL) and drives it with
+virtual users running customer sessions through an async httpx client. Each session signs up,
+logs in, reads its details, updates itself, browses the listing and deletes itself.
+
+For every concurrency level the report contains the throughput and the p50/p95/p99 latencies
+per endpoint. The run fails (exit code 1) when a number regresses past the stored thresholds.
+
+Before the sessions, every run measures a baseline on the same server: the median latency of
+sequential GET /health/live requests, which go through the whole middleware stack without
+touching the database. Thresholds are stored relative to this baseline (latencies as multiples
+of it, throughputs as fractions of 1 / baseline), so they carry over between machines of
+different speeds instead of holding the absolute numbers of the machine that produced them.
+
+Usage:
+    python -m benchmarks.load_test [--concurrency 1 8 32] [--duration 10] [--workers 1]
+                                   [--database-url sqlite:///...] [--output results.json]
+                                   [--thresholds benchmarks/load_thresholds.json] [--update-thresholds]
+"""
+import argparse
+import asyncio
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+
+import httpx
+import orjson
+
+from benchmarks.environment import apply_defaults
+
+ROOT_DIRECTORY = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+DEFAULT_THRESHOLDS = os.path.join(ROOT_DIRECTORY, 'benchmarks', 'load_thresholds.json')
+
+ENDPOINTS = ('signup', 'login', 'get_details', 'update', 'list', 'delete')
+
+# Reads dominate a real session: the details are fetched several times per signup.
+DETAIL_READS_PER_SESSION = 4
+LIST_PROBABILITY = 0.5
+
+# Sequential requests measuring the baseline of the run, after a few warm-up ones.
+BASELINE_PATH = '/health/live'
+BASELINE_WARMUP_REQUESTS = 50
+BASELINE_REQUESTS = 500
+
+# Headroom applied to the measured numbers when storing new thresholds; tail latencies are the noisiest.
+THROUGHPUT_HEADROOM = 0.5
+LATENCY_HEADROOM = {'p50_ms': 2.0, 'p95_ms': 2.5, 'p99_ms': 3.0}
+
+
+class Recorder:
+    """
+    Collects the latency and outcome of every request, per endpoint.
+
+    Requests shed by the adaptive concurrency limit (503) are counted apart from the errors:
+    shedding is the expected answer of an overloaded worker, not a failure of the endpoint.
+    """
+
+    def __init__(self):
+        self.latencies = {endpoint: [] for endpoint in ENDPOINTS}
+        self.errors = {endpoint: 0 for endpoint in ENDPOINTS}
+        self.shed = {endpoint: 0 for endpoint in ENDPOINTS}
+
+    async def call(self, endpoint: str, expected_status: int, request):
+        start = time.perf_counter()
+        try:
+            response = await request
+        except httpx.HTTPError:
+            self.errors[endpoint] += 1
+            return None
+        if response.status_code == 503:
+            self.shed[endpoint] += 1
+            return None
+        self.latencies[endpoint].append(time.perf_counter() - start)
+        if response.status_code != expected_status:
+            self.errors[endpoint] += 1
+            return None
+        return response
+
+
+async def run_session(client: httpx.AsyncClient, recorder: Recorder):
+    password = 'Asdfghjk1'
+    payload = {
+        'first_name': 'Load',
+        'last_name': 'Test',
+        'email': f'load-{uuid.uuid4().hex}@example.com',
+        'phone': '+1234567890',
+        'password': password,
+    }
+
+    response = await recorder.call('signup', 201, client.post('/api/v1/customers/', json=payload))
+    if response is None:
+        return
+    customer_id = response.json()['data']['customer']['id']
+
+    response = await recorder.call('login', 200, client.post(
+        '/api/v1/auth/login', json={'email': payload['email'], 'password': password}
+    ))
+    if response is None:
+        return
+    headers = {'Authorization': f"Bearer {response.json()['data']['token']}"}
+
+    for _ in range(DETAIL_READS_PER_SESSION):
+        await recorder.call('get_details', 200, client.get(f'/api/v1/customers/{customer_id}', headers=headers))
+
+    updated_payload = {**payload, 'first_name': 'Updated', 'email': f'load-{uuid.uuid4().hex}@example.com'}
+    response = await recorder.call('update', 201, client.put(
+        f'/api/v1/customers/{customer_id}', json=updated_payload, headers=headers
+    ))
+    if response is not None:
+        headers = {'Authorization': f"Bearer {response.json()['data']['token']}"}
+
+    if random.random() < LIST_PROBABILITY:
+        await recorder.call('list', 200, client.get('/api/v1/customers/', params={'page': random.randint(1, 5), 'size': 50}))
+
+    await recorder.call('delete', 204, client.delete(f'/api/v1/customers/{customer_id}', headers=headers))
+
+
+async def measure_baseline(base_url: str) -> float:
+    """
+    Returns the median latency, in milliseconds, of sequential requests to BASELINE_PATH.
+    """
+    latencies = []
+    async with httpx.AsyncClient(base_url=base_url, timeout=30) as client:
+        for index in range(BASELINE_WARMUP_REQUESTS + BASELINE_REQUESTS):
+            start = time.perf_counter()
+            response = await client.get(BASELINE_PATH)
+            response.raise_for_status()
+            if index >= BASELINE_WARMUP_REQUESTS:
+                latencies.append(time.perf_counter() - start)
+    return percentile(sorted(latencies), 50)
+
+
+async def run_level(base_url: str, concurrency: int, duration: float) -> dict:
+    recorder = Recorder()
+    deadline = time.perf_counter() + duration
+
+    async def virtual_user(client):
+        while time.perf_counter() < deadline:
+            await run_session(client, recorder)
+
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30) as client:
+        start = time.perf_counter()
+        await asyncio.gather(*(virtual_user(client) for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+
+    endpoints = {}
+    for endpoint in ENDPOINTS:
+        latencies = sorted(recorder.latencies[endpoint])
+        endpoints[endpoint] = {
+            'requests': len(latencies),
+            'errors': recorder.errors[endpoint],
+            'shed': recorder.shed[endpoint],
+            'requests_per_second': round(len(latencies) / elapsed, 2),
+            'p50_ms': percentile(latencies, 50),
+            'p95_ms': percentile(latencies, 95),
+            'p99_ms': percentile(latencies, 99),
+        }
+
+    total = sum(endpoint['requests'] for endpoint in endpoints.values())
+    return {
+        'concurrency': concurrency,
+        'duration_seconds': round(elapsed, 2),
+        'requests_per_second': round(total / elapsed, 2),
+        'endpoints': endpoints,
+    }
+
+
+def percentile(sorted_values: list[float], rank: float) -> float | None:
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values) - 1, max(0, int(round(rank / 100 * len(sorted_values))) - 1))
+    return round(sorted_values[index] * 1000, 2)
+
+
+def check_thresholds(results: list[dict], baseline_ms: float, thresholds: dict) -> list[str]:
+    """
+    Compares the results with the stored thresholds, keyed by concurrency level and endpoint.
+    The thresholds are relative to the baseline: they are scaled by baseline_ms, the baseline
+    measured in the same run, before the comparison.
+
+    Returns:
+        list[str]: One message per regression, empty when every number is within its threshold.
+    """
+    failures = []
+    for level in results:
+        level_thresholds = thresholds.get('levels', {}).get(str(level['concurrency']), {})
+        for endpoint, limits in level_thresholds.items():
+            measured = level['endpoints'].get(endpoint)
+            if measured is None:
+                continue
+            if measured['errors'] > limits.get('max_errors', 0):
+                failures.append(f"c={level['concurrency']} {endpoint}: {measured['errors']} errors")
+            if 'min_throughput_ratio' in limits:
+                minimum = round(limits['min_throughput_ratio'] * 1000 / baseline_ms, 2)
+                if measured['requests_per_second'] < minimum:
+                    failures.append(
+                        f"c={level['concurrency']} {endpoint}: {measured['requests_per_second']} req/s < {minimum}"
+                    )
+            for key in ('p50_ms', 'p95_ms', 'p99_ms'):
+                ratio = limits.get(f"max_{key.removesuffix('_ms')}_ratio")
+                if ratio is None or measured[key] is None:
+                    continue
+                limit = round(ratio * baseline_ms, 2)
+                if measured[key] > limit:
+                    failures.append(f"c={level['concurrency']} {endpoint}: {key} {measured[key]} > {limit}")
+    return failures
+
+
+def build_thresholds(results: list[dict], baseline_ms: float) -> dict:
+    """
+    Derives thresholds relative to the baseline from the results of a run, with headroom.
+    """
+    levels = {}
+    for level in results:
+        levels[str(level['concurrency'])] = {
+            endpoint: {
+                'min_throughput_ratio': round(measured['requests_per_second'] * baseline_ms / 1000 * THROUGHPUT_HEADROOM, 5),
+                **{
+                    f"max_{key.removesuffix('_ms')}_ratio": round(measured[key] / baseline_ms * headroom, 2)
+                    for key, headroom in LATENCY_HEADROOM.items()
+                },
+                'max_errors': 0,
+            }
+            for endpoint, measured in level['endpoints'].items()
+            if measured['requests']
+        }
+    return {'baseline': f'p50 of GET {BASELINE_PATH}', 'levels': levels}
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def start_server(database_url: str, port: int, workers: int) -> subprocess.Popen:
+    apply_defaults()
+    env = {**os.environ, 'DATABASE_URL': database_url, 'LOG_LEVEL': os.environ.get('LOG_LEVEL', 'WARNING')}
+    server = subprocess.Popen(
+        [sys.executable, '-m', 'uvicorn', 'main:app', '--host', '127.0.0.1', '--port', str(port),
+         '--workers', str(workers), '--log-level', 'warning', '--no-access-log'],
+        cwd=ROOT_DIRECTORY,
+        env=env,
+    )
+
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError('The API server exited during startup')
+        try:
+            if httpx.get(f'http://127.0.0.1:{port}/metrics', timeout=1).status_code == 200:
+                return server
+        except httpx.HTTPError:
+            time.sleep(0.2)
+    server.terminate()
+    raise RuntimeError('The API server did not start within 30 seconds')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 8, 32], help='Virtual users per level')
+    parser.add_argument('--duration', type=float, default=10, help='Seconds per concurrency level')
+    parser.add_argument('--workers', type=int, default=1, help='uvicorn worker processes')
+    parser.add_argument('--database-url', help='Database to run against, defaults to a throwaway SQLite file')
+    parser.add_argument('--output', help='Write the JSON report to this file instead of stdout')
+    parser.add_argument('--thresholds', default=DEFAULT_THRESHOLDS, help='Stored thresholds to compare against')
+    parser.add_argument('--update-thresholds', action='store_true', help='Store thresholds derived from this run')
+    args = parser.parse_args()
+
+    database_directory = tempfile.mkdtemp(prefix='customers-load-')
+    database_url = args.database_url or f"sqlite:///{os.path.join(database_directory, 'load.db')}"
+
+    port = free_port()
+    server = start_server(database_url, port, args.workers)
+    try:
+        baseline_ms = asyncio.run(measure_baseline(f'http://127.0.0.1:{port}'))
+        results = [
+            asyncio.run(run_level(f'http://127.0.0.1:{port}', concurrency, args.duration))
+            for concurrency in args.concurrency
+        ]
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+
+    report = orjson.dumps(
+        {'database_url': database_url.split('@')[-1], 'baseline_ms': baseline_ms, 'results': results},
+        option=orjson.OPT_INDENT_2,
+    )
+    if args.output:
+        with open(args.output, 'wb') as file:
+            file.write(report)
+    else:
+        sys.stdout.write(report.decode() + '\n')
+
+    if args.update_thresholds:
+        with open(args.thresholds, 'wb') as file:
+            file.write(orjson.dumps(build_thresholds(results, baseline_ms), option=orjson.OPT_INDENT_2) + b'\n')
+        return
+
+    if not os.path.exists(args.thresholds):
+        return
+
+    with open(args.thresholds, 'rb') as file:
+        failures = check_thresholds(results, baseline_ms, orjson.loads(file.read()))
+    if failures:
+        sys.stderr.write('Performance regressions:\n' + '\n'.join(f'  - {failure}' for failure in failures) + '\n')
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,41 @@
+"""
+Micro-benchmarks of the per-request CPU costs (validators, request schemas, JWT, response envelopes).
+
+The suite runs with pytest-benchmark. Baselines are saved under .benchmarks/ (per machine and
+Python version) and a later run is compared with the latest saved baseline, failing when the
+median of a benchmark is slower than the threshold.
+
+Usage:
+    python -m benchmarks.micro save [--name baseline]
+    python -m benchmarks.micro compare [--baseline 0001] [--threshold 10]
+    python -m benchmarks.micro run
+"""
+import argparse
+import os
+import sys
+
+import pytest
+
+SUITE_DIRECTORY = os.path.dirname(os.path.abspath(__file__))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('command', choices=('run', 'save', 'compare'))
+    parser.add_argument('--name', default='baseline', help='Name of the saved baseline')
+    parser.add_argument('--baseline', help='Baseline to compare against (run id or name), defaults to the latest')
+    parser.add_argument('--threshold', type=float, default=10, help='Allowed median slowdown in percent')
+    args, pytest_args = parser.parse_known_args()
+
+    options = [SUITE_DIRECTORY, '-q', '--benchmark-only', '--benchmark-sort=name']
+    if args.command == 'save':
+        options.append(f'--benchmark-save={args.name}')
+    elif args.command == 'compare':
+        options.append(f'--benchmark-compare={args.baseline}' if args.baseline else '--benchmark-compare')
+        options.append(f'--benchmark-compare-fail=median:{args.threshold:g}%')
+
+    sys.exit(pytest.main(options + pytest_args))
+
+
+if __name__ == '__main__':
+    main()
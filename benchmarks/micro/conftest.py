@@ -0,0 +1,43 @@
+"""
+Shared inputs of the micro-benchmarks.
+
+The inputs are fixed so that runs on the same machine are comparable with the saved baselines.
+"""
+from benchmarks.environment import apply_defaults
+
+apply_defaults()
+
+import pytest
+from pydantic import ValidationError
+
+from src.schemas.requests import CustomerRequestBody
+
+CUSTOMER_PAYLOAD = {
+    'first_name': 'John',
+    'last_name': 'Doe',
+    'email': 'john.doe@example.com',
+    'password': 'Asdfghjk1Asdfghjk1',
+    'phone': '+1234567890',
+}
+
+INVALID_CUSTOMER_PAYLOAD = {
+    'first_name': 'John1',
+    'last_name': 'Doe',
+    'email': 'john.doe@',
+    'password': 'asdfghjk',
+    'phone': '1234567890',
+}
+
+
+@pytest.fixture(scope='session')
+def customer_payload() -> dict:
+    return dict(CUSTOMER_PAYLOAD)
+
+
+@pytest.fixture(scope='session')
+def validation_errors() -> list:
+    try:
+        CustomerRequestBody(**INVALID_CUSTOMER_PAYLOAD)
+    except ValidationError as e:
+        return e.errors()
+    raise AssertionError('The invalid payload passed validation')
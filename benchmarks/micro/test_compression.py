@@ -0,0 +1,45 @@
+import pytest
+from fastapi_pagination import Page
+
+from src.schemas.customers import CustomerBase
+from src.utils.compression import CODECS, COMPRESSION_LEVELS
+
+FIRST_NAMES = ['John', 'Jane', 'Maria', 'Carlos', 'Aiko', 'Omar', 'Lena', 'Ravi', 'Sofia', 'Tom']
+LAST_NAMES = ['Doe', 'Smith', 'Garcia', 'Tanaka', 'Haddad', 'Novak', 'Patel', 'Rossi', 'Brown']
+
+# A default listing page (50 customers) as served by GET /api/v1/customers/.
+PAGE = Page[CustomerBase](
+    items=[
+        CustomerBase(
+            id=index,
+            first_name=FIRST_NAMES[index % len(FIRST_NAMES)],
+            last_name=LAST_NAMES[index % len(LAST_NAMES)],
+            email=f'customer{index}@example.com',
+            password=f'$2b$12${index:053d}',
+            phone=f'+1555{index:07d}',
+        )
+        for index in range(1, 51)
+    ],
+    total=100000,
+    page=1,
+    size=50,
+    pages=2000,
+)
+BODY = PAGE.__pydantic_serializer__.to_json(PAGE)
+
+
+@pytest.mark.parametrize('encoding', list(CODECS))
+def test_compress_listing_page(benchmark, encoding):
+    level = COMPRESSION_LEVELS['application/json'][encoding]
+    compressed = benchmark(CODECS[encoding], BODY, level)
+    # CPU time is the benchmark itself; the bytes saved are reported next to it.
+    benchmark.extra_info['bytes_in'] = len(BODY)
+    benchmark.extra_info['bytes_out'] = len(compressed)
+    benchmark.extra_info['ratio'] = len(compressed) / len(BODY)
+    assert len(compressed) < len(BODY)
+
+
+@pytest.mark.parametrize('level', [1, 6, 9])
+def test_gzip_levels(benchmark, level):
+    compressed = benchmark(CODECS['gzip'], BODY, level)
+    benchmark.extra_info['ratio'] = len(compressed) / len(BODY)
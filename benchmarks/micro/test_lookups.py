@@ -0,0 +1,49 @@
+"""
+Python overhead of a customer lookup by id or email: the ORM Query rebuilt on every call,
+against the prebuilt statements of CustomerRepository found in the compiled cache. The lookups
+run on an in-memory SQLite database, so the time is dominated by the ORM, not the database.
+"""
+import pytest
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import Session
+
+from src.database.models import Base, CustomerModel
+from src.database.repository.customers import NOT_DELETED, CustomerRepository
+
+EMAIL = 'john.doe@example.com'
+
+
+@pytest.fixture(scope='module')
+def session():
+    engine = create_engine('sqlite://')
+    Base.metadata.create_all(engine)
+    with engine.begin() as connection:
+        connection.execute(insert(CustomerModel), [
+            {'id': 1, 'first_name': 'John', 'last_name': 'Doe', 'email': EMAIL, 'phone': '+1234567890', 'password': 'x'}
+        ])
+    with Session(engine) as session:
+        yield session
+
+
+def query_by_id(db: Session):
+    return db.query(CustomerModel).filter(CustomerModel.id == 1, NOT_DELETED).first()
+
+
+def query_by_email(db: Session):
+    return db.query(CustomerModel).filter(CustomerModel.email == EMAIL, NOT_DELETED).first()
+
+
+def test_get_by_id_query(benchmark, session):
+    assert benchmark(query_by_id, session).id == 1
+
+
+def test_get_by_id_statement(benchmark, session):
+    assert benchmark(CustomerRepository(session).get_by_id, 1).id == 1
+
+
+def test_get_by_email_query(benchmark, session):
+    assert benchmark(query_by_email, session).email == EMAIL
+
+
+def test_get_by_email_statement(benchmark, session):
+    assert benchmark(CustomerRepository(session).get_by_email, EMAIL).email == EMAIL
@@ -0,0 +1,63 @@
+"""
+Listing a 1,000 row page as full entities validated into CustomerBase, against the same page
+projected with fields=id,email and serialized from the rows. The peak memory of one page is
+saved in the extra_info of the results.
+"""
+import tracemalloc
+
+import orjson
+import pytest
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import Session
+
+from src.api.customers import customers_adapter, to_customers, to_rows
+from src.database.models import Base, CustomerModel
+from src.database.repository.customers import CustomerRepository
+
+ROWS = 1000
+
+
+@pytest.fixture(scope='module')
+def engine():
+    engine = create_engine('sqlite://')
+    Base.metadata.create_all(engine)
+    with engine.begin() as connection:
+        connection.execute(insert(CustomerModel), [
+            {
+                'first_name': 'John',
+                'last_name': 'Doe',
+                'email': f'customer{index}@example.com',
+                'phone': f'+1555{index:07d}',
+                'password': f'$2b$12${index:053d}',
+            }
+            for index in range(ROWS)
+        ])
+    return engine
+
+
+def load_entities(engine) -> bytes:
+    with Session(engine) as db:
+        rows = db.scalars(CustomerRepository(db).get_all().limit(ROWS)).all()
+        return customers_adapter.dump_json(to_customers(rows))
+
+
+def load_projection(engine) -> bytes:
+    with Session(engine) as db:
+        rows = db.execute(CustomerRepository(db).get_all_fields(('id', 'email')).limit(ROWS)).all()
+        return orjson.dumps(to_rows(rows))
+
+
+def peak_memory(function, engine) -> int:
+    tracemalloc.start()
+    try:
+        function(engine)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+@pytest.mark.parametrize('function', [load_entities, load_projection], ids=['entities', 'projection'])
+def test_listing_page(benchmark, engine, function):
+    benchmark.extra_info['peak_memory_bytes'] = peak_memory(function, engine)
+    body = benchmark(function, engine)
+    assert len(orjson.loads(body)) == ROWS
@@ -0,0 +1,26 @@
+import orjson
+
+from src.schemas.requests import CustomerRequestBody, Login
+
+
+def test_customer_request_body(benchmark, customer_payload):
+    body = benchmark(lambda: CustomerRequestBody(**customer_payload))
+    assert body.email == customer_payload['email']
+
+
+def test_customer_request_body_from_json(benchmark, customer_payload):
+    raw = orjson.dumps(customer_payload)
+    body = benchmark(CustomerRequestBody.model_validate_json, raw)
+    assert body.email == customer_payload['email']
+
+
+def test_login(benchmark, customer_payload):
+    credentials = {'email': customer_payload['email'], 'password': customer_payload['password']}
+    login = benchmark(lambda: Login(**credentials))
+    assert login.email == credentials['email']
+
+
+def test_login_from_json(benchmark, customer_payload):
+    raw = orjson.dumps({'email': customer_payload['email'], 'password': customer_payload['password']})
+    login = benchmark(Login.model_validate_json, raw)
+    assert login.email == customer_payload['email']
@@ -0,0 +1,25 @@
+from src.schemas.responses import SuccessResponse, ValidationErrorResponse
+
+CUSTOMER_DATA = {
+    'id': 1,
+    'first_name': 'John',
+    'last_name': 'Doe',
+    'email': 'john.doe@example.com',
+    'phone': '+1234567890',
+}
+
+
+def test_validation_error_response(benchmark, validation_errors):
+    response = benchmark(lambda: ValidationErrorResponse(details=validation_errors))
+    assert len(response.details) == len(validation_errors)
+
+
+def test_success_response_model_dump(benchmark):
+    response = SuccessResponse(data={'customer': CUSTOMER_DATA, 'token': 'x' * 160})
+    dumped = benchmark(response.model_dump)
+    assert dumped['data']['customer'] == CUSTOMER_DATA
+
+
+def test_success_response_to_json(benchmark):
+    response = SuccessResponse(data={'customer': CUSTOMER_DATA, 'token': 'x' * 160})
+    assert benchmark(response.__pydantic_serializer__.to_json, response)
@@ -0,0 +1,16 @@
+from src.utils.token import JWTManager
+
+TOKEN_PAYLOAD = {'id': 1, 'email': 'john.doe@example.com'}
+
+
+def test_jwt_encode(benchmark):
+    token_manager = JWTManager(secret_key='benchmarks-secret-key', algorithm='HS256', expiration_in_minutes=10)
+    token = benchmark(token_manager.encode, TOKEN_PAYLOAD)
+    assert isinstance(token, str)
+
+
+def test_jwt_decode(benchmark):
+    token_manager = JWTManager(secret_key='benchmarks-secret-key', algorithm='HS256', expiration_in_minutes=60)
+    token = token_manager.encode(TOKEN_PAYLOAD)
+    decoded = benchmark(token_manager.decode, token)
+    assert decoded['id'] == TOKEN_PAYLOAD['id']
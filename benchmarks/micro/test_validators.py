@@ -0,0 +1,17 @@
+from src.schemas.validators import validate_email, validate_only_letters, validate_password, validate_phone_number
+
+
+def test_validate_only_letters(benchmark):
+    assert benchmark(validate_only_letters, 'Johnathan') == 'Johnathan'
+
+
+def test_validate_email(benchmark):
+    assert benchmark(validate_email, 'john.doe@example.com') == 'john.doe@example.com'
+
+
+def test_validate_phone_number(benchmark):
+    assert benchmark(validate_phone_number, '+1234567890') == '+1234567890'
+
+
+def test_validate_password(benchmark):
+    assert benchmark(validate_password, 'Asdfghjk1Asdfghjk1') == 'Asdfghjk1Asdfghjk1'
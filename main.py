@@ -1,12 +1,78 @@
+import asyncio
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi_pagination import add_pagination
 import uvicorn
 
 from src.utils.config import Config
+from src.utils.responses import EnvelopeResponse
+from src.middleware.metrics import MetricsMiddleware
+from src.middleware.timing import ServerTimingMiddleware
+from src.middleware.profiling import ProfilingMiddleware
+from src.middleware.concurrency import AdaptiveConcurrencyMiddleware
+from src.middleware.compression import CompressionMiddleware
+from src.middleware.idempotency import IdempotencyMiddleware
+from src.utils.idempotency import create_store
+from src.utils.compression import ResponseCompressor
+from src.utils.limiter import AdaptiveLimiter
+from src.utils.timing import SpanFileExporter
+from src.utils.profiling import ProfileStore, install_profiling_hooks
+from src.utils.metrics import MetricsRegistry
+from src.database.connection import DatabaseConnection, engine
+from src.database.email_filter import EmailFilter
+from src.database.purger import SoftDeletePurger
+from src.events.publisher import OutboxPublisher
+from src.events.sinks import create_sink
 from src.api.router import version_router
+from src.api.customers import read_flight
+from src.api.metrics import router as metrics_router, flush_metrics
+from src.api.admin import router as admin_router
+from src.api.health import router as health_router, prober
 
 settings = Config()
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Starts the background tasks of the worker and cancels them on shutdown.
+    """
+    tasks = []
+    if settings.metrics_multiprocess_dir:
+        tasks.append(asyncio.create_task(
+            flush_metrics(settings.metrics_multiprocess_dir, settings.metrics_flush_interval_seconds)
+        ))
+    sink = None
+    if settings.event_sink:
+        sink = create_sink(settings.event_sink)
+        publisher = OutboxPublisher(engine, sink, settings.outbox_batch_size)
+        MetricsRegistry().register_collector('outbox', publisher.stats)
+        tasks.append(asyncio.create_task(publisher.run(settings.outbox_poll_interval_seconds)))
+    if settings.email_filter_enabled:
+        email_filter = EmailFilter()
+        MetricsRegistry().register_collector('email_filter', email_filter.stats)
+        tasks.append(asyncio.create_task(asyncio.to_thread(email_filter.warm, DatabaseConnection)))
+    MetricsRegistry().register_collector('singleflight', read_flight.stats)
+    MetricsRegistry().register_collector('health', prober.stats)
+    tasks.append(asyncio.create_task(prober.run(settings.health_probe_interval_seconds)))
+    if settings.purge_enabled:
+        purger = SoftDeletePurger(
+            engine,
+            settings.purge_batch_size,
+            settings.purge_max_rows_per_second,
+            settings.change_feed_retention_seconds,
+        )
+        MetricsRegistry().register_collector('soft_delete_purge', purger.stats)
+        tasks.append(asyncio.create_task(purger.run(settings.purge_interval_seconds)))
+    yield
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    if sink is not None:
+        sink.close()
+
+
 app = FastAPI(
     title=settings.app_name,
     description='',
@@ -14,10 +80,57 @@ app = FastAPI(
     docs_url='/docs',
     redoc_url='/redoc',
     openapi_url='/openapi.json',
+    default_response_class=EnvelopeResponse,
+    lifespan=lifespan,
 )
+if settings.server_timing_enabled or settings.trace_export_path:
+    app.add_middleware(
+        ServerTimingMiddleware,
+        emit_header=settings.server_timing_enabled,
+        exporter=SpanFileExporter(settings.trace_export_path, settings.app_name) if settings.trace_export_path else None,
+    )
+if settings.profiling_secret or settings.profiling_sample_rate > 0:
+    app.add_middleware(
+        ProfilingMiddleware,
+        store=ProfileStore(settings.profiling_dir, settings.profiling_max_files),
+        secret=settings.profiling_secret,
+        sample_rate=settings.profiling_sample_rate,
+    )
+if settings.idempotency_enabled:
+    app.add_middleware(
+        IdempotencyMiddleware,
+        store=create_store(settings.idempotency_store, settings.idempotency_max_entries, settings.idempotency_ttl_seconds),
+        wait_timeout=settings.idempotency_wait_seconds,
+    )
+if settings.compression_enabled:
+    compressor = ResponseCompressor(settings.compression_cache_entries)
+    MetricsRegistry().register_collector('compression', compressor.stats)
+    app.add_middleware(
+        CompressionMiddleware,
+        compressor=compressor,
+        minimum_size=settings.compression_minimum_size,
+        offload_size=settings.compression_offload_size,
+    )
+if settings.concurrency_limit_enabled:
+    limiter = AdaptiveLimiter(
+        initial_limit=settings.concurrency_limit_initial,
+        min_limit=settings.concurrency_limit_min,
+        max_limit=settings.concurrency_limit_max,
+        latency_tolerance=settings.concurrency_latency_tolerance,
+        pool_wait_threshold=settings.concurrency_pool_wait_threshold_seconds,
+    )
+    MetricsRegistry().register_collector('concurrency_limit', limiter.stats)
+    app.add_middleware(AdaptiveConcurrencyMiddleware, limiter=limiter, retry_after=settings.concurrency_retry_after_seconds)
+app.add_middleware(MetricsMiddleware)
 app.include_router(version_router)
+app.include_router(metrics_router)
+app.include_router(admin_router)
+app.include_router(health_router)
 add_pagination(app)
 
+if settings.profiling_secret or settings.profiling_sample_rate > 0:
+    install_profiling_hooks(app)
+
 if __name__ == '__main__':
     uvicorn.run(
         app=app,
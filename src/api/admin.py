@@ -0,0 +1,59 @@
+from fastapi import APIRouter, Depends, Path, status
+from fastapi.responses import FileResponse
+
+from src.schemas.responses import SuccessResponse, BadResponse
+from src.utils.config import Config
+from src.utils.dependencies import verify_admin_token
+from src.utils.profiling import ProfileStore
+from src.utils.responses import EnvelopeResponse
+
+settings = Config()
+
+router = APIRouter(
+    prefix='/admin/profiles',
+    tags=['Admin'],
+    dependencies=[Depends(verify_admin_token)],
+    include_in_schema=False,
+)
+
+
+def get_profile_store() -> ProfileStore:
+    return ProfileStore(settings.profiling_dir, settings.profiling_max_files)
+
+
+@router.get('/')
+def list_profiles(store: ProfileStore = Depends(get_profile_store)):
+    """
+    List the stored request profiles, newest first.\n
+    **URL:** /admin/profiles/\n
+    **Method:** GET\n
+    **Auth required:** YES (X-Admin-Token header with the PROFILING_SECRET)\n
+    **Responses:**\n
+        - 200: The name, size and creation time of every stored profile.\n
+        - 401: Missing or invalid admin token.\n
+    """
+    return EnvelopeResponse(content=SuccessResponse(data=store.list()), status_code=status.HTTP_200_OK)
+
+
+@router.get('/{name}')
+def get_profile(
+    store: ProfileStore = Depends(get_profile_store),
+    name: str = Path(..., title='Profile name', description='Name returned in the X-Profile-Id header')
+    ):
+    """
+    Download a stored request profile (pstats format, load it with pstats.Stats or snakeviz).\n
+    **URL:** /admin/profiles/{name}\n
+    **Method:** GET\n
+    **Auth required:** YES (X-Admin-Token header with the PROFILING_SECRET)\n
+    **Responses:**\n
+        - 200: The pstats file.\n
+        - 401: Missing or invalid admin token.\n
+        - 404: Profile not found.\n
+    """
+    path = store.path(name)
+
+    if path is None:
+        response = BadResponse(message='Profile not found')
+        return EnvelopeResponse(content=response, status_code=status.HTTP_404_NOT_FOUND)
+
+    return FileResponse(path, media_type='application/octet-stream', filename=name)
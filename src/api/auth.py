@@ -1,5 +1,4 @@
-from fastapi import APIRouter, Body, status, HTTPException, Depends
-from fastapi.responses import JSONResponse
+from fastapi import APIRouter, status, HTTPException, Depends
 from pydantic import ValidationError
 from sqlalchemy.orm import Session
 
@@ -7,18 +6,17 @@ from src.schemas.requests import Login
 from src.schemas.responses import ValidationErrorResponse, SuccessResponse, BadResponse
 from src.utils.token import JWTManager
 from src.utils.logger import Logger
+from src.utils.dependencies import get_request_body, request_body_openapi
+from src.utils.responses import EnvelopeResponse
+from src.utils.timing import span
 from src.database.connection import get_database_connection
 from src.database.repository.customers import CustomerRepository
 
 router = APIRouter(prefix='/auth', tags=['Authentication'])
 
-@router.post('/login')
+@router.post('/login', openapi_extra=request_body_openapi(Login))
 def login(
-    credentials: dict = Body(
-        ...,
-        title='Customers Credentiales for login',
-        json_schema_extra=Login.schema()
-        ),
+    credentials: bytes = Depends(get_request_body),
     db: Session = Depends(get_database_connection)):
     """
     Authenticates a user based on provided credentials.\n
@@ -27,7 +25,7 @@ def login(
     **Auth required:** NO\n
     **Permissions required:** None\n
     **Args:** \n
-        credentials (dict): A dictionary containing the user's login credentials.\n
+        credentials (bytes): Raw JSON request body containing the user's login credentials.\n
         db (Session): Database session dependency.\n
     **Responses:**\n
         - 200 OK: If the user is authenticated successfully, returns a token.\n
@@ -43,44 +41,45 @@ def login(
     """
 
     logger = Logger()
-    logger.log('INFO', f"[/api/v1/auth/login] [POST] Authenticating user with credentials {credentials}")
+    logger.log('INFO', "[/api/v1/auth/login] [POST] Authenticating user")
 
     try:
-        credentials = Login(**credentials)
+        with span('validate'):
+            credentials = Login.model_validate_json(credentials)
     except ValidationError as e:
-        logger.log('ERROR', f"[/api/v1/auth/login] [POST] [400] Error validating request body")
+        logger.log('ERROR', "[/api/v1/auth/login] [POST] [400] Error validating request body")
         errors_details = e.errors()
 
         response = ValidationErrorResponse(details=errors_details)
 
-        return JSONResponse(content=response.model_dump(), status_code=status.HTTP_400_BAD_REQUEST)
+        return EnvelopeResponse(content=response, status_code=status.HTTP_400_BAD_REQUEST)
 
     customer_repository = CustomerRepository(db)
     customer = customer_repository.get_by_email(credentials.email)
 
     if not customer:
-        logger.log('ERROR', f"[/api/v1/auth/login] [POST] [401] User not found")
+        logger.log('ERROR', "[/api/v1/auth/login] [POST] [401] User not found")
         
         response = BadResponse(message='Customer not found')
-        return JSONResponse(content=response.model_dump(), status_code=status.HTTP_404_NOT_FOUND)
+        return EnvelopeResponse(content=response, status_code=status.HTTP_404_NOT_FOUND)
     else:
         if not customer.password == credentials.password:
-            logger.log('ERROR', f"[/api/v1/auth/login] [POST] [401] Invalid password")
+            logger.log('ERROR', "[/api/v1/auth/login] [POST] [401] Invalid password")
             
             response = BadResponse(message='Invalid password')
-            return JSONResponse(content=response.model_dump(), status_code=status.HTTP_401_UNAUTHORIZED)
+            return EnvelopeResponse(content=response, status_code=status.HTTP_401_UNAUTHORIZED)
         else:
             try:
                 token_manager = JWTManager()
                 token = token_manager.encode(credentials.model_dump())
             except Exception as e:
-                logger.log('ERROR', f"[/api/v1/auth/login] [POST] [500] Error generating token: {str(e)}")
+                logger.log('ERROR', "[/api/v1/auth/login] [POST] [500] Error generating token: %s", e)
                 
                 response = BadResponse(message='Possible error generating token')
-                return JSONResponse(content=response.model_dump(), status_code=status.HTTP_500_INTERNAL_SERVER_ERROR)
+                return EnvelopeResponse(content=response, status_code=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
             http_response = SuccessResponse(data={'token': token})
 
-            logger.log('INFO', f"[/api/v1/auth/login] [POST] [200] User authenticated successfully")
+            logger.log('INFO', "[/api/v1/auth/login] [POST] [200] User authenticated successfully")
             
-            return JSONResponse(content=http_response.model_dump(), status_code=status.HTTP_200_OK) 
+            return EnvelopeResponse(content=http_response, status_code=status.HTTP_200_OK) 
@@ -1,19 +1,31 @@
-from fastapi import APIRouter, Body, Depends, Header, Path, status, Query
-from fastapi.responses import JSONResponse, Response
-from fastapi_pagination import Page
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+from fastapi import APIRouter, Depends, Header, Path, status, Query
+from fastapi.responses import Response
+from fastapi_pagination import Page, Params, set_page
 from fastapi_pagination.ext.sqlalchemy import paginate
-from pydantic import ValidationError
+from pydantic import ValidationError, TypeAdapter
+from sqlalchemy import Row
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm.exc import StaleDataError
 
-from src.schemas.customers import CustomerBase
-from src.schemas.requests import CustomerRequestBody
+from src.schemas.customers import CustomerBase, CustomerChange
+from src.schemas.requests import BatchGetRequestBody, CustomerRequestBody
 from src.schemas.responses import SuccessResponse, ValidationErrorResponse, BadResponse
-from src.utils.dependencies import JWTBearerDependencie
+from src.utils.dependencies import JWTBearerDependencie, get_limited_request_body, get_request_body, request_body_openapi
+from src.utils.config import Config
+from src.utils.etag import body_etag, etag_matches, version_etag
+from src.utils.cursor import decode_cursor, encode_cursor, from_position, parse_timestamp, to_position
 from src.utils.logger import Logger
 from src.utils.token import JWTManager
+from src.utils.responses import EnvelopeResponse
+from src.utils.singleflight import SingleFlight
+from src.utils.timing import span
 from src.database.connection import get_database_connection
-from src.database.repository.customers import CustomerRepository
+from src.database.email_filter import EmailFilter
+from src.database.repository.customers import CustomerRepository, DETAIL_FIELDS as CUSTOMER_DETAIL_FIELDS, PUBLIC_FIELDS
 from src.database.models import CustomerModel
 
 
@@ -22,12 +34,78 @@ router = APIRouter(
     tags=['Customers']
 )
 
+settings = Config()
+
+customers_adapter = TypeAdapter(list[CustomerBase])
+
+changes_adapter = TypeAdapter(list[CustomerChange])
+
+# Identical concurrent reads (same route, parameters and principal) share one database query.
+read_flight = SingleFlight(settings.singleflight_timeout_seconds, settings.singleflight_enabled)
+
+def to_customers(rows: list[CustomerModel]) -> list[CustomerBase]:
+    """
+    Converts a page of ORM rows to CustomerBase instances in a single pydantic-core call.
+    """
+    return customers_adapter.validate_python(rows, from_attributes=True)
+
+
+def to_rows(rows: list[Row]) -> list[dict]:
+    """
+    Converts a page of projected rows to dicts, serialized as they are without a model.
+    """
+    return [row._asdict() for row in rows]
+
+
+def to_customer_details(row: Row | None) -> dict | None:
+    """
+    Converts the detail columns and the row version to a dict, so the result can be shared
+    between coalesced requests.
+    """
+    if row is None:
+        return None
+    return row._asdict()
+
+
+def parse_fields(value: str | None, allowed: tuple[str, ...]) -> tuple[str, ...] | None:
+    """
+    Parses a fields= query parameter (comma separated field names) into the fields to return,
+    in request order. Returns None when the parameter is omitted.
+
+    Raises:
+        ValueError: If no field or a field outside allowed is requested.
+    """
+    if value is None:
+        return None
+    fields = tuple(dict.fromkeys(field.strip() for field in value.split(',') if field.strip()))
+    if not fields or any(field not in allowed for field in fields):
+        raise ValueError(f"Invalid fields parameter, expected a comma separated subset of {', '.join(allowed)}")
+    return fields
+
+
+def not_modified(etag: str) -> Response:
+    """
+    Returns the 304 response of a conditional GET, without a body.
+    """
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={'ETag': etag})
+
 
 @router.get('/')
-def get_all_customers(db: Session = Depends(get_database_connection)) -> Page[CustomerBase]:
+def get_all_customers(
+    db: Session = Depends(get_database_connection),
+    params: Params = Depends(),
+    fields: str | None = Query(
+        None,
+        description=f"Comma separated fields to return, a subset of {', '.join(PUBLIC_FIELDS)}. Omit it for every field."
+        ),
+    if_none_match: str | None = Header(None),
+    ) -> Page[CustomerBase]:
     """
     Retrieve all customers from the database.\n
     This endpoint retrieves all customers from the database and paginates the results.\n
+    With `fields` only the requested columns are selected and the rows are serialized without building models.\n
+    Concurrent requests for the same page share one database query.\n
+    Pages carry a weak ETag derived from their body; a request with a matching If-None-Match gets a 304 without a body.\n
 
     **URL:** /api/v1/customers/\n
     **Method:** GET\n
@@ -36,23 +114,223 @@ def get_all_customers(db: Session = Depends(get_database_connection)) -> Page[Cu
 
     **Args** \n
         - db (Session): Database session dependency, provided by FastAPI's Depends. \n
+        - params (Params): Page number and size query parameters. \n
+        - fields (str): Comma separated fields to return. \n
+        - if_none_match (str): ETags of the page cached by the client. \n
     **Responses** \n
         - 200: A paginated list of customers (Page[CustomerBase]). \n
+        - 304: The page is unchanged. \n
+        - 400: The fields parameter holds an unknown field. \n
     **Logs Levels** \n
         - INFO: Logs the start of the customer retrieval process. \n
         - INFO: Logs the successful completion of the customer retrieval process. \n
     """
     logger = Logger()
     
-    logger.log('INFO', f"[/api/v1/customers/] [GET] Retreiving customers from database")
+    logger.log('INFO', "[/api/v1/customers/] [GET] Retreiving customers from database")
+
+    try:
+        projection = parse_fields(fields, PUBLIC_FIELDS)
+    except ValueError as e:
+        logger.log('ERROR', "[/api/v1/customers/] [GET] [400] Invalid fields parameter")
+
+        return EnvelopeResponse(content=BadResponse(message=str(e)), status_code=status.HTTP_400_BAD_REQUEST)
+
+    customer_repository = CustomerRepository(db)
+
+    def load_page():
+        with span('db.paginate'):
+            if projection is None:
+                return paginate(db, customer_repository.get_all(), params=params, transformer=to_customers)
+            with set_page(Page[Any]):
+                return paginate(
+                    db,
+                    customer_repository.get_all_fields(projection),
+                    params=params,
+                    unwrap_mode='no-unwrap',
+                    transformer=to_rows,
+                )
+
+    result = read_flight.do(('GET /customers/', params.page, params.size, projection), load_page)
+
+    response = EnvelopeResponse(content=result, status_code=status.HTTP_200_OK)
+
+    etag = body_etag(response.body)
+
+    if etag_matches(if_none_match, etag):
+        logger.log('INFO', "[/api/v1/customers/] [GET] [304] Customers not modified")
+
+        return not_modified(etag)
+
+    response.headers['ETag'] = etag
+
+    logger.log('INFO', "[/api/v1/customers/] [GET] [200] Customers retreived successfully")
+
+    return response
+
+
+@router.get('/changes')
+def get_customer_changes(
+    db: Session = Depends(get_database_connection),
+    since: str | None = Query(
+        None,
+        description='Cursor returned as next_cursor by the previous call, or an ISO 8601 timestamp. Omit it for a full sync.'
+        ),
+    limit: int = Query(100, ge=1, le=1000, description='Maximum number of changes and of deletions returned')
+    ):
+    """
+    Retrieve the customers changed and deleted since a cursor.\n
+    This endpoint returns the customers created or updated after the cursor, ordered by (updated_at, id),\n
+    and the customers deleted after the cursor, ordered by deletion time. Consumers apply the changes,\n
+    then the deletions, and pass next_cursor as `since` on the next call; they call again at once while\n
+    has_more is true. Rows changed in the last CHANGE_FEED_SETTLE_SECONDS are returned by a later call,\n
+    so transactions still committing are not skipped. Timestamps are in UTC.\n
+    Tombstones are purged after CHANGE_FEED_RETENTION_SECONDS: an older cursor is answered with a 410,\n
+    and the consumer starts a full sync again.\n
+
+    **URL:** /api/v1/customers/changes\n
+    **Method:** GET\n
+    **Auth required:** NO\n
+    **Permissions required:** None\n
+
+    **Args:**\n
+        - db (Session): Database session dependency.\n
+        - since (str): Cursor or ISO 8601 timestamp to return the changes after.\n
+        - limit (int): Maximum number of changes and of deletions returned.\n
+    **Responses:**\n
+        - 200: The changes, the deletions, next_cursor and has_more.\n
+        - 400: The since parameter is not a valid cursor or timestamp.\n
+        - 410: The cursor is older than the retention of the deletions.\n
+    **Log Levels:**\n
+        - INFO: Logs the start and successful completion of the retrieval.\n
+        - ERROR: Logs an invalid or expired since parameter.\n
+    """
+    logger = Logger()
+
+    logger.log('INFO', "[/api/v1/customers/changes] [GET] Retreiving customer changes since %s", since)
+
+    try:
+        if since is None:
+            changes_after = deletions_after = None
+        elif since[:1].isdigit():
+            timestamp = parse_timestamp(since)
+            changes_after = deletions_after = (timestamp, 0)
+        else:
+            cursor = decode_cursor(since)
+            changes_after, deletions_after = to_position(cursor.get('changes')), to_position(cursor.get('deletions'))
+    except ValueError:
+        logger.log('ERROR', "[/api/v1/customers/changes] [GET] [400] Invalid since parameter")
+
+        response = BadResponse(message='Invalid since parameter, expected a cursor or an ISO 8601 timestamp')
+
+        return EnvelopeResponse(content=response, status_code=status.HTTP_400_BAD_REQUEST)
+
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+
+    if deletions_after is not None and deletions_after[0] < now - timedelta(seconds=settings.change_feed_retention_seconds):
+        logger.log('ERROR', "[/api/v1/customers/changes] [GET] [410] Expired since parameter")
+
+        response = BadResponse(message='Cursor expired, deletions since it were purged: sync again without since')
+
+        return EnvelopeResponse(content=response, status_code=status.HTTP_410_GONE)
+
+    until = now - timedelta(seconds=settings.change_feed_settle_seconds)
 
     customer_repository = CustomerRepository(db)
 
-    result = paginate(db, customer_repository.get_all())
+    customers = customer_repository.get_changes(changes_after, until, limit + 1)
+    tombstones = customer_repository.get_deletions(deletions_after, until, limit + 1)
+
+    deletions_done = len(tombstones) <= limit
+    has_more = len(customers) > limit or not deletions_done
+    customers, tombstones = customers[:limit], tombstones[:limit]
+
+    if customers:
+        changes_after = (customers[-1].updated_at, customers[-1].id)
+    if tombstones:
+        deletions_after = (tombstones[-1].deleted_at, tombstones[-1].id)
+    if deletions_done:
+        # Every tombstone up to until was returned, so the position moves to until and the cursor of a consumer
+        # seeing no deletions does not expire. Truncated to milliseconds, the precision of SQLite timestamps.
+        settled = (until.replace(microsecond=until.microsecond // 1000 * 1000), 0)
+        deletions_after = max(deletions_after, settled) if deletions_after is not None else settled
+
+    response = SuccessResponse(data={
+        'changes': changes_adapter.validate_python(customers, from_attributes=True),
+        'deletions': [{'id': tombstone.customer_id, 'deleted_at': tombstone.deleted_at} for tombstone in tombstones],
+        'next_cursor': encode_cursor({'changes': from_position(changes_after), 'deletions': from_position(deletions_after)}),
+        'has_more': has_more,
+    })
+
+    logger.log('INFO', "[/api/v1/customers/changes] [GET] [200] %s changes and %s deletions retreived", len(customers), len(tombstones))
 
-    logger.log('INFO', f"[/api/v1/customers/] [GET] [200] Customers retreived successfully")
+    return EnvelopeResponse(content=response, status_code=status.HTTP_200_OK)
 
-    return result
+
+# Largest batch get body read: {"ids": [...]} with BATCH_GET_MAX_IDS ids of up to 20 digits and their separators.
+BATCH_GET_MAX_BODY_BYTES = 64 + 24 * settings.batch_get_max_ids
+
+
+@router.post('/batch-get', openapi_extra=request_body_openapi(BatchGetRequestBody))
+def batch_get_customers(
+    db: Session = Depends(get_database_connection),
+    decoded_token: dict = Depends(JWTBearerDependencie()),
+    request: bytes = Depends(get_limited_request_body(BATCH_GET_MAX_BODY_BYTES))
+    ):
+    """
+    Retrieve the details of several customers by ID.\n
+    This endpoint resolves up to BATCH_GET_MAX_IDS ids in one request and one indexed query (the customer logged in),\n
+    instead of one request and one query per ID. Results are returned in request order; each one carries\n
+    the status the details endpoint would return for its ID, with the same authorization rules:\n
+    a customer logged in only has access to its own details, every other ID is forbidden whether it exists or not.\n
+
+    **URL:** /api/v1/customers/batch-get\n
+    **Method:** POST\n
+    **Auth required:** YES\n
+    **Permissions required:** None\n
+
+    **Args:**\n
+        - db (Session): Database session dependency.\n
+        - decoded_token (dict): Decoded JWT token dependency.\n
+        - request (bytes): Raw JSON request body containing the ids.\n
+    **Responses:**\n
+        - 200: One result per requested ID: status 200 with the customer, 403 (forbidden), or 404 when the customer logged in no longer exists.\n
+        - 400: Bad request if the request body validation fails or holds more than BATCH_GET_MAX_IDS ids.\n
+        - 413: The request body is larger than BATCH_GET_MAX_IDS ids can be, it is rejected before being read.\n
+    **Log Levels:**\n
+        - INFO: Logs the start and successful completion of the retrieval.\n
+        - ERROR: Logs an invalid request body.\n
+    """
+    logger = Logger()
+
+    try:
+        with span('validate'):
+            body = BatchGetRequestBody.model_validate_json(request)
+    except ValidationError as e:
+        logger.log('ERROR', "[/api/v1/customers/batch-get] [POST] [400] Error validating request body")
+
+        error_response = ValidationErrorResponse(details=e.errors())
+
+        return EnvelopeResponse(content=error_response, status_code=status.HTTP_400_BAD_REQUEST)
+
+    logger.log('INFO', "[/api/v1/customers/batch-get] [POST] Retreiving %s customers from database", len(body.ids))
+
+    customer_repository = CustomerRepository(db)
+
+    customer = customer_repository.get_details_by_email(decoded_token['email'])
+
+    results = []
+    for id in body.ids:
+        if customer is None:
+            results.append({'id': id, 'status': status.HTTP_404_NOT_FOUND, 'message': 'Customer not found'})
+        elif customer.id != id:
+            results.append({'id': id, 'status': status.HTTP_403_FORBIDDEN, 'message': 'Customer logged in does not have access to this resource'})
+        else:
+            results.append({'id': id, 'status': status.HTTP_200_OK, 'customer': {field: getattr(customer, field) for field in CUSTOMER_DETAIL_FIELDS}})
+
+    logger.log('INFO', "[/api/v1/customers/batch-get] [POST] [200] %s customers resolved", len(results))
+
+    return EnvelopeResponse(content=SuccessResponse(data={'results': results}), status_code=status.HTTP_200_OK)
 
 
 @router.get('/{id}')
@@ -63,12 +341,20 @@ def get_customer_details(
         ...,
         title='Customer ID',
         description='Unique identity value for a Customer'
-        )
+        ),
+    fields: str | None = Query(
+        None,
+        description=f"Comma separated fields to return, a subset of {', '.join(CUSTOMER_DETAIL_FIELDS)}. Omit it for every field."
+        ),
+    if_none_match: str | None = Header(None),
     ):
     """
     Retrieve customer details by ID.\n
     This endpoint retrieves the details of a customer from the database using the provided customer ID.\n
     It also verifies that the customer making the request has access to the requested customer ID.\n
+    Concurrent identical requests of the same customer share one database query.\n
+    The response carries a strong ETag derived from the row version and the requested fields. When If-None-Match holds the current ETag,\n
+    the version is checked with an indexed lookup and a 304 is returned without loading or serializing the customer.\n
     
     **URL:** /api/v1/customers/{id}\n
     **Method:** GET\n
@@ -79,8 +365,12 @@ def get_customer_details(
         - db (Session): Database session dependency.\n
         - decoded_token (str): Decoded JWT token dependency.\n
         - id (int): Unique identity value for a Customer.\n
+        - fields (str): Comma separated fields to return.\n
+        - if_none_match (str): ETags of the customer cached by the client.\n
     **Responses:** \n
         - 200: Customer details retrieved successfully.\n
+        - 304: The customer is unchanged.\n
+        - 400: The fields parameter holds an unknown field.\n
         - 403: Forbidden access to customer with the provided ID.\n
         - 404: Customer with the provided ID not found.\n
     **Log Levels:**\n
@@ -93,52 +383,73 @@ def get_customer_details(
     """
     logger = Logger()
     
-    logger.log('INFO',f"[/api/v1/customers/{id}] [GET] Retreiving customer with ID {id} from database")
+    logger.log('INFO', "[/api/v1/customers/%s] [GET] Retreiving customer with ID %s from database", id, id)
+
+    try:
+        projection = parse_fields(fields, CUSTOMER_DETAIL_FIELDS)
+    except ValueError as e:
+        logger.log('ERROR', "[/api/v1/customers/%s] [GET] [400] Invalid fields parameter", id)
+
+        return EnvelopeResponse(content=BadResponse(message=str(e)), status_code=status.HTTP_400_BAD_REQUEST)
+
+    if projection == CUSTOMER_DETAIL_FIELDS:
+        projection = None
 
     customer_repository = CustomerRepository(db)
+
+    if if_none_match is not None:
+        current = customer_repository.get_version_by_email(decoded_token['email'])
+
+        if current is not None and current.id == id:
+            etag = version_etag(current.id, current.version, projection)
+
+            if etag_matches(if_none_match, etag):
+                logger.log('INFO', "[/api/v1/customers/%s] [GET] [304] Customer with ID %s not modified", id, id)
+
+                return not_modified(etag)
     
-    customer = customer_repository.get_by_email(decoded_token['email'])
+    customer = read_flight.do(
+        ('GET /customers/{id}', id, decoded_token['email']),
+        lambda: to_customer_details(customer_repository.get_details_by_email(decoded_token['email']))
+    )
 
     if not customer:
         
-        logger.log('ERROR', f"[/api/v1/customers/{id}] [GET] [404] Customer with ID {id} not found")
+        logger.log('ERROR', "[/api/v1/customers/%s] [GET] [404] Customer with ID %s not found", id, id)
         
         response = BadResponse(message='Customer not found')
         
-        return JSONResponse(content=response.model_dump(), status_code=status.HTTP_404_NOT_FOUND)
+        return EnvelopeResponse(content=response, status_code=status.HTTP_404_NOT_FOUND)
     else:
-        if customer.id != id:
+        if customer['id'] != id:
             
-            logger.log('ERROR', f"[/api/v1/customers/{id}] [GET] [403] Forbidden access to customer with ID {id}")
+            logger.log('ERROR', "[/api/v1/customers/%s] [GET] [403] Forbidden access to customer with ID %s", id, id)
 
             response = BadResponse(message='Customer logged in does not have access to this resource')
             
-            return JSONResponse(content=response.model_dump(), status_code=status.HTTP_403_FORBIDDEN)
+            return EnvelopeResponse(content=response, status_code=status.HTTP_403_FORBIDDEN)
         else:
-            http_response = SuccessResponse(data=
-                {
-                    'id': customer.id,
-                    'first_name': customer.first_name,
-                    'last_name': customer.last_name,
-                    'email': customer.email,
-                    'phone': customer.phone,
-                }
-            ).model_dump()
+            http_response = SuccessResponse(data={field: customer[field] for field in projection or CUSTOMER_DETAIL_FIELDS})
 
-            logger.log('INFO', f"[/api/v1/customers/{id}] [GET] [200] Customer with ID {id} retreived successfully")
+            logger.log('INFO', "[/api/v1/customers/%s] [GET] [200] Customer with ID %s retreived successfully", id, id)
     
-            return JSONResponse(content=http_response, status_code=status.HTTP_200_OK)
+            return EnvelopeResponse(
+                content=http_response,
+                status_code=status.HTTP_200_OK,
+                headers={'ETag': version_etag(customer['id'], customer['version'], projection)}
+            )
 
 
-@router.post('/')
-def create_customer(db: Session = Depends(get_database_connection), request: dict = Body(..., json_schema_extra=CustomerRequestBody.schema())):
+@router.post('/', openapi_extra=request_body_openapi(CustomerRequestBody))
+def create_customer(db: Session = Depends(get_database_connection), request: bytes = Depends(get_request_body)):
     """
     Create a new customer in the database. \n
     This function handles the creation of a new customer by validating the request body \n
+    checking the email against the in-memory email filter (emails that may be taken are looked up before the INSERT) \n
     persisting the customer data to the database, and generating a JWT token for the customer. \n
     **Args:** \n
         - db (Session): Database session dependency. \n
-        - request (dict): Request body containing customer data.\n
+        - request (bytes): Raw JSON request body containing customer data.\n
     **Responses:** \n
         - 201: Customer created successfully. \n
         - 400: Bad request if the request body validation fails. \n
@@ -155,32 +466,47 @@ def create_customer(db: Session = Depends(get_database_connection), request: dic
     
     logger = Logger()
     
-    logger.log('INFO', f"[/api/v1/customers/] [POST] Persisting customer to database")
+    logger.log('INFO', "[/api/v1/customers/] [POST] Persisting customer to database")
 
     try: 
-        body = CustomerRequestBody(**request)
+        with span('validate'):
+            body = CustomerRequestBody.model_validate_json(request)
     except ValidationError as e:
-        logger.log('ERROR', f"[/api/v1/customers/] [POST] [400] Error validating request body")
+        logger.log('ERROR', "[/api/v1/customers/] [POST] [400] Error validating request body")
 
         errors_details = e.errors()
         
         error_response = ValidationErrorResponse(details=errors_details)
         
-        return JSONResponse(content=error_response.model_dump(), status_code=status.HTTP_400_BAD_REQUEST)
+        return EnvelopeResponse(content=error_response, status_code=status.HTTP_400_BAD_REQUEST)
     
+    customer_repository = CustomerRepository(db)
+
+    email_filter = EmailFilter()
+
+    if email_filter.needs_lookup(body.email):
+        duplicate = customer_repository.email_exists(body.email)
+
+        email_filter.record_lookup(duplicate)
+
+        if duplicate:
+            logger.log('ERROR', "[/api/v1/customers/] [POST] [400] Customer already exists")
+
+            response = BadResponse(message='Customer already exists')
+
+            return EnvelopeResponse(content=response, status_code=status.HTTP_400_BAD_REQUEST)
+
     try:
         body_to_dict = body.model_dump()
-
-        customer_repository = CustomerRepository(db)
     
         new_customer = customer_repository.create(body_to_dict)
     except IntegrityError as e:
         
-        logger.log('ERROR', f"[/api/v1/customers/] [POST] [400] Error creating customer: {str(e)}")
+        logger.log('ERROR', "[/api/v1/customers/] [POST] [400] Error creating customer: %s", e.orig)
         
         response = BadResponse(message='Customer already exists')
         
-        return JSONResponse(content=response.model_dump(), status_code=status.HTTP_400_BAD_REQUEST)
+        return EnvelopeResponse(content=response, status_code=status.HTTP_400_BAD_REQUEST)
     
     try:
         jwt_manager = JWTManager()
@@ -188,11 +514,11 @@ def create_customer(db: Session = Depends(get_database_connection), request: dic
         token = jwt_manager.encode(body_to_dict)
     except Exception as e:
         
-        logger.log('ERROR', f"[/api/v1/customers/] [POST] [500] Error generating token: {str(e)}")
+        logger.log('ERROR', "[/api/v1/customers/] [POST] [500] Error generating token: %s", e)
         
         response = BadResponse(message='Possible error generating token')
         
-        return JSONResponse(content=response.model_dump(), status_code=status.HTTP_500_INTERNAL_SERVER_ERROR)
+        return EnvelopeResponse(content=response, status_code=status.HTTP_500_INTERNAL_SERVER_ERROR)
     
     http_response = SuccessResponse(data={
         'customer': {'id': new_customer.id, 'email': new_customer.email},
@@ -201,15 +527,17 @@ def create_customer(db: Session = Depends(get_database_connection), request: dic
 
     logger.log('INFO', "[/api/v1/customers/] [POST] [201] Customer created successfully")
     
-    return JSONResponse(content=http_response.model_dump(), status_code=status.HTTP_201_CREATED)
+    return EnvelopeResponse(content=http_response, status_code=status.HTTP_201_CREATED)
 
 
-@router.put('/{id}')
-def update_customer(db: Session = Depends(get_database_connection), decoded_token: dict = Depends(JWTBearerDependencie()), id: int = Path(..., title='Customer ID', description='Unique identity value for a Customer'), request: dict = Body(..., json_schema_extra=CustomerRequestBody.schema())):
+@router.put('/{id}', openapi_extra=request_body_openapi(CustomerRequestBody))
+def update_customer(db: Session = Depends(get_database_connection), decoded_token: dict = Depends(JWTBearerDependencie()), id: int = Path(..., title='Customer ID', description='Unique identity value for a Customer'), request: bytes = Depends(get_request_body), if_match: str | None = Header(None)):
     """
     Update a customer in the database.\n
     This endpoint replaces the customer data with the provided request body for the customer with the specified ID.\n
     It also generates a new JWT token for the updated customer.\n
+    With an If-Match header the update is only applied when the customer still has that ETag (optimistic concurrency).\n
+    The response carries the ETag of the updated customer.\n
     
     **URL:** /api/v1/customers/{id}\n
     **Method:** PUT\n
@@ -220,7 +548,8 @@ def update_customer(db: Session = Depends(get_database_connection), decoded_toke
         - db (Session): Database session dependency.\n
         - decoded_token (dict): Decoded JWT token dependency.\n
         - id (int): Unique identity value for a Customer.\n
-        - request (dict): Request body containing the customer data to update.\n
+        - request (bytes): Raw JSON request body containing the customer data to update.\n
+        - if_match (str): ETag the customer must still have.\n
     **Raises:**\n
         - ValidationError: If the request body validation fails.\n
         - Exception: If there is an error generating the JWT token.\n
@@ -231,25 +560,28 @@ def update_customer(db: Session = Depends(get_database_connection), decoded_toke
         - 400: Bad request if the request body validation fails.\n
         - 404: Not found if the customer with the specified ID does not exist.\n
         - 403: Forbidden if the logged-in customer does not have access to the specified resource.\n
+        - 409: Conflict if the customer was changed by a concurrent request.\n
+        - 412: Precondition failed if the customer no longer matches If-Match.\n
         - 500: Internal server error if there is an error generating the JWT token.\n
         - 201: Created if the customer is updated successfully.\n
     """
     
     logger = Logger()
     
-    logger.log('INFO', f"[/api/v1/customers/{id}] [PUT] Replacing customer with ID {id} from database")
+    logger.log('INFO', "[/api/v1/customers/%s] [PUT] Replacing customer with ID %s from database", id, id)
 
     try:  
-        body = CustomerRequestBody(**request)
+        with span('validate'):
+            body = CustomerRequestBody.model_validate_json(request)
     except ValidationError as e:
         
-        logger.log('ERRO', f"[/api/v1/customers/{id}] [PUT] [400] Error validating request body")
+        logger.log('ERROR', "[/api/v1/customers/%s] [PUT] [400] Error validating request body", id)
 
         errors_details = e.errors()
         
         error_response = ValidationErrorResponse(details=errors_details)
         
-        return JSONResponse(content=error_response.model_dump(), status_code=status.HTTP_400_BAD_REQUEST)
+        return EnvelopeResponse(content=error_response, status_code=status.HTTP_400_BAD_REQUEST)
 
     customer_repository = CustomerRepository(db)
 
@@ -259,24 +591,42 @@ def update_customer(db: Session = Depends(get_database_connection), decoded_toke
 
     if not customer:
         
-        logger.log('ERROR', f"[/api/v1/customers/{id}] [PUT] [404] Customer with ID {id} not found")
+        logger.log('ERROR', "[/api/v1/customers/%s] [PUT] [404] Customer with ID %s not found", id, id)
         
         response = BadResponse(message='Customer not found')
         
-        return JSONResponse(content=response.model_dump(), status_code=status.HTTP_404_NOT_FOUND)
+        return EnvelopeResponse(content=response, status_code=status.HTTP_404_NOT_FOUND)
     else:
         if customer.id != id:
             
-            logger.log('ERROR', f"[/api/v1/customers/{id}] [PUT] [403] Forbidden access to customer with ID {id}")
+            logger.log('ERROR', "[/api/v1/customers/%s] [PUT] [403] Forbidden access to customer with ID %s", id, id)
 
             response = BadResponse(message='Customer logged in does not have access to this resource')
 
-            return JSONResponse(content=response.model_dump(), status_code=status.HTTP_403_FORBIDDEN)
+            return EnvelopeResponse(content=response, status_code=status.HTTP_403_FORBIDDEN)
         else:
-    
-            updated_customer = customer_repository.update(id, body_to_dict)
+            if if_match is not None and not etag_matches(if_match, version_etag(customer.id, customer.version), weak=False):
+
+                logger.log('ERROR', "[/api/v1/customers/%s] [PUT] [412] Customer with ID %s does not match If-Match", id, id)
+
+                response = BadResponse(message='Customer was modified, fetch it again')
+
+                return EnvelopeResponse(content=response, status_code=status.HTTP_412_PRECONDITION_FAILED)
 
-            logger.log('INFO', f"[/api/v1/customers/{id}] [PUT] [201] Customer with ID {id} updated successfully")
+            try:
+                updated_customer = customer_repository.update(id, body_to_dict)
+            except StaleDataError:
+                status_code = status.HTTP_412_PRECONDITION_FAILED if if_match is not None else status.HTTP_409_CONFLICT
+
+                logger.log('ERROR', "[/api/v1/customers/%s] [PUT] [%s] Customer with ID %s was modified concurrently", id, status_code, id)
+
+                response = BadResponse(message='Customer was modified, fetch it again')
+
+                return EnvelopeResponse(content=response, status_code=status_code)
+
+            read_flight.forget(('GET /customers/{id}', id, decoded_token['email']))
+
+            logger.log('INFO', "[/api/v1/customers/%s] [PUT] [201] Customer with ID %s updated successfully", id, id)
 
             try:
                 jwt_manager = JWTManager()
@@ -284,11 +634,11 @@ def update_customer(db: Session = Depends(get_database_connection), decoded_toke
                 token = jwt_manager.encode(body_to_dict)
             except Exception as e:
                 
-                logger.log('ERROR', f"[/api/v1/customers/{id}] [PUT] [500] Error generating token: {str(e)}")
+                logger.log('ERROR', "[/api/v1/customers/%s] [PUT] [500] Error generating token: %s", id, e)
                 
                 response = BadResponse(message='Possible error generating token')
                 
-                return JSONResponse(content=response.model_dump(), status_code=status.HTTP_500_INTERNAL_SERVER_ERROR)
+                return EnvelopeResponse(content=response, status_code=status.HTTP_500_INTERNAL_SERVER_ERROR)
             
             response = SuccessResponse(data={
                 'token': token,
@@ -298,7 +648,11 @@ def update_customer(db: Session = Depends(get_database_connection), decoded_toke
                     }
                 }
             )
-            return JSONResponse(content=response.model_dump(), status_code=status.HTTP_201_CREATED)
+            return EnvelopeResponse(
+                content=response,
+                status_code=status.HTTP_201_CREATED,
+                headers={'ETag': version_etag(updated_customer.id, updated_customer.version)}
+            )
 
 
 @router.delete('/{id}')
@@ -306,6 +660,7 @@ def delete_customer(decoded_token: dict = Depends(JWTBearerDependencie()),db: Se
     """
     Deletes a customer from the database.\n
     This endpoint deletes the customer with the specified ID from the database.\n
+    The customer is soft deleted (hidden at once, email freed) and the row is hard deleted later by the background purger.\n
     It also verifies that the customer making the request has access to the specified customer ID.\n
 
     **URL:** /api/v1/customers/{id}\n
@@ -330,7 +685,7 @@ def delete_customer(decoded_token: dict = Depends(JWTBearerDependencie()),db: Se
     
     logger = Logger()
     
-    logger.log('INFO', f"[/api/v1/customers/{id}] [DELETE] Deleting customer with ID {id} from database")
+    logger.log('INFO', "[/api/v1/customers/%s] [DELETE] Deleting customer with ID %s from database", id, id)
 
     customer_repository = CustomerRepository(db)
 
@@ -338,23 +693,25 @@ def delete_customer(decoded_token: dict = Depends(JWTBearerDependencie()),db: Se
 
     if not customer:
         
-        logger.log('ERROR', f"[/api/v1/customers/{id}] [DELETE] [404] Customer with ID {id} not found")
+        logger.log('ERROR', "[/api/v1/customers/%s] [DELETE] [404] Customer with ID %s not found", id, id)
         
         response = BadResponse(message='Customer not found')
         
-        return JSONResponse(content=response.model_dump(), status_code=status.HTTP_404_NOT_FOUND)
+        return EnvelopeResponse(content=response, status_code=status.HTTP_404_NOT_FOUND)
     else:
         if customer.id != id:
             
-            logger.log('ERROR', f"[/api/v1/customers/{id}] [DELETE] [403] Forbidden access to customer with ID {id}")
+            logger.log('ERROR', "[/api/v1/customers/%s] [DELETE] [403] Forbidden access to customer with ID %s", id, id)
 
             response = BadResponse(message='Customer logged in does not have access to this resource')
 
-            return JSONResponse(content=response.model_dump(), status_code=status.HTTP_403_FORBIDDEN)
+            return EnvelopeResponse(content=response, status_code=status.HTTP_403_FORBIDDEN)
         else:
-            logger.log('INFO', f"[/api/v1/customers/{id}] [DELETE] [204] Customer with ID {id} deleted successfully")
+            logger.log('INFO', "[/api/v1/customers/%s] [DELETE] [204] Customer with ID %s deleted successfully", id, id)
+
+            customer_repository.delete(id, customer.email)
 
-            customer_repository.delete(id)
+            read_flight.forget(('GET /customers/{id}', id, decoded_token['email']))
 
             response = SuccessResponse()
 
@@ -0,0 +1,44 @@
+from fastapi import APIRouter, status
+
+from src.database.connection import engine
+from src.database.health import HealthProber
+from src.schemas.responses import BadResponse, SuccessResponse
+from src.utils.config import Config
+from src.utils.responses import EnvelopeResponse
+
+settings = Config()
+
+router = APIRouter(prefix='/health', tags=['Monitoring'])
+
+prober = HealthProber(engine, settings.health_min_pool_headroom, settings.health_probe_stale_seconds)
+
+
+@router.get('/live')
+async def live():
+    """
+    Liveness probe: answers as long as the event loop of the worker serves requests.\n
+    **URL:** /health/live\n
+    **Method:** GET\n
+    **Auth required:** NO\n
+    **Responses:**\n
+        - 200: The worker is alive.\n
+    """
+    return EnvelopeResponse(content=SuccessResponse(message='Alive'), status_code=status.HTTP_200_OK)
+
+
+@router.get('/ready')
+async def ready():
+    """
+    Readiness probe: answers from the result of the last background probe (database connectivity,\n
+    pool headroom and schema version), without touching the database.\n
+    **URL:** /health/ready\n
+    **Method:** GET\n
+    **Auth required:** NO\n
+    **Responses:**\n
+        - 200: The worker is ready to serve traffic.\n
+        - 503: A check failed, or no recent probe passed.\n
+    """
+    is_ready, details = prober.status()
+    if not is_ready:
+        return EnvelopeResponse(content=BadResponse(message='Not ready', detail=details), status_code=status.HTTP_503_SERVICE_UNAVAILABLE)
+    return EnvelopeResponse(content=SuccessResponse(message='Ready', data=details), status_code=status.HTTP_200_OK)
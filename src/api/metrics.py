@@ -0,0 +1,42 @@
+import asyncio
+
+from fastapi import APIRouter
+from fastapi.responses import Response
+
+from src.utils.config import Config
+from src.utils.metrics import CONTENT_TYPE, MetricsRegistry, MultiProcessCollector
+
+settings = Config()
+
+router = APIRouter(tags=['Monitoring'])
+
+
+@router.get('/metrics', include_in_schema=False)
+async def metrics():
+    """
+    Exposes the request, database pool and cache metrics in the Prometheus text format.\n
+    **URL:** /metrics\n
+    **Method:** GET\n
+    **Auth required:** NO\n
+    When METRICS_MULTIPROCESS_DIR is set, the metrics of every worker sharing the directory are aggregated.\n
+    """
+    registry = MetricsRegistry()
+    snapshot = registry.snapshot()
+
+    if settings.metrics_multiprocess_dir:
+        collector = MultiProcessCollector(settings.metrics_multiprocess_dir)
+        await asyncio.to_thread(collector.write, snapshot)
+        snapshot = await asyncio.to_thread(collector.aggregate)
+
+    return Response(content=registry.render(snapshot), media_type=CONTENT_TYPE)
+
+
+async def flush_metrics(directory: str, interval: float):
+    """
+    Periodically writes the snapshot of this worker to the multi-process directory.
+    """
+    registry = MetricsRegistry()
+    collector = MultiProcessCollector(directory)
+    while True:
+        await asyncio.to_thread(collector.write, registry.snapshot())
+        await asyncio.sleep(interval)
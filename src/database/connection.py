@@ -1,15 +1,119 @@
 import os
+import time
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine.default import DefaultDialect
+from sqlalchemy.pool import QueuePool
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.orm.session import Session
 
 from src.utils.config import Config
+from src.utils.metrics import MetricsRegistry
 
 settings = Config()
 
-database_url = f'mysql+pymysql://{settings.database_user}:{settings.database_password}@{settings.database_host}:{settings.database_port}/{settings.database_name}'
-engine = create_engine(database_url, pool_recycle=120)
+database_url = settings.database_url or f'mysql+pymysql://{settings.database_user}:{settings.database_password}@{settings.database_host}:{settings.database_port}/{settings.database_name}'
+
+
+
+class PoolWaitTracker:
+    """
+    Time spent waiting for a connection of the pool, the earliest sign of database saturation.
+
+    Checkouts run in the threadpool; the counters are updated without a lock, an update lost to
+    a race only blurs the gauges.
+
+    Attributes:
+        checkouts (int): Connections checked out.
+        wait_seconds (float): Total time spent waiting for a connection.
+        max_wait_seconds (float): Longest wait.
+        recent (float): Moving average of the wait, in seconds.
+    """
+
+    def __init__(self):
+        self.checkouts = 0
+        self.wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+        self.recent = 0.0
+
+    def observe(self, wait: float):
+        self.checkouts += 1
+        self.wait_seconds += wait
+        self.max_wait_seconds = max(self.max_wait_seconds, wait)
+        self.recent += 0.1 * (wait - self.recent)
+
+
+pool_wait = PoolWaitTracker()
+
+
+class InstrumentedQueuePool(QueuePool):
+    """
+    QueuePool recording the checkout wait in pool_wait.
+    """
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            pool_wait.observe(time.perf_counter() - start)
+
+
+engine_options = {'pool_recycle': 120, 'poolclass': InstrumentedQueuePool, 'query_cache_size': settings.database_query_cache_size}
+if database_url.startswith('sqlite'):
+    engine_options['connect_args'] = {'check_same_thread': False}
+elif database_url.startswith('mysql'):
+    # Timestamps are set by the database (see src.database.models.utcnow) and stored in UTC.
+    engine_options['connect_args'] = {'init_command': "SET time_zone = '+00:00'"}
+
+engine = create_engine(database_url, **engine_options)
+
+
+def pool_stats() -> dict:
+    """
+    Returns the connection pool gauges exposed at /metrics.
+    """
+    pool = engine.pool
+    stats = {}
+    for key, method in (('size', 'size'), ('checked_out', 'checkedout'), ('checked_in', 'checkedin'), ('overflow', 'overflow')):
+        if hasattr(pool, method):
+            stats[key] = getattr(pool, method)()
+    stats['checkout_wait_seconds_total'] = pool_wait.wait_seconds
+    stats['checkout_wait_seconds_max'] = pool_wait.max_wait_seconds
+    stats['checkout_wait_seconds_recent'] = pool_wait.recent
+    stats['checkouts'] = pool_wait.checkouts
+    return stats
+
+
+MetricsRegistry().register_collector('db_pool', pool_stats)
+
+statement_cache = {'hits': 0, 'misses': 0, 'uncached': 0}
+
+
+@event.listens_for(engine, 'after_cursor_execute')
+def _count_statement_cache(connection, cursor, statement, parameters, context, executemany):
+    # cache_hit tells whether the compiled form of the statement came from the compiled cache.
+    if context.cache_hit == DefaultDialect.CACHE_HIT:
+        statement_cache['hits'] += 1
+    elif context.cache_hit == DefaultDialect.CACHE_MISS:
+        statement_cache['misses'] += 1
+    else:
+        statement_cache['uncached'] += 1
+
+
+def statement_cache_stats() -> dict:
+    """
+    Returns the compiled statement cache gauges exposed at /metrics.
+    """
+    compiled = statement_cache['hits'] + statement_cache['misses']
+    return {
+        **statement_cache,
+        'hit_ratio': statement_cache['hits'] / compiled if compiled else 0.0,
+        'size': len(engine._compiled_cache) if engine._compiled_cache is not None else 0,
+    }
+
+
+MetricsRegistry().register_collector('statement_cache', statement_cache_stats)
 
 class DatabaseConnection:
     """
@@ -0,0 +1,135 @@
+import threading
+import time
+from typing import Callable
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from src.database.models import CustomerModel
+from src.utils.bloom import CountingBloomFilter
+from src.utils.config import Config
+from src.utils.logger import Logger
+
+WARM_BATCH_SIZE = 10000
+
+
+class EmailFilter:
+    """
+    A singleton in-memory filter of the emails of the existing customers, used by signup to skip
+    the INSERT (and its rollback) for emails that are already taken.
+
+    A Bloom filter can only prove absence: "definitely absent" emails go straight to the INSERT,
+    "maybe present" ones are confirmed with an indexed SELECT before being rejected, so a false
+    positive never rejects a signup. The unique constraint stays the source of truth: emails
+    created by other workers are unknown to this filter, the INSERT then fails as before and the
+    email is added. Until the filter is warmed, signup behaves as without it.
+
+    Emails are lowercased, as the MySQL unique index compares them case-insensitively.
+
+    Attributes:
+        _instance (EmailFilter): The singleton instance of the EmailFilter class.
+        enabled (bool): Whether the filter is used (EMAIL_FILTER_ENABLED).
+        ready (bool): Whether the filter was warmed with the existing emails.
+        bloom (CountingBloomFilter | None): The emails, None when the filter is disabled.
+        checks (int): Signup emails checked while ready.
+        definitely_absent (int): Checks that skipped the duplicate lookup.
+        confirmed_duplicates (int): Maybe present emails confirmed as duplicates.
+        false_positives (int): Maybe present emails that did not exist.
+    Methods:
+        warm(session_factory):
+            Streams the email column into the filter and marks it ready.
+        needs_lookup(email) -> bool:
+            True when the email may be taken and must be looked up before the INSERT.
+        might_contain(email) -> bool:
+            True when the email may be in the filter, without counting a check.
+        add(email) / remove(email):
+            Keeps the filter current on create, update and delete.
+        record_lookup(duplicate):
+            Counts the outcome of a maybe present lookup.
+        stats() -> dict:
+            Returns the gauges exposed at /metrics.
+    """
+    _instance = None
+    _lock = threading.Lock()
+
+    def __new__(cls):
+        if cls._instance is None:
+            with cls._lock:
+                if cls._instance is None:
+                    instance = super(EmailFilter, cls).__new__(cls)
+                    instance._configure()
+                    cls._instance = instance
+        return cls._instance
+
+    def _configure(self):
+        settings = Config()
+        self.enabled = settings.email_filter_enabled
+        self.ready = False
+        self.bloom = CountingBloomFilter(settings.email_filter_capacity, settings.email_filter_error_rate) if self.enabled else None
+        self.checks = 0
+        self.definitely_absent = 0
+        self.confirmed_duplicates = 0
+        self.false_positives = 0
+
+    def warm(self, session_factory: Callable[[], Session]):
+        if not self.enabled:
+            return
+        logger = Logger()
+        start = time.perf_counter()
+        count = 0
+        try:
+            with session_factory() as db:
+                result = db.execute(
+                    select(CustomerModel.email)
+                    .where(CustomerModel.email.is_not(None), CustomerModel.deleted_at.is_(None))
+                    .execution_options(yield_per=WARM_BATCH_SIZE)
+                )
+                for partition in result.scalars().partitions():
+                    for email in partition:
+                        self.bloom.add(email.lower())
+                    count += len(partition)
+        except Exception as e:
+            logger.log('ERROR', "[email_filter] Error warming the filter, signup runs without it: %s", e)
+            return
+        self.ready = True
+        logger.log('INFO', "[email_filter] Warmed with %s emails in %.2fs", count, time.perf_counter() - start)
+
+    def needs_lookup(self, email: str) -> bool:
+        if not (self.enabled and self.ready):
+            return False
+        self.checks += 1
+        if self.bloom.might_contain(email.lower()):
+            return True
+        self.definitely_absent += 1
+        return False
+
+    def record_lookup(self, duplicate: bool):
+        if duplicate:
+            self.confirmed_duplicates += 1
+        else:
+            self.false_positives += 1
+
+    def might_contain(self, email: str | None) -> bool:
+        return bool(self.enabled and email and self.bloom.might_contain(email.lower()))
+
+    def add(self, email: str | None):
+        if self.enabled and email:
+            self.bloom.add(email.lower())
+
+    def remove(self, email: str | None):
+        if self.enabled and email:
+            self.bloom.remove(email.lower())
+
+    def stats(self) -> dict:
+        if not self.enabled:
+            return {'ready': False}
+        return {
+            'ready': self.ready,
+            'items': self.bloom.items,
+            'checks': self.checks,
+            'definitely_absent': self.definitely_absent,
+            'confirmed_duplicates': self.confirmed_duplicates,
+            'false_positives': self.false_positives,
+            'expected_false_positive_rate': self.bloom.false_positive_rate(),
+            'size_bytes': self.bloom.size,
+        }
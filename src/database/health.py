@@ -0,0 +1,123 @@
+import asyncio
+import time
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+
+from src.database.migrations import get_latest_version, get_schema_version
+from src.utils.logger import Logger
+
+
+class HealthProber:
+    """
+    Checks the dependencies of the worker in the background and caches the result, so the
+    readiness endpoint answers from memory instead of opening a connection per probe.
+
+    A probe checks that the database answers, that the pool has at least min_pool_headroom
+    connections left before the probe checks one out, and that the schema is migrated to the
+    version this code expects. The worker is ready when the last probe passed and is not older
+    than stale_after seconds (a stuck prober makes the worker not ready).
+
+    Attributes:
+        engine (Engine): The engine whose database and pool are checked.
+        min_pool_headroom (int): Connections that must be available in the pool.
+        stale_after (float): Seconds after which the last probe no longer counts.
+        checks (dict): Result of the last probe, per check.
+        details (dict): Measurements of the last probe (pool headroom, schema version, latency, error class).
+        checked_at (float | None): time.monotonic() of the last probe, None before the first.
+        probes (int): Probes run.
+        failures (int): Probes that did not pass.
+    Methods:
+        pool_headroom() -> float:
+            Returns the connections the pool can still hand out.
+        probe() -> bool:
+            Runs the checks (blocking) and caches their result.
+        run(interval):
+            Probes until cancelled.
+        status() -> tuple[bool, dict]:
+            Returns the cached readiness and checks.
+        stats() -> dict:
+            Returns the gauges exposed at /metrics.
+    """
+
+    def __init__(self, engine: Engine, min_pool_headroom: int = 1, stale_after: float = 15.0):
+        self.engine = engine
+        self.min_pool_headroom = min_pool_headroom
+        self.stale_after = stale_after
+        self.expected_version = get_latest_version()
+        self.checks = {'database': False, 'pool': False, 'schema': False}
+        self.details = {}
+        self.checked_at = None
+        self.probes = 0
+        self.failures = 0
+
+    def pool_headroom(self) -> float:
+        pool = self.engine.pool
+        if not hasattr(pool, 'checkedout'):
+            return float('inf')
+        max_overflow = getattr(pool, '_max_overflow', 0)
+        if max_overflow < 0:
+            return float('inf')
+        return pool.size() + max_overflow - pool.checkedout()
+
+    def probe(self) -> bool:
+        checks = {'database': False, 'pool': False, 'schema': False}
+        details = {}
+
+        headroom = self.pool_headroom()
+        details['pool_headroom'] = headroom
+        checks['pool'] = headroom >= self.min_pool_headroom
+
+        start = time.perf_counter()
+        try:
+            with self.engine.connect() as connection:
+                connection.execute(text('SELECT 1'))
+                checks['database'] = True
+                version = get_schema_version(connection)
+            details['schema_version'] = version
+            checks['schema'] = version >= self.expected_version
+        except Exception as e:
+            # The readiness endpoint is public: driver messages (hosts, users, SQL) only go to the log.
+            details['error'] = type(e).__name__
+            Logger().log('ERROR', "[health] Database check failed: %s", e)
+        details['latency_seconds'] = time.perf_counter() - start
+
+        self.checks, self.details = checks, details
+        self.checked_at = time.monotonic()
+        self.probes += 1
+        passed = all(checks.values())
+        if not passed:
+            self.failures += 1
+        return passed
+
+    async def run(self, interval: float):
+        logger = Logger()
+        was_ready = None
+        while True:
+            try:
+                ready = await asyncio.to_thread(self.probe)
+            except Exception as e:
+                ready = False
+                logger.log('ERROR', "[health] Error probing the dependencies: %s", e)
+            if ready != was_ready:
+                logger.log('INFO' if ready else 'ERROR', "[health] Worker %s: %s", 'ready' if ready else 'not ready', self.checks)
+                was_ready = ready
+            await asyncio.sleep(interval)
+
+    def status(self) -> tuple[bool, dict]:
+        fresh = self.checked_at is not None and time.monotonic() - self.checked_at <= self.stale_after
+        checks = {**self.checks, 'fresh': fresh}
+        return all(checks.values()), {
+            'checks': checks,
+            'expected_schema_version': self.expected_version,
+            **self.details,
+            'age_seconds': time.monotonic() - self.checked_at if self.checked_at is not None else None,
+        }
+
+    def stats(self) -> dict:
+        ready, _ = self.status()
+        return {
+            'ready': ready,
+            'probes': self.probes,
+            'failures': self.failures,
+        }
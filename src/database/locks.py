@@ -0,0 +1,47 @@
+from contextlib import contextmanager
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+
+@contextmanager
+def named_lock(connection: Connection, name: str, timeout: float = 0):
+    """
+    Holds a MySQL named lock (GET_LOCK) for the duration of the block.
+
+    Used to run a job in a single worker at a time. The lock belongs to the MySQL session of the
+    connection that took it, and is released on that connection. A Session is not accepted: it
+    returns its connection to the pool on commit, which would release the lock on another
+    connection and leak it. Bind the Session of the block to the connection instead. On other
+    databases (SQLite for local runs) the lock is always granted.
+
+    Usage:
+        with engine.connect() as connection, named_lock(connection, 'customers_outbox_publisher') as acquired:
+            if acquired:
+                with Session(connection) as db:
+                    ...
+
+    Args:
+        connection (Connection): Connection the lock is taken on, held for the whole block.
+        name (str): Name of the lock.
+        timeout (float): Seconds to wait for the lock, 0 returns at once.
+
+    Yields:
+        bool: Whether the lock was acquired.
+    """
+    if not isinstance(connection, Connection):
+        raise TypeError('named_lock takes a Connection, bind the Session of the block to it')
+    if connection.dialect.name != 'mysql':
+        yield True
+        return
+
+    acquired = bool(connection.execute(text('SELECT GET_LOCK(:name, :timeout)'), {'name': name, 'timeout': timeout}).scalar())
+    # Named locks are not transactional: end the transaction begun by GET_LOCK, so a Session bound
+    # to the connection in the block begins, and commits, its own transactions.
+    connection.commit()
+    try:
+        yield acquired
+    finally:
+        if acquired:
+            connection.execute(text('SELECT RELEASE_LOCK(:name)'), {'name': name})
+            connection.commit()
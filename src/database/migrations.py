@@ -0,0 +1,118 @@
+"""
+Schema migrations for databases created before a change to the models.
+
+Base.metadata.create_all only creates missing tables, it never changes existing ones. Every
+change to an existing table is registered here with @migration(version, description) and is
+applied once, in version order, when the application starts. Applied versions are recorded in
+the schema_version table. Migrations must be idempotent: a fresh database already has the new
+schema from create_all and only records the versions.
+
+On MySQL the migrations run under a named lock, so several workers starting at the same time
+apply them once.
+"""
+from typing import Callable
+
+from sqlalchemy import Column, Integer, MetaData, Table, inspect, insert, select, text, func
+from sqlalchemy.engine import Connection, Engine
+
+from src.database.locks import named_lock
+from src.utils.logger import Logger
+
+metadata = MetaData()
+
+schema_version = Table(
+    'schema_version',
+    metadata,
+    Column('version', Integer, primary_key=True, autoincrement=False),
+)
+
+MIGRATIONS: list[tuple[int, str, Callable[[Connection], None]]] = []
+
+LOCK_NAME = 'customers_schema_migrations'
+LOCK_TIMEOUT_SECONDS = 60
+
+
+def migration(version: int, description: str):
+    """
+    Registers a migration function, called with an open connection.
+    """
+    def register(function: Callable[[Connection], None]):
+        MIGRATIONS.append((version, description, function))
+        return function
+    return register
+
+
+def _has_index(connection: Connection, table: str, name: str) -> bool:
+    return any(index['name'] == name for index in inspect(connection).get_indexes(table))
+
+
+@migration(1, 'Server-side timestamps, (updated_at, id) index and customer tombstones')
+def _change_feed(connection: Connection):
+    if connection.dialect.name == 'mysql':
+        connection.execute(text(
+            'UPDATE customers SET '
+            'updated_at = COALESCE(updated_at, created_at, UTC_TIMESTAMP(6)), '
+            'created_at = COALESCE(created_at, UTC_TIMESTAMP(6)) '
+            'WHERE created_at IS NULL OR updated_at IS NULL'
+        ))
+        connection.execute(text(
+            'ALTER TABLE customers '
+            'MODIFY created_at DATETIME(6) NOT NULL DEFAULT CURRENT_TIMESTAMP(6), '
+            'MODIFY updated_at DATETIME(6) NOT NULL DEFAULT CURRENT_TIMESTAMP(6) ON UPDATE CURRENT_TIMESTAMP(6)'
+        ))
+    if not _has_index(connection, 'customers', 'ix_customers_updated_at_id'):
+        connection.execute(text('CREATE INDEX ix_customers_updated_at_id ON customers (updated_at, id)'))
+
+
+@migration(2, 'Soft delete: customers.deleted_at and its index')
+def _soft_delete(connection: Connection):
+    columns = {column['name'] for column in inspect(connection).get_columns('customers')}
+    if 'deleted_at' not in columns:
+        column_type = 'DATETIME(6)' if connection.dialect.name == 'mysql' else 'DATETIME'
+        connection.execute(text(f'ALTER TABLE customers ADD COLUMN deleted_at {column_type} NULL'))
+    if not _has_index(connection, 'customers', 'ix_customers_deleted_at'):
+        connection.execute(text('CREATE INDEX ix_customers_deleted_at ON customers (deleted_at)'))
+
+
+@migration(3, 'Optimistic concurrency: customers.version')
+def _row_version(connection: Connection):
+    columns = {column['name'] for column in inspect(connection).get_columns('customers')}
+    if 'version' not in columns:
+        connection.execute(text('ALTER TABLE customers ADD COLUMN version INTEGER NOT NULL DEFAULT 1'))
+
+
+def get_latest_version() -> int:
+    """
+    Returns the version of the last registered migration, the schema version this code expects.
+    """
+    return max((version for version, _, _ in MIGRATIONS), default=0)
+
+
+def get_schema_version(connection: Connection) -> int:
+    """
+    Returns the highest applied migration version, 0 when none was applied.
+    """
+    return connection.execute(select(func.coalesce(func.max(schema_version.c.version), 0))).scalar_one()
+
+
+def migrate(engine: Engine) -> int:
+    """
+    Applies the pending migrations.
+
+    Returns:
+        int: The schema version of the database.
+    """
+    logger = Logger()
+    metadata.create_all(engine)
+
+    with engine.connect() as connection, named_lock(connection, LOCK_NAME, LOCK_TIMEOUT_SECONDS):
+        applied = set(connection.execute(select(schema_version.c.version)).scalars())
+        connection.commit()
+        for version, description, function in sorted(MIGRATIONS, key=lambda entry: entry[0]):
+            if version in applied:
+                continue
+            function(connection)
+            connection.execute(insert(schema_version).values(version=version))
+            connection.commit()
+            logger.log('INFO', "[migrations] Applied migration %s: %s", version, description)
+        return get_schema_version(connection)
@@ -1,12 +1,46 @@
-from sqlalchemy import Column, Integer, String, DateTime
+from sqlalchemy import Column, Integer, String, DateTime, Index, Text
+from sqlalchemy.dialects import mysql
+from sqlalchemy.ext.compiler import compiles
 from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.sql import expression
 
 from src.database.connection import engine
-
-from datetime import datetime, timezone
+from src.database.migrations import migrate
 
 Base = declarative_base()
 
+
+class utcnow(expression.FunctionElement):
+    """
+    Current UTC time evaluated by the database, with microsecond precision.
+
+    Used as the server default and update value of the timestamp columns, so they are set by
+    the database on every INSERT and UPDATE instead of by the application. MySQL sessions run
+    with time_zone '+00:00' (see src.database.connection).
+    """
+    type = DateTime()
+    inherit_cache = True
+
+
+@compiles(utcnow)
+def _compile_utcnow(element, compiler, **kwargs):
+    return 'CURRENT_TIMESTAMP'
+
+
+@compiles(utcnow, 'mysql')
+def _compile_utcnow_mysql(element, compiler, **kwargs):
+    return 'CURRENT_TIMESTAMP(6)'
+
+
+@compiles(utcnow, 'sqlite')
+def _compile_utcnow_sqlite(element, compiler, **kwargs):
+    # Same text format as the SQLAlchemy SQLite DateTime type, so values compare as strings.
+    return "STRFTIME('%Y-%m-%d %H:%M:%f000', 'now')"
+
+
+Timestamp = DateTime().with_variant(mysql.DATETIME(fsp=6), 'mysql')
+
+
 class CustomerModel(Base):
     """
     CustomerModel represents a customer entity in the database.
@@ -16,8 +50,17 @@ class CustomerModel(Base):
         name (str): The name of the customer.
         email (str): The unique email address of the customer.
         phone (str): The phone number of the customer.
+        created_at (datetime): UTC time the customer was created, set by the database.
+        updated_at (datetime): UTC time the customer was last changed, set by the database.
+        deleted_at (datetime | None): UTC time the customer was soft deleted, the row is hard
+            deleted later by the purger (see src.database.purger).
+        version (int): Row version, incremented by every ORM update and checked in its WHERE
+            clause (optimistic concurrency). The ETag of the customer is derived from it.
     """
     __tablename__ = 'customers'
+    __table_args__ = (
+        Index('ix_customers_updated_at_id', 'updated_at', 'id'),
+    )
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     first_name = Column(String(255))
@@ -25,7 +68,53 @@ class CustomerModel(Base):
     email = Column(String(255), unique=True)
     phone = Column(String(255))
     password = Column(String(255))
-    created_at = Column(DateTime(), default=datetime.now(timezone.utc).isoformat())
-    updated_at = Column(DateTime(), default=datetime.now(timezone.utc).isoformat())
+    created_at = Column(Timestamp, nullable=False, server_default=utcnow())
+    updated_at = Column(Timestamp, nullable=False, server_default=utcnow(), onupdate=utcnow())
+    deleted_at = Column(Timestamp, nullable=True, index=True)
+    version = Column(Integer, nullable=False, server_default='1')
+
+    __mapper_args__ = {'version_id_col': version}
+
+
+class CustomerTombstoneModel(Base):
+    """
+    CustomerTombstoneModel records the deletion of a customer for the change feed.
+
+    Attributes:
+        id (int): The primary key of the tombstone, auto-incremented.
+        customer_id (int): ID of the deleted customer.
+        deleted_at (datetime): UTC time of the deletion, set by the database.
+    """
+    __tablename__ = 'customer_tombstones'
+    __table_args__ = (
+        Index('ix_customer_tombstones_deleted_at_id', 'deleted_at', 'id'),
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    customer_id = Column(Integer, nullable=False)
+    deleted_at = Column(Timestamp, nullable=False, server_default=utcnow())
+
+class CustomerEventModel(Base):
+    """
+    CustomerEventModel is a customer lifecycle event waiting in the outbox to be published.
+
+    Events are written in the same transaction as the change they describe and deleted once the
+    publisher has handed them to the sink (see src.events.publisher).
+
+    Attributes:
+        id (int): The primary key of the event, auto-incremented; events are published in id order.
+        customer_id (int): ID of the customer the event is about.
+        type (str): 'customer.created', 'customer.updated' or 'customer.deleted'.
+        payload (str): JSON document with the customer fields, without the password.
+        created_at (datetime): UTC time the event was recorded, set by the database.
+    """
+    __tablename__ = 'customer_events_outbox'
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    customer_id = Column(Integer, nullable=False)
+    type = Column(String(32), nullable=False)
+    payload = Column(Text, nullable=False)
+    created_at = Column(Timestamp, nullable=False, server_default=utcnow())
 
 Base.metadata.create_all(engine)
+migrate(engine)
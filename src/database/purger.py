@@ -0,0 +1,128 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import delete, select
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from src.database.locks import named_lock
+from src.database.models import CustomerModel, CustomerTombstoneModel
+from src.utils.logger import Logger
+
+LOCK_NAME = 'customers_soft_delete_purger'
+
+
+class SoftDeletePurger:
+    """
+    Hard deletes the soft deleted customers in small, rate limited batches.
+
+    Every batch is its own short transaction deleting at most batch_size rows by primary key,
+    so the row locks are held briefly and the purge never competes with the request path for
+    long. Batches are spaced so at most max_rows_per_second rows are deleted per second. On
+    MySQL a named lock keeps a single worker purging at a time. The lock is taken on a connection
+    held for the whole batch, and the session of the batch is bound to it, so the commit does not
+    hand the connection holding the lock back to the pool.
+
+    When tombstone_retention is set, every batch also deletes up to batch_size change feed
+    tombstones older than tombstone_retention seconds, the oldest cursor the feed accepts.
+
+    Attributes:
+        engine (Engine): The engine the batches connect with.
+        batch_size (int): Maximum number of rows deleted per transaction and table.
+        max_rows_per_second (float): Upper bound of the purge rate.
+        tombstone_retention (float | None): Seconds tombstones are kept, None to keep them forever.
+        purged (int): Customers hard deleted by this worker.
+        tombstones_purged (int): Tombstones deleted by this worker.
+        batches (int): Batches run by this worker.
+        failures (int): Batches that failed.
+    Methods:
+        purge_batch() -> int:
+            Hard deletes the oldest soft deleted customers and expired tombstones, returns how many rows were deleted.
+        run(interval):
+            Purges batches until cancelled, waiting interval seconds when nothing is left.
+        stats() -> dict:
+            Returns the counters exposed at /metrics.
+    """
+
+    def __init__(
+        self,
+        engine: Engine,
+        batch_size: int = 100,
+        max_rows_per_second: float = 500,
+        tombstone_retention: float | None = None,
+    ):
+        self.engine = engine
+        self.batch_size = batch_size
+        self.max_rows_per_second = max_rows_per_second
+        self.tombstone_retention = tombstone_retention
+        self.purged = 0
+        self.tombstones_purged = 0
+        self.batches = 0
+        self.failures = 0
+
+    def purge_batch(self) -> int:
+        with self.engine.connect() as connection, named_lock(connection, LOCK_NAME) as acquired:
+            if not acquired:
+                return 0
+
+            with Session(connection, autoflush=False) as db:
+                ids = db.scalars(
+                    select(CustomerModel.id)
+                    .where(CustomerModel.deleted_at.is_not(None))
+                    .order_by(CustomerModel.deleted_at)
+                    .limit(self.batch_size)
+                ).all()
+                if ids:
+                    db.execute(
+                        delete(CustomerModel)
+                        .where(CustomerModel.id.in_(ids), CustomerModel.deleted_at.is_not(None))
+                        .execution_options(synchronize_session=False)
+                    )
+
+                tombstone_ids = []
+                if self.tombstone_retention is not None:
+                    expired_before = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(seconds=self.tombstone_retention)
+                    tombstone_ids = db.scalars(
+                        select(CustomerTombstoneModel.id)
+                        .where(CustomerTombstoneModel.deleted_at < expired_before)
+                        .order_by(CustomerTombstoneModel.deleted_at, CustomerTombstoneModel.id)
+                        .limit(self.batch_size)
+                    ).all()
+                    if tombstone_ids:
+                        db.execute(
+                            delete(CustomerTombstoneModel)
+                            .where(CustomerTombstoneModel.id.in_(tombstone_ids))
+                            .execution_options(synchronize_session=False)
+                        )
+
+                if not ids and not tombstone_ids:
+                    return 0
+                db.commit()
+
+        self.purged += len(ids)
+        self.tombstones_purged += len(tombstone_ids)
+        self.batches += 1
+        return len(ids) + len(tombstone_ids)
+
+    async def run(self, interval: float):
+        logger = Logger()
+        while True:
+            try:
+                count = await asyncio.to_thread(self.purge_batch)
+            except Exception as e:
+                self.failures += 1
+                logger.log('ERROR', "[purger] Error purging soft deleted customers: %s", e)
+                await asyncio.sleep(interval)
+                continue
+            if count < self.batch_size:
+                await asyncio.sleep(interval)
+            else:
+                await asyncio.sleep(count / self.max_rows_per_second)
+
+    def stats(self) -> dict:
+        return {
+            'purged': self.purged,
+            'tombstones_purged': self.tombstones_purged,
+            'batches': self.batches,
+            'failures': self.failures,
+        }
@@ -1,12 +1,61 @@
+from datetime import datetime
+
+import orjson
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
-from sqlalchemy import select
+from sqlalchemy.orm.exc import StaleDataError
+from sqlalchemy import Row, Select, and_, bindparam, or_, select, update
+
+from src.database.email_filter import EmailFilter
+from src.database.models import CustomerEventModel, CustomerModel, CustomerTombstoneModel, utcnow
+from src.utils.config import Config
+from src.utils.timing import span
+
+settings = Config()
+
+EVENT_FIELDS = ('id', 'first_name', 'last_name', 'email', 'phone')
+
+DETAIL_FIELDS = ('id', 'first_name', 'last_name', 'email', 'phone')
+
+# Columns a client may select with a sparse fieldset; password is never projected.
+PUBLIC_FIELDS = DETAIL_FIELDS + ('created_at', 'updated_at')
+
+# Soft deleted customers are filtered out of every query (see delete).
+NOT_DELETED = CustomerModel.deleted_at.is_(None)
 
-from src.database.models import CustomerModel
+# Statements of the hot-path lookups, built once with bound parameters: executions skip building
+# the query and find their compiled form in the compiled cache of the engine (see
+# src.database.connection.statement_cache_stats).
+GET_BY_ID = select(CustomerModel).where(CustomerModel.id == bindparam('id'), NOT_DELETED).limit(1)
+GET_BY_EMAIL = select(CustomerModel).where(CustomerModel.email == bindparam('email'), NOT_DELETED).limit(1)
+EMAIL_EXISTS = select(CustomerModel.id).where(CustomerModel.email == bindparam('email'), NOT_DELETED).limit(1)
+GET_VERSION_BY_EMAIL = select(CustomerModel.id, CustomerModel.version).where(CustomerModel.email == bindparam('email'), NOT_DELETED)
+GET_DETAILS_BY_EMAIL = select(
+    *[getattr(CustomerModel, field) for field in DETAIL_FIELDS + ('version',)]
+).where(CustomerModel.email == bindparam('email'), NOT_DELETED)
 
 
 class CustomerRepository:
     """
     Repository class for managing CustomerModel entities in the database.
+
+    When EVENT_SINK is set, every create, update and delete also appends a lifecycle event to
+    the outbox in the same transaction. The change is flushed before the event is added, so the
+    customer row is locked when the event id is allocated and the events of a customer are
+    numbered in commit order.
+
+    Deleting a customer is a soft delete: a single UPDATE sets deleted_at (and frees the email
+    for a new signup), the row is hard deleted later by the purger in small batches.
+
+    Writes keep the EmailFilter used by signup current.
+
+    Updates check and increment the version column of the row (optimistic concurrency): an update
+    of a row changed since it was loaded raises StaleDataError.
+
+    Attributes:
+    -----------
+    record_events (bool): Whether writes append events to the outbox.
+
     Methods:
     --------
     __init__(db: Session):
@@ -17,47 +66,147 @@ class CustomerRepository:
         Retrieves a customer record by its ID.
     get_by_email(email: str) -> CustomerModel:
         Retrieves a customer record by its email.
+    email_exists(email: str) -> bool:
+        Checks with an indexed lookup whether a customer uses the email.
+    get_version_by_email(email: str) -> tuple[int, int] | None:
+        Retrieves the (id, version) of a customer with an indexed lookup, for conditional requests.
     get_all(skip: int, limit: int) -> list[CustomerModel]:
         Retrieves a list of customer records with pagination.
+    get_all_fields(fields: tuple[str, ...]) -> Select:
+        Builds the listing query selecting only the given columns, read as rows instead of entities.
+    get_details_by_email(email: str) -> Row | None:
+        Retrieves the detail columns and the version of a customer by its email.
     update(id: int, data: dict) -> CustomerModel:
         Updates an existing customer record by its ID.
-    delete(id: int) -> bool:
-        Deletes a customer record by its ID.
+    delete(id: int, email: str | None) -> bool:
+        Soft deletes a customer record by its ID and records a tombstone for the change feed.
+    get_changes(after: tuple | None, until: datetime, limit: int) -> list[CustomerModel]:
+        Retrieves customers changed after a (updated_at, id) cursor, in keyset order.
+    get_deletions(after: tuple | None, until: datetime, limit: int) -> list[CustomerTombstoneModel]:
+        Retrieves tombstones recorded after a (deleted_at, id) cursor, in keyset order.
     """
+    record_events = settings.event_sink is not None
+
     def __init__(self, db: Session):
         self.db = db
+
+    def _record_event(self, type: str, customer: CustomerModel | None = None, customer_id: int | None = None):
+        if not self.record_events:
+            return
+        with span('db.flush'):
+            self.db.flush()
+        if customer is not None:
+            customer_id = customer.id
+            payload = {field: getattr(customer, field) for field in EVENT_FIELDS}
+        else:
+            payload = {'id': customer_id}
+        self.db.add(CustomerEventModel(customer_id=customer_id, type=type, payload=orjson.dumps(payload).decode()))
     
     def create(self, data: dict) -> CustomerModel:
         customer = CustomerModel(**data)
         self.db.add(customer)
-        self.db.commit()
-        self.db.refresh(customer)
+        self._record_event('customer.created', customer=customer)
+        email_filter = EmailFilter()
+        try:
+            with span('db.commit'):
+                self.db.commit()
+        except IntegrityError:
+            # Counters only go up on add, so an email already counted is not added a second time.
+            if not email_filter.might_contain(data.get('email')):
+                email_filter.add(data.get('email'))
+            raise
+        email_filter.add(customer.email)
+        with span('db.refresh'):
+            self.db.refresh(customer)
         return customer
     
     def get_by_id(self, id: int) -> CustomerModel:
-        return self.db.query(CustomerModel).filter(CustomerModel.id == id).first()
+        with span('db.get_by_id'):
+            return self.db.scalars(GET_BY_ID, {'id': id}).first()
 
     def get_by_email(self, email: str) -> CustomerModel:
-        return self.db.query(CustomerModel).filter(CustomerModel.email == email).first()
+        with span('db.get_by_email'):
+            return self.db.scalars(GET_BY_EMAIL, {'email': email}).first()
     
+    def email_exists(self, email: str) -> bool:
+        with span('db.email_exists'):
+            return self.db.scalar(EMAIL_EXISTS, {'email': email}) is not None
+
+    def get_version_by_email(self, email: str) -> tuple[int, int] | None:
+        with span('db.get_version'):
+            return self.db.execute(GET_VERSION_BY_EMAIL, {'email': email}).first()
+
     def get_all(self) -> list[CustomerModel]:
-        return select(CustomerModel)
+        return select(CustomerModel).where(NOT_DELETED)
         #return self.db.query(CustomerModel).offset(skip).limit(limit).all()
 
+    def get_all_fields(self, fields: tuple[str, ...]) -> Select:
+        return select(*[getattr(CustomerModel, field) for field in fields]).where(NOT_DELETED)
+
+    def get_details_by_email(self, email: str) -> Row | None:
+        with span('db.get_by_email'):
+            return self.db.execute(GET_DETAILS_BY_EMAIL, {'email': email}).first()
+
     def update(self, id: int, data: dict) -> CustomerModel | None:
         customer = self.get_by_id(id)
         if customer:
+            previous_email = customer.email
             for key, value in data.items():
                 setattr(customer, key, value)
-            self.db.commit()
-            self.db.refresh(customer)
+            try:
+                self._record_event('customer.updated', customer=customer)
+                with span('db.commit'):
+                    self.db.commit()
+            except StaleDataError:
+                self.db.rollback()
+                raise
+            if customer.email != previous_email:
+                email_filter = EmailFilter()
+                email_filter.remove(previous_email)
+                email_filter.add(customer.email)
+            with span('db.refresh'):
+                self.db.refresh(customer)
             return customer
         return None
     
-    def delete(self, id: int) -> bool:
-        customer = self.get_by_id(id)
-        if customer:
-            self.db.delete(customer)
+    def delete(self, id: int, email: str | None = None) -> bool:
+        with span('db.soft_delete'):
+            result = self.db.execute(
+                update(CustomerModel)
+                .where(CustomerModel.id == id, NOT_DELETED)
+                .values(deleted_at=utcnow(), email=None)
+                .execution_options(synchronize_session=False)
+            )
+        if result.rowcount == 0:
+            self.db.rollback()
+            return False
+        self.db.add(CustomerTombstoneModel(customer_id=id))
+        self._record_event('customer.deleted', customer_id=id)
+        with span('db.commit'):
             self.db.commit()
-            return True
-        return False
+        EmailFilter().remove(email)
+        return True
+
+    def get_changes(self, after: tuple[datetime, int] | None, until: datetime, limit: int) -> list[CustomerModel]:
+        query = select(CustomerModel).where(CustomerModel.updated_at <= until, NOT_DELETED)
+        if after is not None:
+            updated_at, id = after
+            query = query.where(or_(
+                CustomerModel.updated_at > updated_at,
+                and_(CustomerModel.updated_at == updated_at, CustomerModel.id > id),
+            ))
+        query = query.order_by(CustomerModel.updated_at, CustomerModel.id).limit(limit)
+        with span('db.get_changes'):
+            return self.db.scalars(query).all()
+
+    def get_deletions(self, after: tuple[datetime, int] | None, until: datetime, limit: int) -> list[CustomerTombstoneModel]:
+        query = select(CustomerTombstoneModel).where(CustomerTombstoneModel.deleted_at <= until)
+        if after is not None:
+            deleted_at, id = after
+            query = query.where(or_(
+                CustomerTombstoneModel.deleted_at > deleted_at,
+                and_(CustomerTombstoneModel.deleted_at == deleted_at, CustomerTombstoneModel.id > id),
+            ))
+        query = query.order_by(CustomerTombstoneModel.deleted_at, CustomerTombstoneModel.id).limit(limit)
+        with span('db.get_deletions'):
+            return self.db.scalars(query).all()
@@ -0,0 +1,196 @@
+"""
+Synthetic data seeder for scale testing.
+
+Generates realistic customers with Faker and loads them into the customers table. Batches are
+generated in parallel worker processes and written with bulk multi-row inserts, or with
+LOAD DATA LOCAL INFILE on MySQL.
+
+Every row passes the rules in src/schemas/validators.py. Emails contain the seed and the row
+index, so they are unique within a run and across runs with different seeds. The generated data
+only depends on --seed and --batch-size; the ids depend on the order in which the workers insert.
+
+Usage:
+    python -m src.database.seed --rows 1000000 [--workers 4] [--batch-size 5000] [--seed 42]
+                                [--method insert|load-data]
+"""
+import argparse
+import csv
+import itertools
+import multiprocessing
+import os
+import string
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+
+from faker import Faker
+from sqlalchemy import create_engine, insert
+
+from src.database.connection import database_url, engine, engine_options
+from src.database.models import CustomerModel
+from src.schemas.validators import validate_email, validate_only_letters, validate_password, validate_phone_number
+
+LOCALE = 'en_US'
+
+COLUMNS = ('first_name', 'last_name', 'email', 'phone', 'password', 'created_at', 'updated_at')
+
+PASSWORD_LENGTH = 12
+PASSWORD_ALPHABET = string.ascii_letters + string.digits
+
+# Fixed range for the timestamps, so the rows do not depend on the day the seeder runs.
+CREATED_FROM = datetime(2020, 1, 1, tzinfo=timezone.utc)
+CREATED_UNTIL = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+_faker = None
+_vocabulary = None
+_worker_engine = None
+
+
+def _get_faker() -> tuple[Faker, dict]:
+    """
+    Returns the Faker instance of the current process and the vocabularies drawn from.
+
+    Names are drawn with a single weighted random.choices call per batch from the Faker
+    person provider lists, which is much faster than calling faker.first_name() per row.
+    """
+    global _faker, _vocabulary
+    if _faker is None:
+        _faker = Faker(LOCALE)
+        person = _faker.provider('faker.providers.person')
+        internet = _faker.provider('faker.providers.internet')
+        _vocabulary = {
+            'first_names': [name for name in person.first_names if name.isalpha()],
+            'last_names': [name for name in person.last_names if name.isalpha()],
+            'domains': list(internet.free_email_domains),
+        }
+        _vocabulary['first_name_weights'] = list(itertools.accumulate(person.first_names[name] for name in _vocabulary['first_names']))
+        _vocabulary['last_name_weights'] = list(itertools.accumulate(person.last_names[name] for name in _vocabulary['last_names']))
+    return _faker, _vocabulary
+
+
+def generate_rows(seed: int, start: int, count: int) -> list[dict]:
+    """
+    Generates the rows of one batch.
+
+    Args:
+        seed (int): Seed of the run.
+        start (int): Index of the first row of the batch.
+        count (int): Number of rows in the batch.
+
+    Returns:
+        list[dict]: Rows keyed by CustomerModel column names.
+
+    Raises:
+        ValueError: If a generated row does not pass the request validators.
+    """
+    faker, vocabulary = _get_faker()
+    faker.seed_instance(f'{seed}-{start}')
+    random = faker.random
+
+    first_names = random.choices(vocabulary['first_names'], cum_weights=vocabulary['first_name_weights'], k=count)
+    last_names = random.choices(vocabulary['last_names'], cum_weights=vocabulary['last_name_weights'], k=count)
+    created_range = int((CREATED_UNTIL - CREATED_FROM).total_seconds())
+
+    rows = []
+    for offset, (first_name, last_name) in enumerate(zip(first_names, last_names)):
+        index = start + offset
+        password = [random.choice(string.ascii_uppercase), random.choice(string.ascii_lowercase), random.choice(string.digits)]
+        password += random.choices(PASSWORD_ALPHABET, k=PASSWORD_LENGTH - len(password))
+        random.shuffle(password)
+        created_at = CREATED_FROM + timedelta(seconds=random.randrange(created_range))
+        updated_at = created_at + timedelta(seconds=random.randrange(int((CREATED_UNTIL - created_at).total_seconds()) + 1))
+
+        rows.append({
+            'first_name': validate_only_letters(first_name),
+            'last_name': validate_only_letters(last_name),
+            'email': validate_email(f'{first_name}.{last_name}.{seed}.{index}@{random.choice(vocabulary["domains"])}'.lower()),
+            'phone': validate_phone_number(f'+{random.randrange(10 ** 9, 10 ** 14)}'),
+            'password': validate_password(''.join(password)),
+            'created_at': created_at,
+            'updated_at': updated_at,
+        })
+    return rows
+
+
+def _init_worker(method: str):
+    global _worker_engine
+    # The engine inherited from the parent process must not reuse its connections.
+    engine.dispose(close=False)
+    options = dict(engine_options)
+    if method == 'load-data':
+        options['connect_args'] = {**options.get('connect_args', {}), 'local_infile': True}
+    _worker_engine = create_engine(database_url, **options)
+
+
+def _insert_rows(rows: list[dict]):
+    with _worker_engine.begin() as connection:
+        connection.execute(insert(CustomerModel.__table__), rows)
+
+
+def _load_data(rows: list[dict]):
+    descriptor, path = tempfile.mkstemp(suffix='.csv')
+    try:
+        with os.fdopen(descriptor, 'w', newline='') as file:
+            writer = csv.writer(file, lineterminator='\n')
+            for row in rows:
+                writer.writerow([
+                    *(row[column] for column in COLUMNS[:5]),
+                    row['created_at'].strftime('%Y-%m-%d %H:%M:%S'),
+                    row['updated_at'].strftime('%Y-%m-%d %H:%M:%S'),
+                ])
+        with _worker_engine.begin() as connection:
+            connection.exec_driver_sql(
+                f"LOAD DATA LOCAL INFILE '{path}' INTO TABLE {CustomerModel.__tablename__} "
+                "FIELDS TERMINATED BY ',' OPTIONALLY ENCLOSED BY '\"' LINES TERMINATED BY '\\n' "
+                f"({', '.join(COLUMNS)})"
+            )
+    finally:
+        os.remove(path)
+
+
+def _seed_batch(task: tuple) -> int:
+    seed, start, count, method = task
+    rows = generate_rows(seed, start, count)
+    if method == 'load-data':
+        _load_data(rows)
+    else:
+        _insert_rows(rows)
+    return len(rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, required=True, help='Number of customers to generate')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help='Worker processes')
+    parser.add_argument('--batch-size', type=int, default=5000, help='Rows per bulk insert')
+    parser.add_argument('--seed', type=int, default=42, help='Seed of the generated data')
+    parser.add_argument('--method', choices=('insert', 'load-data'), default='insert',
+                        help='Multi-row INSERTs, or LOAD DATA LOCAL INFILE (MySQL with local_infile enabled)')
+    args = parser.parse_args()
+
+    if args.method == 'load-data' and engine.dialect.name != 'mysql':
+        parser.error('--method load-data requires a MySQL database')
+
+    tasks = [
+        (args.seed, start, min(args.batch_size, args.rows - start), args.method)
+        for start in range(0, args.rows, args.batch_size)
+    ]
+
+    inserted = 0
+    start = time.perf_counter()
+    last_report = start
+    with multiprocessing.Pool(args.workers, initializer=_init_worker, initargs=(args.method,)) as pool:
+        for count in pool.imap_unordered(_seed_batch, tasks):
+            inserted += count
+            now = time.perf_counter()
+            if now - last_report >= 1 or inserted == args.rows:
+                sys.stdout.write(f'{inserted}/{args.rows} rows, {inserted / (now - start):,.0f} rows/s\n')
+                last_report = now
+
+    elapsed = time.perf_counter() - start
+    sys.stdout.write(f'Inserted {inserted} rows in {elapsed:.2f}s ({inserted / elapsed:,.0f} rows/s)\n')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,120 @@
+import asyncio
+import time
+from datetime import datetime, timezone
+
+import orjson
+from sqlalchemy import delete, select
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from src.database.locks import named_lock
+from src.database.models import CustomerEventModel
+from src.events.sinks import EventSink
+from src.utils.logger import Logger
+
+LOCK_NAME = 'customers_outbox_publisher'
+
+RETRY_DELAY_SECONDS = (1, 2, 5, 10, 30)
+
+
+class OutboxPublisher:
+    """
+    Drains the customer events outbox to a sink in batches.
+
+    Delivery is at least once: a batch is deleted from the outbox only after the sink accepted
+    it, so a crash in between publishes it again (consumers deduplicate on the event id).
+    Events are published in id order by a single publisher at a time: on MySQL the publisher of
+    each worker takes a named lock per batch and skips the round when another worker holds it.
+    The lock is taken on a connection held for the whole batch, and the session of the batch is
+    bound to it, so the commit does not hand the connection holding the lock back to the pool.
+    Writes of the same customer insert their event after the row is locked (see
+    CustomerRepository), so the ids, and the publishing order, follow the commit order per customer.
+
+    Attributes:
+        engine (Engine): The engine the batches connect with.
+        sink (EventSink): Destination of the events.
+        batch_size (int): Maximum number of events per batch.
+        published (int): Events published by this worker.
+        batches (int): Batches published by this worker.
+        failures (int): Batches the sink failed to publish.
+        publish_seconds (float): Time spent in the sink.
+        lag_seconds (float): Age of the newest event of the last batch when it was published.
+    Methods:
+        publish_batch() -> int:
+            Publishes the oldest events of the outbox, returns how many were published.
+        run(interval):
+            Publishes batches until cancelled, waiting interval seconds when the outbox is drained.
+        stats() -> dict:
+            Returns the counters exposed at /metrics.
+    """
+
+    def __init__(self, engine: Engine, sink: EventSink, batch_size: int = 500):
+        self.engine = engine
+        self.sink = sink
+        self.batch_size = batch_size
+        self.published = 0
+        self.batches = 0
+        self.failures = 0
+        self.publish_seconds = 0.0
+        self.lag_seconds = 0.0
+
+    def publish_batch(self) -> int:
+        with self.engine.connect() as connection, named_lock(connection, LOCK_NAME) as acquired:
+            if not acquired:
+                return 0
+
+            with Session(connection, autoflush=False) as db:
+                events = db.scalars(
+                    select(CustomerEventModel).order_by(CustomerEventModel.id).limit(self.batch_size)
+                ).all()
+                if not events:
+                    return 0
+
+                start = time.perf_counter()
+                self.sink.publish([to_message(event) for event in events])
+                self.publish_seconds += time.perf_counter() - start
+
+                newest = events[-1].created_at
+                db.execute(delete(CustomerEventModel).where(CustomerEventModel.id.in_([event.id for event in events])))
+                db.commit()
+
+        self.published += len(events)
+        self.batches += 1
+        self.lag_seconds = (datetime.now(timezone.utc).replace(tzinfo=None) - newest).total_seconds()
+        return len(events)
+
+    async def run(self, interval: float):
+        logger = Logger()
+        retries = 0
+        while True:
+            try:
+                count = await asyncio.to_thread(self.publish_batch)
+            except Exception as e:
+                self.failures += 1
+                delay = RETRY_DELAY_SECONDS[min(retries, len(RETRY_DELAY_SECONDS) - 1)]
+                retries += 1
+                logger.log('ERROR', "[outbox] Error publishing events, retrying in %ss: %s", delay, e)
+                await asyncio.sleep(delay)
+                continue
+            retries = 0
+            if count < self.batch_size:
+                await asyncio.sleep(interval)
+
+    def stats(self) -> dict:
+        return {
+            'published': self.published,
+            'batches': self.batches,
+            'failures': self.failures,
+            'publish_seconds': self.publish_seconds,
+            'lag_seconds': self.lag_seconds,
+        }
+
+
+def to_message(event: CustomerEventModel) -> dict:
+    return {
+        'id': event.id,
+        'type': event.type,
+        'customer_id': event.customer_id,
+        'occurred_at': event.created_at.isoformat(),
+        'data': orjson.loads(event.payload),
+    }
@@ -0,0 +1,97 @@
+import importlib
+import os
+import threading
+from abc import ABC, abstractmethod
+
+import orjson
+
+
+class EventSink(ABC):
+    """
+    EventSink is an abstract base class for the destinations of the customer lifecycle events.
+
+    Methods:
+        publish(events: list[dict]):
+            Delivers a batch of events, in order. It must only return once the events are
+            durably accepted; raising leaves the batch in the outbox to be retried.
+        close():
+            Releases the resources of the sink.
+    """
+
+    @abstractmethod
+    def publish(self, events: list[dict]):
+        pass
+
+    def close(self):
+        pass
+
+
+class FileSink(EventSink):
+    """
+    Appends the events as JSON lines to a local file, synced to disk after every batch.
+
+    Attributes:
+        path (str): File receiving the events.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.file = open(path, 'ab')
+
+    def publish(self, events: list[dict]):
+        self.file.write(b''.join(orjson.dumps(event) + b'\n' for event in events))
+        self.file.flush()
+        os.fsync(self.file.fileno())
+
+    def close(self):
+        self.file.close()
+
+
+class InMemorySink(EventSink):
+    """
+    Keeps the events in memory, a broker for tests and local runs.
+
+    Attributes:
+        events (list[dict]): Every event published, in order.
+    Methods:
+        wait_for(count, timeout) -> bool:
+            Waits until at least count events were published.
+    """
+
+    def __init__(self):
+        self.events = []
+        self.condition = threading.Condition()
+
+    def publish(self, events: list[dict]):
+        with self.condition:
+            self.events.extend(events)
+            self.condition.notify_all()
+
+    def wait_for(self, count: int, timeout: float) -> bool:
+        with self.condition:
+            return self.condition.wait_for(lambda: len(self.events) >= count, timeout)
+
+
+def create_sink(url: str) -> EventSink:
+    """
+    Builds the sink configured with EVENT_SINK.
+
+    Args:
+        url (str): 'memory', 'file:<path>', or '<module>:<attribute>' naming an EventSink subclass
+            (or factory) called without arguments, e.g. a wrapper around a message queue producer.
+
+    Raises:
+        ValueError: If the value does not name a sink.
+    """
+    if url == 'memory':
+        return InMemorySink()
+    if url.startswith('file:'):
+        return FileSink(url[len('file:'):])
+
+    module_name, _, attribute = url.partition(':')
+    if not module_name or not attribute:
+        raise ValueError(f'Invalid EVENT_SINK: {url}')
+    sink = getattr(importlib.import_module(module_name), attribute)()
+    if not isinstance(sink, EventSink):
+        raise ValueError(f'EVENT_SINK {url} is not an EventSink')
+    return sink
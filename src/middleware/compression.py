@@ -0,0 +1,86 @@
+import anyio
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.utils.compression import ResponseCompressor, levels_for, negotiate
+from src.utils.etag import encoded_etag
+
+
+class CompressionMiddleware:
+    """
+    ASGI middleware compressing response bodies with the encoding negotiated from Accept-Encoding
+    (zstd, br or gzip, see src.utils.compression).
+
+    Only complete bodies of compressible media types of at least minimum_size bytes are
+    compressed; streamed bodies are passed through. Bodies of offload_size bytes or more are
+    compressed in a worker thread so the event loop keeps serving other requests. Strong ETags
+    of compressed responses get the encoding as a suffix (see src.utils.etag.encoded_etag), as
+    the bytes differ from the identity encoding; they stay strong so If-Match accepts them.
+
+    Attributes:
+        app (ASGIApp): The wrapped application.
+        compressor (ResponseCompressor): Compresses and caches the bodies.
+        minimum_size (int): Smallest body compressed, in bytes.
+        offload_size (int): Smallest body compressed in a worker thread, in bytes.
+    """
+
+    def __init__(self, app: ASGIApp, compressor: ResponseCompressor, minimum_size: int = 1024, offload_size: int = 16384):
+        self.app = app
+        self.compressor = compressor
+        self.minimum_size = minimum_size
+        self.offload_size = offload_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        encoding = negotiate(Headers(scope=scope).get('accept-encoding', ''))
+        start_message = None
+
+        async def send_wrapper(message: Message):
+            nonlocal start_message
+            if message['type'] == 'http.response.start':
+                start_message = message
+                return
+            if start_message is None or message['type'] != 'http.response.body':
+                await send(message)
+                return
+
+            start, start_message = start_message, None
+            headers = MutableHeaders(scope=start)
+            levels = levels_for(headers.get('content-type'))
+            if levels is None or 'content-encoding' in headers:
+                await send(start)
+                await send(message)
+                return
+
+            headers.add_vary_header('Accept-Encoding')
+            body = message.get('body', b'')
+            if encoding is None or message.get('more_body', False) or len(body) < self.minimum_size:
+                await send(start)
+                await send(message)
+                return
+
+            compressed = await self.compress(body, encoding, levels[encoding])
+            headers['Content-Encoding'] = encoding
+            headers['Content-Length'] = str(len(compressed))
+            etag = headers.get('etag')
+            if etag is not None and not etag.startswith('W/'):
+                headers['ETag'] = encoded_etag(etag, encoding)
+            await send(start)
+            await send({'type': 'http.response.body', 'body': compressed})
+
+        await self.app(scope, receive, send_wrapper)
+
+    async def compress(self, body: bytes, encoding: str, level: int) -> bytes:
+        key = self.compressor.key(body, encoding, level)
+        compressed = self.compressor.lookup(key, body)
+        if compressed is not None:
+            return compressed
+        if len(body) >= self.offload_size:
+            compressed, seconds = await anyio.to_thread.run_sync(self.compressor.compress, body, encoding, level)
+        else:
+            compressed, seconds = self.compressor.compress(body, encoding, level)
+        self.compressor.store(key, body, compressed, seconds)
+        return compressed
@@ -0,0 +1,65 @@
+import time
+
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from src.database.connection import pool_wait
+from src.middleware.metrics import resolve_route
+from src.schemas.responses import BadResponse
+from src.utils.limiter import AdaptiveLimiter
+from src.utils.responses import EnvelopeResponse
+
+# Priority class per (method, route); routes that are not listed are 'normal'.
+ROUTE_PRIORITIES = {
+    ('POST', '/api/v1/auth/login'): 'high',
+    ('GET', '/api/v1/customers/{id}'): 'high',
+    ('GET', '/api/v1/customers/'): 'low',
+    ('GET', '/api/v1/customers/changes'): 'low',
+}
+
+# Monitoring and documentation routes are never limited.
+EXEMPT_ROUTES = {'/metrics', '/health/live', '/health/ready', '/docs', '/redoc', '/openapi.json'}
+
+
+class AdaptiveConcurrencyMiddleware:
+    """
+    ASGI middleware shedding load with fast 503 responses when the worker is overloaded.
+
+    Every request takes a slot of the AdaptiveLimiter before reaching the application. When the
+    limit of its priority class is reached the request is answered at once with a 503 and a
+    Retry-After header, instead of queueing in the threadpool for a database connection.
+
+    Attributes:
+        app (ASGIApp): The wrapped application.
+        limiter (AdaptiveLimiter): The concurrency limit.
+        retry_after (int): Value of the Retry-After header, in seconds.
+    """
+
+    def __init__(self, app: ASGIApp, limiter: AdaptiveLimiter, retry_after: int = 1):
+        self.app = app
+        self.limiter = limiter
+        self.retry_after = retry_after
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        route = resolve_route(scope)
+        if route in EXEMPT_ROUTES:
+            await self.app(scope, receive, send)
+            return
+
+        if not self.limiter.try_acquire(ROUTE_PRIORITIES.get((scope['method'], route), 'normal')):
+            response = EnvelopeResponse(
+                content=BadResponse(message='Service overloaded, retry later'),
+                status_code=503,
+                headers={'Retry-After': str(self.retry_after)},
+            )
+            await response(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.limiter.release(time.perf_counter() - start, pool_wait.recent)
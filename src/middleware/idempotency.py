@@ -0,0 +1,136 @@
+import hashlib
+
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.middleware.metrics import resolve_route
+from src.schemas.responses import BadResponse
+from src.utils.idempotency import IdempotencyStore
+from src.utils.metrics import MetricsRegistry
+from src.utils.responses import EnvelopeResponse
+
+# Writes accepting an Idempotency-Key header, as (method, route).
+IDEMPOTENT_ROUTES = {
+    ('POST', '/api/v1/customers/'),
+    ('PUT', '/api/v1/customers/{id}'),
+    ('DELETE', '/api/v1/customers/{id}'),
+}
+
+MAX_KEY_LENGTH = 255
+
+
+class IdempotencyMiddleware:
+    """
+    ASGI middleware making the writes of IDEMPOTENT_ROUTES safe to retry with an Idempotency-Key
+    header.
+
+    The first request with a key runs and its response is stored; a retry with the same key
+    gets the stored response (with an Idempotent-Replayed header) without reaching the handler
+    or the database. A retry arriving while the first request runs waits for it, up to
+    wait_timeout (409 after that). Keys are scoped to the Authorization header, and a key reused
+    with a different method, path or body is rejected with 422. 5xx responses are not stored,
+    so the request can be retried.
+
+    Attributes:
+        app (ASGIApp): The wrapped application.
+        store (IdempotencyStore): Stores the responses.
+        wait_timeout (float): Seconds a retry waits for the request in flight.
+        replays (int): Responses replayed.
+        conflicts (int): Retries answered 409 or 422.
+    """
+
+    def __init__(self, app: ASGIApp, store: IdempotencyStore, wait_timeout: float = 10.0):
+        self.app = app
+        self.store = store
+        self.wait_timeout = wait_timeout
+        self.replays = 0
+        self.conflicts = 0
+        MetricsRegistry().register_collector('idempotency', self.stats)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope['type'] != 'http' or (scope['method'], resolve_route(scope)) not in IDEMPOTENT_ROUTES:
+            await self.app(scope, receive, send)
+            return
+
+        headers = Headers(scope=scope)
+        idempotency_key = headers.get('idempotency-key')
+        if idempotency_key is None:
+            await self.app(scope, receive, send)
+            return
+        if not idempotency_key or len(idempotency_key) > MAX_KEY_LENGTH:
+            await self.reject(scope, receive, send, 400, f'Idempotency-Key must hold 1 to {MAX_KEY_LENGTH} characters')
+            return
+
+        body = await read_body(receive)
+        key = hashlib.blake2b(f"{headers.get('authorization', '')}\n{idempotency_key}".encode(), digest_size=16).hexdigest()
+        fingerprint = hashlib.blake2b(b'\n'.join([scope['method'].encode(), scope['path'].encode(), body]), digest_size=16).hexdigest()
+
+        entry = await self.store.reserve(key, fingerprint)
+        if entry is not None:
+            if entry['fingerprint'] != fingerprint:
+                self.conflicts += 1
+                await self.reject(scope, receive, send, 422, 'Idempotency-Key was already used with a different request')
+                return
+            if entry['status'] is None:
+                entry = await self.store.wait(key, self.wait_timeout)
+            if entry is None or entry['status'] is None:
+                self.conflicts += 1
+                await self.reject(scope, receive, send, 409, 'A request with this Idempotency-Key is in progress, retry later')
+                return
+            self.replays += 1
+            await send({'type': 'http.response.start', 'status': entry['status'], 'headers': entry['headers'] + [(b'idempotent-replayed', b'true')]})
+            await send({'type': 'http.response.body', 'body': entry['body']})
+            return
+
+        body_sent = False
+
+        async def replay_receive() -> Message:
+            nonlocal body_sent
+            if not body_sent:
+                body_sent = True
+                return {'type': 'http.request', 'body': body, 'more_body': False}
+            return await receive()
+
+        response = {'fingerprint': fingerprint, 'status': 500, 'headers': [], 'body': b''}
+        chunks = []
+
+        async def send_wrapper(message: Message):
+            if message['type'] == 'http.response.start':
+                response['status'] = message['status']
+                response['headers'] = list(message.get('headers', []))
+            elif message['type'] == 'http.response.body':
+                chunks.append(message.get('body', b''))
+            await send(message)
+
+        try:
+            await self.app(scope, replay_receive, send_wrapper)
+        except BaseException:
+            await self.store.release(key)
+            raise
+        if response['status'] >= 500:
+            await self.store.release(key)
+            return
+        response['body'] = b''.join(chunks)
+        await self.store.complete(key, response)
+
+    async def reject(self, scope: Scope, receive: Receive, send: Send, status_code: int, message: str):
+        response = EnvelopeResponse(content=BadResponse(message=message), status_code=status_code)
+        await response(scope, receive, send)
+
+    def stats(self) -> dict:
+        return {'replays': self.replays, 'conflicts': self.conflicts, **self.store.stats()}
+
+
+async def read_body(receive: Receive) -> bytes:
+    """
+    Reads the whole request body from the ASGI receive channel.
+    """
+    chunks = []
+    while True:
+        message = await receive()
+        if message['type'] != 'http.request':
+            break
+        chunks.append(message.get('body', b''))
+        if not message.get('more_body', False):
+            break
+    return b''.join(chunks)
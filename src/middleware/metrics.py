@@ -0,0 +1,66 @@
+import time
+
+from starlette.routing import Match
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.utils.metrics import MetricsRegistry
+
+UNMATCHED_ROUTE = 'unmatched'
+ROUTE_SCOPE_KEY = 'route_template'
+
+
+def resolve_route(scope: Scope) -> str:
+    """
+    Returns the path template of the route serving the request ('/api/v1/customers/{id}'),
+    so metrics are labelled by route instead of by raw path. The result is kept in the scope for
+    the inner middlewares.
+    """
+    if ROUTE_SCOPE_KEY in scope:
+        return scope[ROUTE_SCOPE_KEY]
+    path = UNMATCHED_ROUTE
+    for route in scope['app'].router.routes:
+        match, _ = route.matches(scope)
+        if match != Match.NONE:
+            path = route.path
+            break
+    scope[ROUTE_SCOPE_KEY] = path
+    return path
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware recording per-route request counts, status classes, latency and in-flight requests.
+
+    The middleware runs on the event loop thread of the worker, so MetricsRegistry is updated
+    without locks.
+
+    Attributes:
+        app (ASGIApp): The wrapped application.
+        registry (MetricsRegistry): The registry receiving the observations.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        self.registry = MetricsRegistry()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        route_metrics = self.registry.route(scope['method'], resolve_route(scope))
+        status_code = 500
+
+        async def send_wrapper(message: Message):
+            nonlocal status_code
+            if message['type'] == 'http.response.start':
+                status_code = message['status']
+            await send(message)
+
+        route_metrics.in_flight += 1
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            route_metrics.in_flight -= 1
+            self.registry.observe(route_metrics, status_code, time.perf_counter() - start)
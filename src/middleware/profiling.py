@@ -0,0 +1,70 @@
+import asyncio
+import random
+import re
+import time
+import uuid
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.utils.profiling import ProfileStore, start_profiling, stop_profiling, verify_signature
+
+ADMIN_PREFIX = '/admin/'
+
+
+class ProfilingMiddleware:
+    """
+    ASGI middleware profiling opt-in requests with cProfile.
+
+    A request is profiled when it carries a valid signed X-Profile header (see
+    src.utils.profiling.sign) or when it is picked by the sampling rate. At most one request
+    is profiled at a time per worker; the pstats output is stored in a bounded ProfileStore
+    and its name returned in the X-Profile-Id response header.
+
+    Attributes:
+        app (ASGIApp): The wrapped application.
+        store (ProfileStore): Where the profiles are stored.
+        secret (str | None): Secret used to verify the X-Profile header.
+        sample_rate (float): Fraction of requests profiled without a header.
+        busy (bool): Whether a request is currently being profiled.
+    """
+
+    def __init__(self, app: ASGIApp, store: ProfileStore, secret: str | None = None, sample_rate: float = 0.0):
+        self.app = app
+        self.store = store
+        self.secret = secret
+        self.sample_rate = sample_rate
+        self.busy = False
+
+    def should_profile(self, scope: Scope) -> bool:
+        if scope['path'].startswith(ADMIN_PREFIX):
+            return False
+        header = Headers(scope=scope).get('x-profile')
+        if header and self.secret:
+            return verify_signature(self.secret, header, scope['method'], scope['path'])
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope['type'] != 'http' or self.busy or not self.should_profile(scope):
+            await self.app(scope, receive, send)
+            return
+
+        self.busy = True
+        path = re.sub(r'\W+', '-', scope['path']).strip('-')[:64] or 'root'
+        name = f"{int(time.time() * 1000)}-{scope['method']}-{path}-{uuid.uuid4().hex[:8]}.prof"
+        slot, token = start_profiling(name)
+
+        async def send_wrapper(message: Message):
+            if message['type'] == 'http.response.start' and slot.profile is not None:
+                MutableHeaders(scope=message).append('X-Profile-Id', name)
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            stop_profiling(token)
+            try:
+                if slot.profile is not None:
+                    await asyncio.to_thread(self.store.save, slot.profile, name)
+            finally:
+                self.busy = False
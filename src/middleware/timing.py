@@ -0,0 +1,52 @@
+import time
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.utils.timing import SpanFileExporter, server_timing_header, start_request_timing, stop_request_timing
+
+
+class ServerTimingMiddleware:
+    """
+    ASGI middleware collecting the spans recorded with src.utils.timing.span during a request.
+
+    The spans are emitted in a Server-Timing response header and, when an exporter is given,
+    written as OTLP/JSON to a local file. When the middleware is not installed, span() returns
+    a shared no-op object.
+
+    Attributes:
+        app (ASGIApp): The wrapped application.
+        emit_header (bool): Whether to add the Server-Timing header to responses.
+        exporter (SpanFileExporter | None): Exporter receiving the spans of every request.
+    """
+
+    def __init__(self, app: ASGIApp, emit_header: bool = True, exporter: SpanFileExporter | None = None):
+        self.app = app
+        self.emit_header = emit_header
+        self.exporter = exporter
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        spans, token = start_request_timing()
+        start = time.perf_counter_ns()
+        status_code = 500
+
+        async def send_wrapper(message: Message):
+            nonlocal status_code
+            if message['type'] == 'http.response.start':
+                status_code = message['status']
+                if self.emit_header:
+                    headers = MutableHeaders(scope=message)
+                    headers.append('Server-Timing', server_timing_header(spans, time.perf_counter_ns() - start))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            stop_request_timing(token)
+            if self.exporter is not None:
+                route = scope['route'].path if 'route' in scope else 'unmatched'
+                self.exporter.export(scope['method'], route, status_code, start, time.perf_counter_ns(), spans)
@@ -31,3 +31,26 @@ class CustomerBase(BaseModel):
 
     model_config = ConfigDict(from_attributes=True)
 
+
+class CustomerChange(BaseModel):
+    """
+    CustomerChange schema for the customers returned by the change feed.
+
+    Attributes:
+        id (int): The ID of the customer.
+        first_name (str): The first name of the customer.
+        last_name (str): The last name of the customer.
+        email (str): The email address of the customer.
+        phone (str): The phone number of the customer.
+        created_at (datetime): UTC time the customer was created.
+        updated_at (datetime): UTC time the customer was last changed, the first key of the feed order.
+    """
+    id: int = Field(..., example=1)
+    first_name: str = Field(..., example="John")
+    last_name: str = Field(..., example="Doe")
+    email: str = Field(..., example="email@example.com")
+    phone: str = Field(..., example="+1234567890")
+    created_at: datetime = Field(..., example="2021-01-01T00:00:00")
+    updated_at: datetime = Field(..., example="2021-01-01T00:00:00")
+
+    model_config = ConfigDict(from_attributes=True)
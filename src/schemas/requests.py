@@ -1,8 +1,11 @@
 from pydantic import BaseModel, Field, field_validator
 from src.schemas.types import EmailStr, AlphaStr, PhoneNumberStr, PasswordStr
+from src.utils.config import Config
 
 import re
 
+settings = Config()
+
 class Login(BaseModel):
     """
     Login schema for user authentication.
@@ -30,3 +33,13 @@ class CustomerRequestBody(BaseModel):
     email: EmailStr = Field(..., example="email@example.com")
     password: PasswordStr = Field(..., example="password")
     phone: PhoneNumberStr = Field(..., example="+1234567890")
+
+
+class BatchGetRequestBody(BaseModel):
+    """
+    BatchGetRequestBody schema for resolving several customers in one request.
+
+    Attributes:
+        ids (list[int]): IDs of the customers (at most BATCH_GET_MAX_IDS), results are returned in the same order.
+    """
+    ids: list[int] = Field(..., min_length=1, max_length=settings.batch_get_max_ids, example=[1, 2, 3], description='IDs of the customers')
@@ -2,6 +2,17 @@ from pydantic import BaseModel, field_validator, Field
 from datetime import datetime
 from typing import List, Optional, Dict, Union
 
+from src.schemas.types import LENGTH_MESSAGES, PATTERN_MESSAGES
+
+VALUE_ERROR_PREFIX = 'Value error, '
+
+def remap(message: str | None, default: str) -> str:
+    """
+    Returns the message of a previous validator as pydantic reported it, or the default message.
+    """
+    return VALUE_ERROR_PREFIX + message if message is not None else default
+
+
 class ValidationErrorResponse(BaseModel):
     status: Optional[str] = Field('error', example='error')
     details: List[Dict[str, str]] = Field(..., example=[])
@@ -12,10 +23,18 @@ class ValidationErrorResponse(BaseModel):
     def construct_details(cls, value):
         details = []
         for error in value:
+            if error['type'] == 'string_pattern_mismatch':
+                message = remap(PATTERN_MESSAGES.get(error['ctx']['pattern']), error['msg'])
+            elif error['type'] == 'string_too_short':
+                message = remap(LENGTH_MESSAGES.get((error['type'], error['ctx']['min_length'])), error['msg'])
+            elif error['type'] == 'string_too_long':
+                message = remap(LENGTH_MESSAGES.get((error['type'], error['ctx']['max_length'])), error['msg'])
+            else:
+                message = error['msg']
             details.append(
                 {
-                    'field': error['loc'][0],
-                    'message': error['msg']
+                    'field': str(error['loc'][0]) if error['loc'] else 'body',
+                    'message': message
                 }
             )
         return details
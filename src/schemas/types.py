@@ -1,12 +1,38 @@
-from pydantic import AfterValidator
+from pydantic import AfterValidator, StringConstraints
 from typing import Annotated
 
-from src.schemas.validators import validate_only_letters, validate_email, validate_phone_number, validate_password
+from src.schemas.validators import validate_password
 
-AlphaStr = Annotated[str, AfterValidator(validate_only_letters)]
+# Constraints are checked by pydantic-core (Rust regex engine), without calling back into Python.
+ALPHA_PATTERN = r'^\p{L}+$'
 
-EmailStr = Annotated[str, AfterValidator(validate_email)]
+EMAIL_PATTERN = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
 
-PhoneNumberStr = Annotated[str, AfterValidator(validate_phone_number)]
+PHONE_NUMBER_PATTERN = r'^\+'
 
-PasswordStr = Annotated[str, AfterValidator(validate_password)]
+PHONE_NUMBER_MIN_LENGTH, PHONE_NUMBER_MAX_LENGTH = 10, 15
+
+PASSWORD_MIN_LENGTH = 8
+
+# Messages of the previous AfterValidator checks for pattern mismatches, used by ValidationErrorResponse
+# with the 'Value error, ' prefix pydantic gave them, so the 400 bodies keep their text.
+PATTERN_MESSAGES = {
+    ALPHA_PATTERN: 'Only letters are allowed',
+    EMAIL_PATTERN: 'Invalid email format, it should be like: test@example.com',
+    PHONE_NUMBER_PATTERN: 'Phone number should start with +',
+}
+
+# Same for length violations, per (error type, limit).
+LENGTH_MESSAGES = {
+    ('string_too_short', PHONE_NUMBER_MIN_LENGTH): 'Phone number should be 10-15 digits long',
+    ('string_too_long', PHONE_NUMBER_MAX_LENGTH): 'Phone number should be 10-15 digits long',
+    ('string_too_short', PASSWORD_MIN_LENGTH): 'Password should be at least 8 characters long',
+}
+
+AlphaStr = Annotated[str, StringConstraints(pattern=ALPHA_PATTERN)]
+
+EmailStr = Annotated[str, StringConstraints(pattern=EMAIL_PATTERN)]
+
+PhoneNumberStr = Annotated[str, StringConstraints(min_length=PHONE_NUMBER_MIN_LENGTH, max_length=PHONE_NUMBER_MAX_LENGTH, pattern=PHONE_NUMBER_PATTERN)]
+
+PasswordStr = Annotated[str, StringConstraints(min_length=PASSWORD_MIN_LENGTH), AfterValidator(validate_password)]
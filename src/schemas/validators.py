@@ -1,5 +1,7 @@
 import re
 
+DIGIT_PATTERN = re.compile(r'\d')
+
 def validate_only_letters(value: str):
     """
     Validate that the input string contains only letters.
@@ -79,11 +81,11 @@ def validate_password(value: str):
     """
     if len(value) < 8:
         raise ValueError('Password should be at least 8 characters long')
-    elif not any(char.isupper() for char in value):
+    elif value.lower() == value:
         raise ValueError('Password should contain at least one uppercase letter')
-    elif not any(char.islower() for char in value):
+    elif value.upper() == value:
         raise ValueError('Password should contain at least one lowercase letter')
-    elif not any(char.isdigit() for char in value):
+    elif not DIGIT_PATTERN.search(value):
         raise ValueError('Password should contain at least one digit')
     return value
     
\ No newline at end of file
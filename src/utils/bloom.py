@@ -0,0 +1,64 @@
+import hashlib
+import math
+import threading
+
+
+class CountingBloomFilter:
+    """
+    Counting Bloom filter: a probabilistic set answering "definitely absent" or "maybe present".
+
+    Every item increments k one-byte counters, so items can be removed again. Counters saturate
+    at 255 and are then never decremented. A removal of an item that was never added can only
+    cause false negatives or stale positives, so callers must keep an exact source of truth.
+
+    Attributes:
+        size (int): Number of counters.
+        hash_count (int): Number of counters per item (k).
+        items (int): Items added minus items removed.
+    Methods:
+        add(item):
+            Adds an item.
+        remove(item):
+            Removes an item previously added.
+        might_contain(item) -> bool:
+            False when the item is definitely absent.
+        false_positive_rate() -> float:
+            Expected false positive rate at the current number of items.
+    """
+
+    def __init__(self, capacity: int, error_rate: float):
+        self.size = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self.items = 0
+        self.counters = bytearray(self.size)
+        self.lock = threading.Lock()
+
+    def _indexes(self, item: str) -> list[int]:
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        first, second = int.from_bytes(digest[:8], 'little'), int.from_bytes(digest[8:], 'little') | 1
+        return [(first + i * second) % self.size for i in range(self.hash_count)]
+
+    def add(self, item: str):
+        indexes = self._indexes(item)
+        with self.lock:
+            for index in indexes:
+                if self.counters[index] < 255:
+                    self.counters[index] += 1
+            self.items += 1
+
+    def remove(self, item: str):
+        indexes = self._indexes(item)
+        with self.lock:
+            if not all(self.counters[index] for index in indexes):
+                return
+            for index in indexes:
+                if self.counters[index] < 255:
+                    self.counters[index] -= 1
+            self.items -= 1
+
+    def might_contain(self, item: str) -> bool:
+        counters = self.counters
+        return all(counters[index] for index in self._indexes(item))
+
+    def false_positive_rate(self) -> float:
+        return (1 - math.exp(-self.hash_count * max(self.items, 0) / self.size)) ** self.hash_count
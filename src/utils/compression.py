@@ -0,0 +1,167 @@
+import gzip
+import hashlib
+import time
+from collections import OrderedDict
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+def _gzip(body: bytes, level: int) -> bytes:
+    return gzip.compress(body, compresslevel=level, mtime=0)
+
+
+def _brotli(body: bytes, level: int) -> bytes:
+    return brotli.compress(body, quality=level)
+
+
+def _zstd(body: bytes, level: int) -> bytes:
+    return zstandard.ZstdCompressor(level=level).compress(body)
+
+
+# Supported encodings in order of preference; brotli and zstd are skipped when their package is missing.
+CODECS = {
+    encoding: codec
+    for encoding, codec, available in (
+        ('zstd', _zstd, zstandard is not None),
+        ('br', _brotli, brotli is not None),
+        ('gzip', _gzip, True),
+    )
+    if available
+}
+
+# Compression level per media type and encoding; other media types are never compressed.
+# JSON pages are served per request, so levels favour speed over the last few percent.
+COMPRESSION_LEVELS = {
+    'application/json': {'zstd': 3, 'br': 4, 'gzip': 6},
+    'text/csv': {'zstd': 6, 'br': 5, 'gzip': 6},
+    'text/plain': {'zstd': 3, 'br': 4, 'gzip': 6},
+    'text/html': {'zstd': 3, 'br': 4, 'gzip': 6},
+}
+
+
+def negotiate(accept_encoding: str) -> str | None:
+    """
+    Returns the encoding to use for an Accept-Encoding header: the supported encoding with the
+    highest q-value, ties going to the order of CODECS. None when no encoding is acceptable.
+    """
+    accepted = {}
+    for part in accept_encoding.split(','):
+        coding, _, parameters = part.partition(';')
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        quality = 1.0
+        parameters = parameters.strip()
+        if parameters.startswith('q='):
+            try:
+                quality = float(parameters[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[coding] = quality
+
+    best, best_quality = None, 0.0
+    for encoding in CODECS:
+        quality = accepted.get(encoding, accepted.get('*', 0.0))
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+def levels_for(content_type: str | None) -> dict | None:
+    """
+    Returns the compression levels of a Content-Type, None when it is not compressed.
+    """
+    if not content_type:
+        return None
+    return COMPRESSION_LEVELS.get(content_type.partition(';')[0].strip().lower())
+
+
+class ResponseCompressor:
+    """
+    Compresses response bodies and keeps the compressed bodies of the most recent distinct
+    responses, so a hot page served identically to many clients is compressed once.
+
+    The cache is keyed by a hash of the uncompressed body, the encoding and the level: hashing
+    is an order of magnitude cheaper than compressing. compress() may run in a worker thread;
+    the cache and the counters are only touched by lookup() and store(), which run on the
+    event loop (see CompressionMiddleware), so they need no locks.
+
+    Attributes:
+        cache_entries (int): Maximum number of compressed bodies kept, 0 disables the cache.
+        compressed (dict): Responses compressed per encoding.
+        bytes_in (int): Uncompressed bytes of the compressed responses.
+        bytes_out (int): Compressed bytes sent.
+        seconds (float): Time spent compressing.
+        cache_hits (int): Responses served from the cache.
+    Methods:
+        key(body, encoding, level) -> tuple:
+            Returns the cache key of a body (the body is only hashed when the cache is enabled).
+        lookup(key, body) -> bytes | None:
+            Returns the cached compressed body of body.
+        compress(body, encoding, level) -> tuple[bytes, float]:
+            Compresses a body, returns it with the time spent.
+        store(key, body, compressed, seconds):
+            Records a compression and caches its result.
+        stats() -> dict:
+            Returns the gauges exposed at /metrics.
+    """
+
+    def __init__(self, cache_entries: int = 0):
+        self.cache_entries = cache_entries
+        self.cache: OrderedDict[tuple, bytes] = OrderedDict()
+        self.compressed = {encoding: 0 for encoding in CODECS}
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.seconds = 0.0
+        self.cache_hits = 0
+
+    def key(self, body: bytes, encoding: str, level: int) -> tuple:
+        digest = hashlib.blake2b(body, digest_size=16).digest() if self.cache_entries > 0 else None
+        return (encoding, level, digest)
+
+    def lookup(self, key: tuple, body: bytes) -> bytes | None:
+        compressed = self.cache.get(key)
+        if compressed is not None:
+            self.cache.move_to_end(key)
+            self.cache_hits += 1
+            self._count(key[0], body, compressed)
+        return compressed
+
+    def compress(self, body: bytes, encoding: str, level: int) -> tuple[bytes, float]:
+        start = time.perf_counter()
+        compressed = CODECS[encoding](body, level)
+        return compressed, time.perf_counter() - start
+
+    def store(self, key: tuple, body: bytes, compressed: bytes, seconds: float):
+        self._count(key[0], body, compressed)
+        self.seconds += seconds
+        if self.cache_entries > 0:
+            self.cache[key] = compressed
+            if len(self.cache) > self.cache_entries:
+                self.cache.popitem(last=False)
+
+    def _count(self, encoding: str, body: bytes, compressed: bytes):
+        self.compressed[encoding] += 1
+        self.bytes_in += len(body)
+        self.bytes_out += len(compressed)
+
+    def stats(self) -> dict:
+        stats = {
+            'bytes_in': self.bytes_in,
+            'bytes_out': self.bytes_out,
+            'ratio': self.bytes_out / self.bytes_in if self.bytes_in else 0.0,
+            'seconds': self.seconds,
+            'cache_hits': self.cache_hits,
+            'cache_entries': len(self.cache),
+        }
+        for encoding, count in self.compressed.items():
+            stats[f'responses_{encoding}'] = count
+        return stats
@@ -1,4 +1,5 @@
 from pydantic_settings import BaseSettings, SettingsConfigDict
+from typing import Optional
 import os
 
 class Config(BaseSettings):
@@ -13,5 +14,52 @@ class Config(BaseSettings):
     token_secret_key: str
     token_algorithm: str
     token_expiration_in_minutes: int
+    database_url: Optional[str] = None
+    database_query_cache_size: int = 500
+    log_level: str = 'DEBUG'
+    log_info_sample_rate: float = 1.0
+    log_queue_size: int = 10000
+    metrics_multiprocess_dir: Optional[str] = None
+    metrics_flush_interval_seconds: float = 5.0
+    server_timing_enabled: bool = False
+    trace_export_path: Optional[str] = None
+    profiling_secret: Optional[str] = None
+    profiling_sample_rate: float = 0.0
+    profiling_dir: str = 'profiles'
+    profiling_max_files: int = 50
+    change_feed_settle_seconds: float = 1.0
+    change_feed_retention_seconds: float = 604800.0
+    event_sink: Optional[str] = None
+    outbox_batch_size: int = 500
+    outbox_poll_interval_seconds: float = 1.0
+    purge_enabled: bool = True
+    purge_batch_size: int = 100
+    purge_max_rows_per_second: float = 500.0
+    purge_interval_seconds: float = 30.0
+    email_filter_enabled: bool = True
+    email_filter_capacity: int = 1000000
+    email_filter_error_rate: float = 0.01
+    singleflight_enabled: bool = True
+    singleflight_timeout_seconds: float = 2.0
+    concurrency_limit_enabled: bool = True
+    concurrency_limit_initial: int = 64
+    concurrency_limit_min: int = 8
+    concurrency_limit_max: int = 512
+    concurrency_latency_tolerance: float = 2.0
+    concurrency_pool_wait_threshold_seconds: float = 0.05
+    concurrency_retry_after_seconds: int = 1
+    compression_enabled: bool = True
+    compression_minimum_size: int = 1024
+    compression_offload_size: int = 16384
+    compression_cache_entries: int = 256
+    batch_get_max_ids: int = 1000
+    idempotency_enabled: bool = True
+    idempotency_store: str = 'memory'
+    idempotency_ttl_seconds: float = 86400.0
+    idempotency_max_entries: int = 10000
+    idempotency_wait_seconds: float = 10.0
+    health_probe_interval_seconds: float = 5.0
+    health_probe_stale_seconds: float = 15.0
+    health_min_pool_headroom: int = 1
 
-    model_config = SettingsConfigDict(env_file=f"{os.getcwd()}/.env.dev")
\ No newline at end of file
+    model_config = SettingsConfigDict(env_file=f"{os.getcwd()}/.env.dev")
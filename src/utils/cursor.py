@@ -0,0 +1,63 @@
+import base64
+from datetime import datetime, timezone
+
+import orjson
+
+
+def encode_cursor(values: dict) -> str:
+    """
+    Encodes keyset positions into an opaque, URL safe cursor.
+    """
+    return base64.urlsafe_b64encode(orjson.dumps(values)).rstrip(b'=').decode()
+
+
+def decode_cursor(cursor: str) -> dict:
+    """
+    Decodes a cursor built with encode_cursor.
+
+    Raises:
+        ValueError: If the cursor is not a valid cursor.
+    """
+    try:
+        values = orjson.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+    except (ValueError, orjson.JSONDecodeError) as e:
+        raise ValueError('Invalid cursor') from e
+    if not isinstance(values, dict):
+        raise ValueError('Invalid cursor')
+    return values
+
+
+def to_position(value: list | None) -> tuple[datetime, int] | None:
+    """
+    Converts a [timestamp, id] cursor entry to a (naive UTC datetime, id) keyset position.
+
+    Raises:
+        ValueError: If the entry is malformed.
+    """
+    if value is None:
+        return None
+    if not isinstance(value, list) or len(value) != 2 or not isinstance(value[1], int):
+        raise ValueError('Invalid cursor')
+    return parse_timestamp(value[0]), value[1]
+
+
+def from_position(position: tuple[datetime, int] | None) -> list | None:
+    if position is None:
+        return None
+    timestamp, id = position
+    return [timestamp.isoformat(), id]
+
+
+def parse_timestamp(value: str) -> datetime:
+    """
+    Parses an ISO 8601 timestamp into a naive UTC datetime, naive input is taken as UTC.
+
+    Raises:
+        ValueError: If the value is not an ISO 8601 timestamp.
+    """
+    if not isinstance(value, str):
+        raise ValueError('Invalid timestamp')
+    timestamp = datetime.fromisoformat(value)
+    if timestamp.tzinfo is not None:
+        timestamp = timestamp.astimezone(timezone.utc).replace(tzinfo=None)
+    return timestamp
@@ -1,9 +1,16 @@
-from fastapi import Request, HTTPException, status
+import hmac
+from typing import Awaitable, Callable
+
+from fastapi import Header, Request, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from pydantic import BaseModel
 
 from src.schemas.responses import ValidationErrorResponse
+from src.utils.config import Config
 from src.utils.token import JWTManager
 
+settings = Config()
+
 
 class JWTBearerDependencie(HTTPBearer):
     """
@@ -37,3 +44,45 @@ class JWTBearerDependencie(HTTPBearer):
             raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail={'error': error.__str__()})
     
         return decoded_token
+
+
+async def get_request_body(req: Request) -> bytes:
+    """
+    Returns the raw request body, so handlers can validate it with model_validate_json
+    instead of having FastAPI parse it into a dict first.
+    """
+    return await req.body()
+
+
+def get_limited_request_body(max_bytes: int) -> Callable[[Request], Awaitable[bytes]]:
+    """
+    Builds a get_request_body dependency that rejects, with a 413, a request whose Content-Length
+    exceeds max_bytes before its body is read and parsed.
+    """
+    async def dependency(req: Request) -> bytes:
+        content_length = req.headers.get('content-length')
+        if content_length is not None and content_length.isdigit() and int(content_length) > max_bytes:
+            raise HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail={'error': 'Request body too large'})
+        return await req.body()
+    return dependency
+
+
+def request_body_openapi(model: type[BaseModel]) -> dict:
+    """
+    Builds the openapi_extra documenting a JSON request body read through get_request_body.
+    """
+    return {
+        'requestBody': {
+            'required': True,
+            'content': {'application/json': {'schema': model.model_json_schema()}}
+        }
+    }
+
+
+def verify_admin_token(x_admin_token: str | None = Header(None)):
+    """
+    Allows the request only when the X-Admin-Token header matches the PROFILING_SECRET.
+    Raises an HTTPException with status code 401 otherwise, or when no secret is configured.
+    """
+    if not settings.profiling_secret or not x_admin_token or not hmac.compare_digest(x_admin_token, settings.profiling_secret):
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail={'error': 'Invalid admin token'})
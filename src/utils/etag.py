@@ -0,0 +1,50 @@
+import hashlib
+import re
+
+# Suffix added to a strong ETag by CompressionMiddleware, naming the content coding of the bytes.
+ENCODING_SUFFIX_PATTERN = re.compile(r'-(?:gzip|br|zstd)"$')
+
+
+def version_etag(id: int, version: int, fields: tuple[str, ...] | None = None) -> str:
+    """
+    Returns the strong ETag of a versioned row, which changes on every update of the row.
+    A sparse fieldset is a different representation of the row, so its fields are part of the ETag.
+    """
+    if fields is None:
+        return f'"{id}.{version}"'
+    return f'"{id}.{version}.{hashlib.blake2b(",".join(fields).encode(), digest_size=8).hexdigest()}"'
+
+
+def body_etag(body: bytes) -> str:
+    """
+    Returns a weak ETag derived from a rendered response body.
+    """
+    return f'W/"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+
+
+def encoded_etag(etag: str, encoding: str) -> str:
+    """
+    Returns the strong ETag of a representation compressed with encoding: the bytes differ from
+    the identity encoding, so the ETag does too, and it stays strong for If-Match.
+    """
+    return f'{etag[:-1]}-{encoding}"'
+
+
+def etag_matches(header: str | None, etag: str, weak: bool = True) -> bool:
+    """
+    Checks an ETag against an If-None-Match (weak comparison) or If-Match (strong comparison,
+    weak=False) header holding '*' or a comma separated list of ETags. The encoding suffix of
+    encoded_etag is ignored: every content coding of a version matches it.
+    """
+    if header is None:
+        return False
+    for candidate in header.split(','):
+        candidate = ENCODING_SUFFIX_PATTERN.sub('"', candidate.strip())
+        if candidate == '*':
+            return True
+        if weak:
+            if candidate.removeprefix('W/') == etag.removeprefix('W/'):
+                return True
+        elif candidate == etag and not etag.startswith('W/'):
+            return True
+    return False
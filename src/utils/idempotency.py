@@ -0,0 +1,151 @@
+import asyncio
+import importlib
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+
+
+class IdempotencyStore(ABC):
+    """
+    IdempotencyStore is an abstract base class for the stores of the responses of the requests
+    sent with an Idempotency-Key header (see src.middleware.idempotency).
+
+    An entry is a dict holding the fingerprint of the request and, once it completed, its
+    response: 'status', 'headers' (raw header pairs) and 'body'. An entry whose status is None
+    is in flight. Entries expire after the TTL of the store.
+
+    Methods:
+        reserve(key, fingerprint) -> dict | None:
+            Creates an in-flight entry for the key and returns None, or returns the existing entry.
+        complete(key, entry):
+            Stores the response of the request holding the key.
+        release(key):
+            Removes an entry, so the request can be retried.
+        get(key) -> dict | None:
+            Returns the entry of a key.
+        wait(key, timeout) -> dict | None:
+            Waits until the entry of a key is no longer in flight and returns it.
+    """
+
+    @abstractmethod
+    async def reserve(self, key: str, fingerprint: str) -> dict | None:
+        pass
+
+    @abstractmethod
+    async def complete(self, key: str, entry: dict):
+        pass
+
+    @abstractmethod
+    async def release(self, key: str):
+        pass
+
+    @abstractmethod
+    async def get(self, key: str) -> dict | None:
+        pass
+
+    async def wait(self, key: str, timeout: float) -> dict | None:
+        deadline = time.monotonic() + timeout
+        while True:
+            entry = await self.get(key)
+            if entry is None or entry['status'] is not None or time.monotonic() >= deadline:
+                return entry
+            await asyncio.sleep(0.05)
+
+    def stats(self) -> dict:
+        return {}
+
+
+class InMemoryIdempotencyStore(IdempotencyStore):
+    """
+    Keeps the entries in the memory of the worker, bounded to max_entries (the least recently
+    used are evicted first) and expiring after ttl seconds.
+
+    Only the worker that served a request can replay it; with several workers or instances,
+    use a shared store. The store is used from the event loop only, so it needs no locks, and
+    waiters are woken by an asyncio.Event instead of polling.
+
+    Attributes:
+        max_entries (int): Maximum number of entries kept.
+        ttl (float): Seconds an entry is kept.
+    """
+
+    def __init__(self, max_entries: int, ttl: float):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.entries: OrderedDict[str, tuple[float, dict]] = OrderedDict()
+        self.events: dict[str, asyncio.Event] = {}
+
+    async def reserve(self, key: str, fingerprint: str) -> dict | None:
+        entry = await self.get(key)
+        if entry is not None:
+            return entry
+        self._put(key, {'fingerprint': fingerprint, 'status': None})
+        self.events[key] = asyncio.Event()
+        return None
+
+    async def complete(self, key: str, entry: dict):
+        self._put(key, entry)
+        self._wake(key)
+
+    async def release(self, key: str):
+        self.entries.pop(key, None)
+        self._wake(key)
+
+    async def get(self, key: str) -> dict | None:
+        item = self.entries.get(key)
+        if item is None:
+            return None
+        expires_at, entry = item
+        if expires_at < time.monotonic():
+            del self.entries[key]
+            return None
+        self.entries.move_to_end(key)
+        return entry
+
+    async def wait(self, key: str, timeout: float) -> dict | None:
+        event = self.events.get(key)
+        if event is not None:
+            try:
+                await asyncio.wait_for(event.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+        return await self.get(key)
+
+    def stats(self) -> dict:
+        return {'entries': len(self.entries), 'in_flight': len(self.events)}
+
+    def _put(self, key: str, entry: dict):
+        self.entries[key] = (time.monotonic() + self.ttl, entry)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    def _wake(self, key: str):
+        event = self.events.pop(key, None)
+        if event is not None:
+            event.set()
+
+
+def create_store(url: str, max_entries: int, ttl: float) -> IdempotencyStore:
+    """
+    Builds the store configured with IDEMPOTENCY_STORE.
+
+    Args:
+        url (str): 'memory', or '<module>:<attribute>' naming an IdempotencyStore subclass (or
+            factory) called with max_entries and ttl, e.g. a wrapper around a shared cache.
+        max_entries (int): Maximum number of entries kept.
+        ttl (float): Seconds an entry is kept.
+
+    Raises:
+        ValueError: If the value does not name a store.
+    """
+    if url == 'memory':
+        return InMemoryIdempotencyStore(max_entries, ttl)
+
+    module_name, _, attribute = url.partition(':')
+    if not module_name or not attribute:
+        raise ValueError(f'Invalid IDEMPOTENCY_STORE: {url}')
+    store = getattr(importlib.import_module(module_name), attribute)(max_entries, ttl)
+    if not isinstance(store, IdempotencyStore):
+        raise ValueError(f'IDEMPOTENCY_STORE {url} is not an IdempotencyStore')
+    return store
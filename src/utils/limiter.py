@@ -0,0 +1,112 @@
+import time
+
+# Share of the limit each priority class may use: low priority requests are shed first.
+PRIORITY_SHARES = {
+    'high': 1.0,
+    'normal': 0.8,
+    'low': 0.5,
+}
+
+
+class AdaptiveLimiter:
+    """
+    AIMD concurrency limit driven by request latency and database pool checkout wait.
+
+    The limit grows by 1/limit per request completed while the limit is in use (about +1 per
+    limit requests) and is multiplied by backoff when the worker is overloaded, at most once per
+    cooldown. The worker is overloaded when the recent pool checkout wait is over
+    pool_wait_threshold (requests queue for a connection) or when the short-term latency average
+    exceeds latency_tolerance times the long-term average (the latency gradient).
+
+    Requests of a priority class are admitted while the in-flight requests are under the class
+    share of the limit, so high priority requests keep headroom when low priority ones are shed.
+
+    The limiter is only used from the event loop (see AdaptiveConcurrencyMiddleware), so it
+    needs no locks.
+
+    Attributes:
+        limit (float): Current concurrency limit.
+        min_limit (int): Lower bound of the limit.
+        max_limit (int): Upper bound of the limit.
+        in_flight (int): Requests being served.
+        short_latency (float): Fast moving average of the latency, in seconds.
+        long_latency (float): Slow moving average of the latency, in seconds.
+        shed (dict): Rejected requests per priority class.
+        decreases (int): Number of times the limit was decreased.
+    Methods:
+        try_acquire(priority) -> bool:
+            Admits a request of the priority class if the limit allows it.
+        release(latency, pool_wait):
+            Records a completed request and adapts the limit.
+        stats() -> dict:
+            Returns the gauges exposed at /metrics.
+    """
+
+    def __init__(
+        self,
+        initial_limit: int = 64,
+        min_limit: int = 8,
+        max_limit: int = 512,
+        latency_tolerance: float = 2.0,
+        pool_wait_threshold: float = 0.05,
+        backoff: float = 0.9,
+        cooldown: float = 0.25,
+        warmup_samples: int = 100,
+    ):
+        self.limit = float(initial_limit)
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.latency_tolerance = latency_tolerance
+        self.pool_wait_threshold = pool_wait_threshold
+        self.backoff = backoff
+        self.cooldown = cooldown
+        self.warmup_samples = warmup_samples
+        self.in_flight = 0
+        self.samples = 0
+        self.short_latency = 0.0
+        self.long_latency = 0.0
+        self.last_decrease = 0.0
+        self.decreases = 0
+        self.shed = {priority: 0 for priority in PRIORITY_SHARES}
+
+    def try_acquire(self, priority: str) -> bool:
+        if self.in_flight >= self.limit * PRIORITY_SHARES[priority]:
+            self.shed[priority] += 1
+            return False
+        self.in_flight += 1
+        return True
+
+    def release(self, latency: float, pool_wait: float):
+        self.in_flight -= 1
+        self.samples += 1
+        if self.samples == 1:
+            self.short_latency = self.long_latency = latency
+        else:
+            self.short_latency += 0.2 * (latency - self.short_latency)
+            self.long_latency += 0.01 * (latency - self.long_latency)
+
+        if self._overloaded(pool_wait):
+            now = time.monotonic()
+            if now - self.last_decrease >= self.cooldown:
+                self.limit = max(self.min_limit, self.limit * self.backoff)
+                self.last_decrease = now
+                self.decreases += 1
+        elif self.in_flight + 1 >= self.limit / 2:
+            self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+
+    def _overloaded(self, pool_wait: float) -> bool:
+        if pool_wait > self.pool_wait_threshold:
+            return True
+        return self.samples > self.warmup_samples and self.short_latency > self.latency_tolerance * self.long_latency
+
+    def stats(self) -> dict:
+        stats = {
+            'limit': self.limit,
+            'in_flight': self.in_flight,
+            'decreases': self.decreases,
+            'short_latency_seconds': self.short_latency,
+            'long_latency_seconds': self.long_latency,
+        }
+        for priority, count in self.shed.items():
+            stats[f'shed_{priority}'] = count
+        return stats
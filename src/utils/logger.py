@@ -1,5 +1,107 @@
+import atexit
 import logging
-from datetime import datetime
+import queue
+import random
+import sys
+import threading
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+
+import orjson
+
+from src.utils.config import Config
+
+REDACTED = '[REDACTED]'
+
+SENSITIVE_FIELDS = frozenset({'password', 'token', 'authorization', 'secret', 'credentials'})
+
+LEVELS = {
+    'DEBUG': logging.DEBUG,
+    'INFO': logging.INFO,
+    'WARNING': logging.WARNING,
+    'ERROR': logging.ERROR,
+}
+
+
+def redact(value):
+    """
+    Returns a copy of value where every dict key listed in SENSITIVE_FIELDS is masked.
+
+    Args:
+        value: A dict, list, tuple or scalar value to redact.
+
+    Returns:
+        The redacted copy of value.
+    """
+    if isinstance(value, dict):
+        return {
+            key: REDACTED if str(key).lower() in SENSITIVE_FIELDS else redact(item)
+            for key, item in value.items()
+        }
+    if isinstance(value, (list, tuple)):
+        return type(value)(redact(item) for item in value)
+    return value
+
+
+class JSONFormatter(logging.Formatter):
+    """
+    Formats log records as one JSON object per line.
+
+    The output contains the timestamp, level, logger name and message, plus the structured
+    fields passed to Logger.log. Message arguments and fields are redacted before formatting.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        if record.args:
+            record.args = redact(record.args)
+        entry = {
+            'timestamp': datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+        }
+        fields = getattr(record, 'fields', None)
+        if fields:
+            entry.update(redact(fields))
+        if record.exc_info:
+            entry['exception'] = self.formatException(record.exc_info)
+        return orjson.dumps(entry, default=str).decode()
+
+
+class NonBlockingQueueHandler(QueueHandler):
+    """
+    QueueHandler that never blocks or formats on the calling thread.
+
+    Records are enqueued as they are, formatting happens on the QueueListener thread.
+    When the queue is full the record is dropped and counted instead of stalling the request.
+
+    Attributes:
+        dropped (int): Number of records dropped because the queue was full.
+    """
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class DrainingQueueListener(QueueListener):
+    """
+    QueueListener whose stop() waits for room in a full queue instead of raising queue.Full,
+    so every record enqueued before shutdown is written.
+    """
+
+    def enqueue_sentinel(self):
+        self.queue.put(self._sentinel)
+
 
 class Logger:
     """
@@ -7,43 +109,56 @@ class Logger:
     Attributes:
         _instance (Logger): The singleton instance of the Logger class.
         logger (logging.Logger): The logger instance used for logging messages.
+        handler (NonBlockingQueueHandler): The handler enqueueing records for the listener thread.
+        listener (DrainingQueueListener): The listener writing formatted records to stderr.
+        info_sample_rate (float): Fraction of INFO messages that are emitted.
     Methods:
         __new__(cls):
             Creates and returns the singleton instance of the Logger class.
         _configure():
-            Configures the logger instance with a stream handler and sets the logging level to DEBUG.
-        log(level, message):
+            Configures the queue handler, the JSON stream listener and the logging level from Config.
+        log(level, message, *args, **fields):
             Logs a message with the specified logging level.
             Args:
                 level (str): The logging level ('INFO', 'DEBUG', 'ERROR', 'WARNING').
-                message (str): The message to log.
+                message (str): The message to log, formatted lazily with args ('%s' style).
+                fields: Structured fields added to the JSON output.
     """
     _instance = None
+    _lock = threading.Lock()
 
     def __new__(cls):
         if cls._instance == None:
-            cls._instance = super(Logger, cls).__new__(cls)
-            cls._instance._configure()
+            with cls._lock:
+                if cls._instance == None:
+                    instance = super(Logger, cls).__new__(cls)
+                    instance._configure()
+                    cls._instance = instance
         return cls._instance
-    
+
     def _configure(self):
+        settings = Config()
+
         self.logger = logging.getLogger('Logger')
-        self.logger.setLevel(logging.DEBUG)
+        self.logger.setLevel(LEVELS.get(settings.log_level.upper(), logging.DEBUG))
+        self.logger.propagate = False
+        self.info_sample_rate = settings.log_info_sample_rate
 
         if not self.logger.handlers:
-            handler = logging.StreamHandler()
-            self.logger.addHandler(handler)
-    
-    def log(self, level, message):
-        timestamp = datetime.now().isoformat()
-        if level == 'INFO':
-            self.logger.info(f'{timestamp} [{level}] {message}')
-        elif level == 'DEBUG':
-            self.logger.debug(f'{timestamp} [{level}]  {message}')
-        elif level == 'ERROR':
-            self.logger.error(f'{timestamp} [{level}]  {message}')
-        elif level == 'WARNING':
-            self.logger.warning(f'{timestamp} [{level}] {message}')
-        else:
-            self.logger.info(f'{timestamp} [{level}] {message}')
-            
\ No newline at end of file
+            stream_handler = logging.StreamHandler(sys.stderr)
+            stream_handler.setFormatter(JSONFormatter())
+
+            self.handler = NonBlockingQueueHandler(queue.Queue(maxsize=settings.log_queue_size))
+            self.listener = DrainingQueueListener(self.handler.queue, stream_handler)
+            self.listener.start()
+            atexit.register(self.listener.stop)
+
+            self.logger.addHandler(self.handler)
+
+    def log(self, level, message, *args, **fields):
+        levelno = LEVELS.get(level, logging.INFO)
+        if not self.logger.isEnabledFor(levelno):
+            return
+        if levelno == logging.INFO and self.info_sample_rate < 1.0 and random.random() >= self.info_sample_rate:
+            return
+        self.logger.log(levelno, message, *args, extra={'fields': fields} if fields else None)
@@ -0,0 +1,239 @@
+import glob
+import os
+import tempfile
+from bisect import bisect_left
+from typing import Callable
+
+import orjson
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class RouteMetrics:
+    """
+    Counters, latency histogram and in-flight gauge of a single (method, route) pair.
+
+    Attributes:
+        count (int): Number of completed requests.
+        statuses (dict): Completed requests per status class ('2xx', '4xx', ...).
+        buckets (list[int]): Non-cumulative histogram bucket counts, the last one is +Inf.
+        duration_sum (float): Sum of the request durations in seconds.
+        in_flight (int): Requests currently being served.
+    """
+    __slots__ = ('count', 'statuses', 'buckets', 'duration_sum', 'in_flight')
+
+    def __init__(self, bucket_count: int):
+        self.count = 0
+        self.statuses = {}
+        self.buckets = [0] * (bucket_count + 1)
+        self.duration_sum = 0.0
+        self.in_flight = 0
+
+    def snapshot(self) -> dict:
+        return {
+            'count': self.count,
+            'statuses': dict(self.statuses),
+            'buckets': list(self.buckets),
+            'sum': self.duration_sum,
+            'in_flight': self.in_flight,
+        }
+
+
+class MetricsRegistry:
+    """
+    A singleton registry holding the request metrics of the current worker process.
+
+    Request metrics are only updated from the event loop (see MetricsMiddleware), so the
+    aggregation is per worker and needs no locks. Other components (database pool, caches)
+    register collectors, callables returning a dict of gauge values read at scrape time.
+
+    Attributes:
+        _instance (MetricsRegistry): The singleton instance of the MetricsRegistry class.
+        buckets (tuple[float]): Upper bounds of the latency histogram buckets, in seconds.
+        routes (dict): RouteMetrics per (method, route) pair.
+        collectors (dict): Collector callables per metric name prefix.
+    Methods:
+        route(method, route) -> RouteMetrics:
+            Returns the metrics of a route, creating them on first use.
+        observe(route_metrics, status_code, duration):
+            Records a completed request.
+        register_collector(name, collector):
+            Registers a callable whose values are exposed as '<name>_<key>' gauges.
+        snapshot() -> dict:
+            Returns a serializable copy of the metrics of this process.
+        render(snapshot) -> str:
+            Renders a snapshot in the Prometheus text exposition format.
+    """
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(MetricsRegistry, cls).__new__(cls)
+            cls._instance._configure()
+        return cls._instance
+
+    def _configure(self):
+        self.buckets = DEFAULT_BUCKETS
+        self.routes = {}
+        self.collectors = {}
+
+    def route(self, method: str, route: str) -> RouteMetrics:
+        key = (method, route)
+        route_metrics = self.routes.get(key)
+        if route_metrics is None:
+            route_metrics = self.routes[key] = RouteMetrics(len(self.buckets))
+        return route_metrics
+
+    def observe(self, route_metrics: RouteMetrics, status_code: int, duration: float):
+        status_class = f'{status_code // 100}xx'
+        route_metrics.count += 1
+        route_metrics.statuses[status_class] = route_metrics.statuses.get(status_class, 0) + 1
+        route_metrics.buckets[bisect_left(self.buckets, duration)] += 1
+        route_metrics.duration_sum += duration
+
+    def register_collector(self, name: str, collector: Callable[[], dict]):
+        self.collectors[name] = collector
+
+    def collect(self) -> dict:
+        values = {}
+        for name, collector in self.collectors.items():
+            try:
+                values[name] = {key: float(value) for key, value in collector().items()}
+            except Exception:
+                continue
+        return values
+
+    def snapshot(self) -> dict:
+        return {
+            'pid': os.getpid(),
+            'buckets': list(self.buckets),
+            'routes': [[method, route, metrics.snapshot()] for (method, route), metrics in self.routes.items()],
+            'collectors': self.collect(),
+        }
+
+    def render(self, snapshot: dict) -> str:
+        buckets = snapshot['buckets']
+        lines = [
+            '# HELP http_requests_total Total number of HTTP requests by route and status class.',
+            '# TYPE http_requests_total counter',
+        ]
+        for method, route, metrics in snapshot['routes']:
+            for status_class, count in sorted(metrics['statuses'].items()):
+                lines.append(f'http_requests_total{_labels(method=method, route=route, status=status_class)} {count}')
+
+        lines.append('# HELP http_request_duration_seconds HTTP request latency by route.')
+        lines.append('# TYPE http_request_duration_seconds histogram')
+        for method, route, metrics in snapshot['routes']:
+            cumulative = 0
+            for bound, count in zip([*map(_format_value, buckets), '+Inf'], metrics['buckets']):
+                cumulative += count
+                lines.append(f'http_request_duration_seconds_bucket{_labels(method=method, route=route, le=bound)} {cumulative}')
+            lines.append(f'http_request_duration_seconds_sum{_labels(method=method, route=route)} {_format_value(metrics["sum"])}')
+            lines.append(f'http_request_duration_seconds_count{_labels(method=method, route=route)} {metrics["count"]}')
+
+        lines.append('# HELP http_requests_in_flight HTTP requests currently being served by route.')
+        lines.append('# TYPE http_requests_in_flight gauge')
+        for method, route, metrics in snapshot['routes']:
+            lines.append(f'http_requests_in_flight{_labels(method=method, route=route)} {metrics["in_flight"]}')
+
+        for name, values in sorted(snapshot['collectors'].items()):
+            for key, value in sorted(values.items()):
+                lines.append(f'# TYPE {name}_{key} gauge')
+                lines.append(f'{name}_{key} {_format_value(value)}')
+
+        return '\n'.join(lines) + '\n'
+
+
+class MultiProcessCollector:
+    """
+    Aggregates the metrics of several worker processes sharing a directory.
+
+    Every worker periodically writes its snapshot to '<directory>/metrics-<pid>.json'.
+    Counters and histograms are summed over every file, in-flight requests and collector
+    gauges only over the workers that are still alive.
+
+    Attributes:
+        directory (str): Directory where the worker snapshots are stored.
+    Methods:
+        write(snapshot):
+            Atomically writes the snapshot of the current worker.
+        aggregate() -> dict:
+            Reads and merges the snapshots of every worker.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def write(self, snapshot: dict):
+        path = os.path.join(self.directory, f'metrics-{snapshot["pid"]}.json')
+        descriptor, temporary_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        with os.fdopen(descriptor, 'wb') as file:
+            file.write(orjson.dumps(snapshot))
+        os.replace(temporary_path, path)
+
+    def aggregate(self) -> dict:
+        routes = {}
+        collectors = {}
+        buckets = list(DEFAULT_BUCKETS)
+
+        for path in glob.glob(os.path.join(self.directory, 'metrics-*.json')):
+            try:
+                with open(path, 'rb') as file:
+                    snapshot = orjson.loads(file.read())
+            except (OSError, orjson.JSONDecodeError):
+                continue
+
+            alive = _is_alive(snapshot['pid'])
+            buckets = snapshot['buckets']
+
+            for method, route, metrics in snapshot['routes']:
+                merged = routes.setdefault((method, route), {
+                    'count': 0, 'statuses': {}, 'buckets': [0] * len(metrics['buckets']), 'sum': 0.0, 'in_flight': 0
+                })
+                merged['count'] += metrics['count']
+                merged['sum'] += metrics['sum']
+                merged['buckets'] = [a + b for a, b in zip(merged['buckets'], metrics['buckets'])]
+                for status_class, count in metrics['statuses'].items():
+                    merged['statuses'][status_class] = merged['statuses'].get(status_class, 0) + count
+                if alive:
+                    merged['in_flight'] += metrics['in_flight']
+
+            if alive:
+                for name, values in snapshot['collectors'].items():
+                    merged_values = collectors.setdefault(name, {})
+                    for key, value in values.items():
+                        merged_values[key] = merged_values.get(key, 0.0) + value
+
+        return {
+            'pid': os.getpid(),
+            'buckets': buckets,
+            'routes': [[method, route, metrics] for (method, route), metrics in routes.items()],
+            'collectors': collectors,
+        }
+
+
+def _is_alive(pid: int) -> bool:
+    if pid == os.getpid():
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _escape(value) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _labels(**labels) -> str:
+    return '{' + ','.join(f'{key}="{_escape(value)}"' for key, value in labels.items()) + '}'
+
+
+def _format_value(value: float) -> str:
+    return repr(float(value))
@@ -0,0 +1,154 @@
+import asyncio
+import cProfile
+import functools
+import hashlib
+import hmac
+import os
+import re
+import time
+from contextvars import ContextVar
+
+from fastapi import FastAPI
+from fastapi.routing import APIRoute
+
+PROFILE_NAME_PATTERN = re.compile(r'^[\w.-]+\.prof$')
+
+_active_profile: ContextVar['ProfileSlot | None'] = ContextVar('active_profile', default=None)
+
+
+class ProfileSlot:
+    """
+    Holds the profiler of the request being profiled.
+
+    Attributes:
+        name (str): File name the profile is stored under.
+        profile (cProfile.Profile | None): The profiler, set once the endpoint has run.
+    """
+    __slots__ = ('name', 'profile')
+
+    def __init__(self, name: str):
+        self.name = name
+        self.profile = None
+
+
+def start_profiling(name: str) -> tuple[ProfileSlot, object]:
+    slot = ProfileSlot(name)
+    return slot, _active_profile.set(slot)
+
+
+def stop_profiling(token):
+    _active_profile.reset(token)
+
+
+def sign(secret: str, method: str, path: str, timestamp: int | None = None) -> str:
+    """
+    Builds the value of the X-Profile header requesting a profile of one request.
+
+    Args:
+        secret (str): The shared profiling secret (PROFILING_SECRET).
+        method (str): HTTP method of the request to profile.
+        path (str): Path of the request to profile.
+        timestamp (int | None): Unix time of the signature, defaults to now.
+
+    Returns:
+        str: '<timestamp>:<hex HMAC-SHA256 of "<timestamp>:<method>:<path>">'.
+    """
+    timestamp = int(time.time()) if timestamp is None else timestamp
+    digest = hmac.new(secret.encode(), f'{timestamp}:{method}:{path}'.encode(), hashlib.sha256).hexdigest()
+    return f'{timestamp}:{digest}'
+
+
+def verify_signature(secret: str, value: str, method: str, path: str, max_age: int = 300) -> bool:
+    """
+    Checks an X-Profile header value built with sign() for the same method and path,
+    rejecting signatures older than max_age seconds.
+    """
+    timestamp, _, _ = value.partition(':')
+    if not timestamp.isdigit() or abs(time.time() - int(timestamp)) > max_age:
+        return False
+    return hmac.compare_digest(value, sign(secret, method, path, int(timestamp)))
+
+
+class ProfileStore:
+    """
+    Bounded directory of pstats files.
+
+    Attributes:
+        directory (str): Directory where the profiles are stored.
+        max_files (int): Maximum number of profiles kept, the oldest ones are deleted first.
+    Methods:
+        save(profile, name):
+            Dumps the profile and deletes the oldest profiles over max_files.
+        list() -> list[dict]:
+            Returns the stored profiles, newest first.
+        path(name) -> str | None:
+            Returns the path of a stored profile, or None if it does not exist.
+    """
+
+    def __init__(self, directory: str, max_files: int):
+        self.directory = directory
+        self.max_files = max_files
+        os.makedirs(directory, exist_ok=True)
+
+    def save(self, profile: cProfile.Profile, name: str):
+        profile.dump_stats(os.path.join(self.directory, name))
+        for stale in self.list()[self.max_files:]:
+            try:
+                os.remove(os.path.join(self.directory, stale['name']))
+            except FileNotFoundError:
+                pass
+
+    def list(self) -> list[dict]:
+        profiles = []
+        for entry in os.scandir(self.directory):
+            if entry.is_file() and PROFILE_NAME_PATTERN.match(entry.name):
+                stat = entry.stat()
+                profiles.append({'name': entry.name, 'size': stat.st_size, 'created_at': stat.st_mtime})
+        return sorted(profiles, key=lambda profile: profile['created_at'], reverse=True)
+
+    def path(self, name: str) -> str | None:
+        if not PROFILE_NAME_PATTERN.match(name):
+            return None
+        path = os.path.join(self.directory, name)
+        return path if os.path.isfile(path) else None
+
+
+def profiled(call):
+    """
+    Wraps an endpoint so it runs under cProfile when the current request is being profiled.
+
+    The profiler is enabled in the thread that runs the endpoint (the threadpool thread for
+    sync endpoints), so the profile contains the handler, repository and serialization work.
+    """
+    if asyncio.iscoroutinefunction(call):
+        @functools.wraps(call)
+        async def async_wrapper(*args, **kwargs):
+            slot = _active_profile.get()
+            if slot is None:
+                return await call(*args, **kwargs)
+            slot.profile = cProfile.Profile()
+            slot.profile.enable()
+            try:
+                return await call(*args, **kwargs)
+            finally:
+                slot.profile.disable()
+        return async_wrapper
+
+    @functools.wraps(call)
+    def wrapper(*args, **kwargs):
+        slot = _active_profile.get()
+        if slot is None:
+            return call(*args, **kwargs)
+        slot.profile = cProfile.Profile()
+        return slot.profile.runcall(call, *args, **kwargs)
+    return wrapper
+
+
+def install_profiling_hooks(app: FastAPI):
+    """
+    Wraps the endpoint of every API route of the app with profiled().
+    """
+    for route in app.routes:
+        if isinstance(route, APIRoute) and not getattr(route.dependant.call, '__profiled__', False):
+            route.dependant.call = profiled(route.dependant.call)
+            route.dependant.call.__profiled__ = True
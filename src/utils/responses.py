@@ -0,0 +1,28 @@
+from typing import Any
+
+import orjson
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+from src.utils.timing import span
+
+
+class EnvelopeResponse(JSONResponse):
+    """
+    EnvelopeResponse is the default response class of the application.
+
+    Pydantic models (the envelopes in src.schemas.responses and the pagination pages) are
+    serialized straight to bytes by the pydantic-core serializer, so handlers no longer need
+    to call model_dump() and have the resulting dict serialized a second time by the stdlib json.
+    Any other content (dicts, lists) is serialized with orjson.
+
+    Methods:
+        render(content) -> bytes:
+            Serializes the response content to JSON bytes.
+    """
+
+    def render(self, content: Any) -> bytes:
+        with span('serialize'):
+            if isinstance(content, BaseModel):
+                return content.__pydantic_serializer__.to_json(content)
+            return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
@@ -0,0 +1,106 @@
+import threading
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from typing import Callable, Hashable
+
+
+class SingleFlight:
+    """
+    Coalesces identical concurrent calls: the first caller of a key (the leader) runs the
+    function, the callers arriving while it runs wait for its result instead of running it again.
+
+    Only in-flight calls are shared, nothing is cached once the leader returns. The result is
+    handed to every waiter, so the function must return plain data (dicts, pydantic models), never
+    ORM objects bound to the leader's session. An exception raised by the leader is raised in every
+    waiter. Waiting is bounded: a waiter that times out runs the function itself.
+
+    Handlers run in the threadpool, so the flights are guarded by a lock.
+
+    Attributes:
+        timeout (float): Seconds a waiter waits for the leader.
+        enabled (bool): When False, every call runs the function.
+        calls (int): Calls made.
+        executions (int): Calls that ran the function.
+        shared (int): Calls answered with the result of another call.
+        timeouts (int): Waiters that gave up and ran the function.
+        errors (int): Executions that raised.
+    Methods:
+        do(key, function):
+            Returns the result of function, shared with the concurrent calls of the same key.
+        forget(key):
+            Makes the next call of key start a new flight, used after writes.
+        stats() -> dict:
+            Returns the counters exposed at /metrics.
+    """
+
+    def __init__(self, timeout: float, enabled: bool = True):
+        self.timeout = timeout
+        self.enabled = enabled
+        self.lock = threading.Lock()
+        self.flights: dict[Hashable, Future] = {}
+        self.calls = 0
+        self.executions = 0
+        self.shared = 0
+        self.timeouts = 0
+        self.errors = 0
+
+    def do(self, key: Hashable, function: Callable):
+        if not self.enabled:
+            return function()
+
+        with self.lock:
+            self.calls += 1
+            future = self.flights.get(key)
+            leader = future is None
+            if leader:
+                future = self.flights[key] = Future()
+            else:
+                self.shared += 1
+
+        if not leader:
+            try:
+                return future.result(timeout=self.timeout)
+            except FutureTimeoutError:
+                with self.lock:
+                    self.shared -= 1
+                    self.timeouts += 1
+                return self._execute(function)
+
+        try:
+            result = self._execute(function)
+        except BaseException as e:
+            self._land(key, future)
+            future.set_exception(e)
+            raise
+        self._land(key, future)
+        future.set_result(result)
+        return result
+
+    def forget(self, key: Hashable):
+        with self.lock:
+            self.flights.pop(key, None)
+
+    def stats(self) -> dict:
+        return {
+            'calls': self.calls,
+            'executions': self.executions,
+            'shared': self.shared,
+            'timeouts': self.timeouts,
+            'errors': self.errors,
+            'coalescing_ratio': self.shared / self.calls if self.calls else 0.0,
+        }
+
+    def _execute(self, function: Callable):
+        try:
+            return function()
+        except BaseException:
+            with self.lock:
+                self.errors += 1
+            raise
+        finally:
+            with self.lock:
+                self.executions += 1
+
+    def _land(self, key: Hashable, future: Future):
+        with self.lock:
+            if self.flights.get(key) is future:
+                del self.flights[key]
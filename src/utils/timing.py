@@ -0,0 +1,168 @@
+import atexit
+import os
+import queue
+import threading
+import time
+from contextvars import ContextVar
+
+import orjson
+
+_request_spans: ContextVar[list | None] = ContextVar('request_spans', default=None)
+
+
+class _NullSpan:
+    """
+    Span returned when no request is being timed, entering and exiting it does nothing.
+    """
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return None
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    """
+    Span measuring one stage of the current request, appended to the request spans on exit.
+    """
+    __slots__ = ('spans', 'name', 'start')
+
+    def __init__(self, spans: list, name: str):
+        self.spans = spans
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.spans.append((self.name, self.start, time.perf_counter_ns()))
+        return None
+
+
+def span(name: str):
+    """
+    Times a stage of the current request.
+
+    Usage:
+        with span('db.get_by_email'):
+            ...
+
+    When the request is not being timed (ServerTimingMiddleware not installed) a shared no-op
+    span is returned, so the instrumentation costs a context variable lookup.
+
+    Args:
+        name (str): Name of the stage, used as the Server-Timing metric name.
+    """
+    spans = _request_spans.get()
+    if spans is None:
+        return _NULL_SPAN
+    return _Span(spans, name)
+
+
+def start_request_timing() -> tuple[list, object]:
+    """
+    Starts collecting spans for the current request.
+
+    Returns:
+        tuple: The list receiving the spans and the token to pass to stop_request_timing.
+    """
+    spans = []
+    return spans, _request_spans.set(spans)
+
+
+def stop_request_timing(token):
+    _request_spans.reset(token)
+
+
+def server_timing_header(spans: list, total_ns: int) -> str:
+    """
+    Builds the Server-Timing header value, durations are in milliseconds.
+    """
+    metrics = [f'{name};dur={(end - start) / 1e6:.3f}' for name, start, end in spans]
+    metrics.append(f'total;dur={total_ns / 1e6:.3f}')
+    return ', '.join(metrics)
+
+
+class SpanFileExporter:
+    """
+    Writes request spans as OTLP/JSON lines (one ExportTraceServiceRequest per request) to a local file.
+
+    Spans are handed to a background thread through a bounded queue, so the request never waits
+    on the file; when the queue is full the request spans are dropped and counted.
+
+    Attributes:
+        path (str): File receiving the spans.
+        service_name (str): Value of the service.name resource attribute.
+        dropped (int): Number of requests whose spans were dropped.
+    Methods:
+        export(method, route, status_code, start_ns, end_ns, spans):
+            Enqueues the spans of a finished request.
+    """
+
+    def __init__(self, path: str, service_name: str, queue_size: int = 10000):
+        self.path = path
+        self.service_name = service_name
+        self.dropped = 0
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.thread = threading.Thread(target=self._run, name='SpanFileExporter', daemon=True)
+        self.thread.start()
+        atexit.register(self.close)
+
+    def export(self, method: str, route: str, status_code: int, start_ns: int, end_ns: int, spans: list):
+        try:
+            self.queue.put_nowait((time.time_ns() - time.perf_counter_ns(), method, route, status_code, start_ns, end_ns, spans))
+        except queue.Full:
+            self.dropped += 1
+
+    def close(self):
+        self.queue.put(None)
+        self.thread.join(timeout=5)
+
+    def _run(self):
+        with open(self.path, 'ab') as file:
+            while True:
+                item = self.queue.get()
+                if item is None:
+                    return
+                file.write(orjson.dumps(self._to_otlp(*item)) + b'\n')
+                if self.queue.empty():
+                    file.flush()
+
+    def _to_otlp(self, clock_offset, method, route, status_code, start_ns, end_ns, spans) -> dict:
+        trace_id = os.urandom(16).hex()
+        root_id = os.urandom(8).hex()
+        otlp_spans = [{
+            'traceId': trace_id,
+            'spanId': root_id,
+            'name': f'{method} {route}',
+            'kind': 2,
+            'startTimeUnixNano': str(start_ns + clock_offset),
+            'endTimeUnixNano': str(end_ns + clock_offset),
+            'attributes': [
+                {'key': 'http.request.method', 'value': {'stringValue': method}},
+                {'key': 'http.route', 'value': {'stringValue': route}},
+                {'key': 'http.response.status_code', 'value': {'intValue': str(status_code)}},
+            ],
+        }]
+        for name, span_start, span_end in spans:
+            otlp_spans.append({
+                'traceId': trace_id,
+                'spanId': os.urandom(8).hex(),
+                'parentSpanId': root_id,
+                'name': name,
+                'kind': 1,
+                'startTimeUnixNano': str(span_start + clock_offset),
+                'endTimeUnixNano': str(span_end + clock_offset),
+            })
+        return {
+            'resourceSpans': [{
+                'resource': {'attributes': [{'key': 'service.name', 'value': {'stringValue': self.service_name}}]},
+                'scopeSpans': [{'scope': {'name': 'src.utils.timing'}, 'spans': otlp_spans}],
+            }]
+        }
@@ -2,6 +2,7 @@ import jwt
 from abc import ABC, abstractmethod
 from datetime import datetime, timezone, timedelta
 from src.utils.config import Config
+from src.utils.timing import span
 
 settings = Config()
 class TokenBaseManager(ABC):
@@ -64,11 +65,12 @@ class JWTManager(TokenBaseManager):
                 'exp': datetime.now(tz=timezone.utc) + timedelta(minutes=self.expiration_in_minutes)
             }
             
-            token = jwt.encode(
-                payload,
-                key=self.secret_key,
-                algorithm=self.algorithm
-                )
+            with span('jwt.encode'):
+                token = jwt.encode(
+                    payload,
+                    key=self.secret_key,
+                    algorithm=self.algorithm
+                    )
         except Exception as e:
             raise ValueError(f"{e}")
         return token
@@ -85,11 +87,12 @@ class JWTManager(TokenBaseManager):
             jwt.InvalidTokenError: If the token is invalid for any reason.
         """
         try:
-            decoded_token = jwt.decode(
-            token, key=self.secret_key,
-            algorithms=[self.algorithm],
-            verify=True
-            )
+            with span('jwt.decode'):
+                decoded_token = jwt.decode(
+                token, key=self.secret_key,
+                algorithms=[self.algorithm],
+                verify=True
+                )
         except jwt.exceptions.ExpiredSignatureError:
             raise ValueError("Token has expired")
         except jwt.exceptions.InvalidTokenError:
@@ -0,0 +1,38 @@
+from fastapi.testclient import TestClient
+from faker import Faker
+
+from main import app
+
+
+def test_batch_get():
+    client = TestClient(app)
+    faker = Faker()
+
+    customers = []
+    for _ in range(2):
+        response = client.post('/api/v1/customers/', json={
+            'first_name': 'John',
+            'last_name': 'Doe',
+            'email': faker.email(),
+            'phone': '+1234567890',
+            'password': 'Asdfghjk1'
+        })
+        customers.append(response.json()['data'])
+    own, other = customers
+    headers = {'Authorization': f"Bearer {own['token']}"}
+    own_id, other_id = own['customer']['id'], other['customer']['id']
+
+    response = client.post('/api/v1/customers/batch-get', json={'ids': [other_id, 987654321, own_id, own_id]}, headers=headers)
+    assert response.status_code == 200
+    results = response.json()['data']['results']
+    assert [result['id'] for result in results] == [other_id, 987654321, own_id, own_id]
+    assert [result['status'] for result in results] == [403, 403, 200, 200]
+    assert results[2]['customer']['email'] == own['customer']['email']
+    assert 'password' not in results[2]['customer']
+    assert 'message' in results[1] and 'customer' not in results[1]
+
+    assert client.post('/api/v1/customers/batch-get', json={'ids': []}, headers=headers).status_code == 400
+    assert client.post('/api/v1/customers/batch-get', json={'ids': list(range(1001))}, headers=headers).status_code == 400
+    assert client.post('/api/v1/customers/batch-get', json={'ids': [own_id] * 1000}, headers=headers).status_code == 200
+    assert client.post('/api/v1/customers/batch-get', json={'ids': [10 ** 18] * 100000}, headers=headers).status_code == 413
+    assert client.post('/api/v1/customers/batch-get', json={'ids': [own_id]}).status_code == 403
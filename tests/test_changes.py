@@ -0,0 +1,72 @@
+from fastapi.testclient import TestClient
+from faker import Faker
+
+from main import app
+import src.api.customers
+
+
+def sync(client, since=None):
+    changes, deletions = [], []
+    while True:
+        response = client.get('/api/v1/customers/changes', params={'since': since, 'limit': 50} if since else {'limit': 50})
+        assert response.status_code == 200
+        data = response.json()['data']
+        changes += data['changes']
+        deletions += data['deletions']
+        since = data['next_cursor']
+        if not data['has_more']:
+            return changes, deletions, since
+
+
+def test_customer_changes(monkeypatch):
+    monkeypatch.setattr(src.api.customers.settings, 'change_feed_settle_seconds', 0)
+    client = TestClient(app)
+    faker = Faker()
+
+    payload = {
+        'first_name': 'John',
+        'last_name': 'Doe',
+        'email': faker.email(),
+        'phone': '+1234567890',
+        'password': 'Asdfghjk1'
+    }
+    response = client.post('/api/v1/customers/', json=payload)
+    customer_id = response.json()['data']['customer']['id']
+    token = response.json()['data']['token']
+
+    changes, _, cursor = sync(client)
+    created = next(change for change in changes if change['id'] == customer_id)
+    assert 'password' not in created
+
+    changes, deletions, cursor = sync(client, cursor)
+    assert changes == [] and deletions == []
+
+    response = client.put(f'/api/v1/customers/{customer_id}', json={**payload, 'first_name': 'Jane'}, headers={
+        'Authorization': f'Bearer {token}'
+    })
+    token = response.json()['data']['token']
+
+    changes, _, cursor = sync(client, cursor)
+    assert [change['id'] for change in changes] == [customer_id]
+    assert changes[0]['first_name'] == 'Jane'
+    assert changes[0]['updated_at'] > created['updated_at']
+
+    client.delete(f'/api/v1/customers/{customer_id}', headers={'Authorization': f'Bearer {token}'})
+
+    changes, deletions, cursor = sync(client, cursor)
+    assert changes == []
+    assert [deletion['id'] for deletion in deletions] == [customer_id]
+
+    response = client.get('/api/v1/customers/changes', params={'since': 'not-a-cursor'})
+    assert response.status_code == 400
+
+
+def test_expired_cursor():
+    client = TestClient(app)
+
+    response = client.get('/api/v1/customers/changes', params={'since': '2000-01-01T00:00:00Z'})
+    assert response.status_code == 410
+
+    _, _, cursor = sync(client)
+    response = client.get('/api/v1/customers/changes', params={'since': cursor})
+    assert response.status_code == 200
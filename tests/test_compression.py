@@ -0,0 +1,68 @@
+import orjson
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.middleware.compression import CompressionMiddleware
+from src.utils.compression import ResponseCompressor, negotiate
+from src.utils.responses import EnvelopeResponse
+
+compressor = ResponseCompressor(cache_entries=8)
+
+app = FastAPI(default_response_class=EnvelopeResponse)
+app.add_middleware(CompressionMiddleware, compressor=compressor, minimum_size=100, offload_size=1000)
+
+
+@app.get('/large')
+def large():
+    return EnvelopeResponse(content={'items': [{'id': index, 'email': f'customer{index}@example.com'} for index in range(100)]}, headers={'ETag': '"1.1"'})
+
+
+@app.get('/small')
+def small():
+    return {'id': 1}
+
+
+def test_negotiate():
+    assert negotiate('gzip, deflate') == 'gzip'
+    assert negotiate('gzip;q=0, identity') is None
+    assert negotiate('*') is not None
+    assert negotiate('') is None
+
+
+def test_compression():
+    client = TestClient(app)
+
+    response = client.get('/large', headers={'Accept-Encoding': 'gzip'})
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert response.headers['Vary'] == 'Accept-Encoding'
+    assert response.headers['ETag'] == '"1.1-gzip"'
+    assert int(response.headers['Content-Length']) < len(response.content)
+    assert response.json()['items'][99]['id'] == 99
+
+    client.get('/large', headers={'Accept-Encoding': 'gzip'})
+    assert compressor.cache_hits == 1
+
+    response = client.get('/small', headers={'Accept-Encoding': 'gzip'})
+    assert 'Content-Encoding' not in response.headers
+
+    response = client.get('/large', headers={'Accept-Encoding': 'identity'})
+    assert 'Content-Encoding' not in response.headers
+    assert response.headers['ETag'] == '"1.1"'
+
+
+@pytest.mark.parametrize('encoding, module, decompress', [
+    ('br', 'brotli', lambda module, body: module.decompress(body)),
+    ('zstd', 'zstandard', lambda module, body: module.ZstdDecompressor().decompress(body)),
+])
+def test_optional_encodings(encoding, module, decompress):
+    module = pytest.importorskip(module)
+    client = TestClient(app)
+
+    with client.stream('GET', '/large', headers={'Accept-Encoding': encoding}) as response:
+        assert response.headers['Content-Encoding'] == encoding
+        assert response.headers['ETag'] == f'"1.1-{encoding}"'
+        raw = b''.join(response.iter_raw())
+    assert int(response.headers['Content-Length']) == len(raw)
+    body = orjson.loads(decompress(module, raw))
+    assert body['items'][99]['email'] == 'customer99@example.com'
@@ -0,0 +1,39 @@
+from fastapi.testclient import TestClient
+
+from main import app
+from src.utils.limiter import AdaptiveLimiter
+
+client = TestClient(app)
+
+
+def test_priorities_share_the_limit():
+    limiter = AdaptiveLimiter(initial_limit=10, min_limit=2)
+
+    assert all(limiter.try_acquire('low') for _ in range(5))
+    assert not limiter.try_acquire('low')
+    assert all(limiter.try_acquire('normal') for _ in range(3))
+    assert not limiter.try_acquire('normal')
+    assert all(limiter.try_acquire('high') for _ in range(2))
+    assert not limiter.try_acquire('high')
+    assert limiter.stats()['shed_low'] == 1
+
+
+def test_pool_wait_decreases_the_limit():
+    limiter = AdaptiveLimiter(initial_limit=10, min_limit=2, pool_wait_threshold=0.05, cooldown=0)
+
+    for _ in range(30):
+        limiter.try_acquire('high')
+        limiter.release(0.01, pool_wait=0.2)
+
+    assert limiter.limit == 2
+    assert limiter.try_acquire('high')
+
+
+def test_shed_requests_get_503_with_retry_after(monkeypatch):
+    limiter = next(m.kwargs['limiter'] for m in app.user_middleware if 'limiter' in m.kwargs)
+    monkeypatch.setattr(limiter, 'in_flight', 10**6)
+
+    response = client.get('/api/v1/customers/')
+    assert response.status_code == 503
+    assert response.headers['Retry-After'] == '1'
+    assert client.get('/metrics').status_code == 200
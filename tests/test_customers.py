@@ -107,3 +107,45 @@ def test_customer_endpoints():
     })
 
     assert response.status_code == 204
+
+
+def test_validation_messages():
+    client = TestClient(app)
+
+    response = client.post('/api/v1/customers/', json={
+        'first_name': 'John',
+        'last_name': 'Doe',
+        'email': Faker().email(),
+        'phone': '+123',
+        'password': 'Ab1'
+    })
+
+    assert response.status_code == 400
+    assert {detail['field']: detail['message'] for detail in response.json()['details']} == {
+        'phone': 'Value error, Phone number should be 10-15 digits long',
+        'password': 'Value error, Password should be at least 8 characters long',
+    }
+
+    response = client.post('/api/v1/customers/', json={
+        'first_name': 'John',
+        'last_name': 'Doe',
+        'email': Faker().email(),
+        'phone': '+1234567890123456',
+        'password': 'Asdfghjk1'
+    })
+
+    assert response.json()['details'] == [{'field': 'phone', 'message': 'Value error, Phone number should be 10-15 digits long'}]
+
+    response = client.post('/api/v1/customers/', json={
+        'first_name': 'John1',
+        'last_name': 'Doe',
+        'email': 'test_email@mail',
+        'phone': '1234567890',
+        'password': 'Asdfghjk1'
+    })
+
+    assert {detail['field']: detail['message'] for detail in response.json()['details']} == {
+        'first_name': 'Value error, Only letters are allowed',
+        'email': 'Value error, Invalid email format, it should be like: test@example.com',
+        'phone': 'Value error, Phone number should start with +',
+    }
@@ -0,0 +1,83 @@
+import pytest
+from fastapi.testclient import TestClient
+from faker import Faker
+
+from main import app
+from src.database.connection import DatabaseConnection
+from src.database.email_filter import EmailFilter
+from src.utils.bloom import CountingBloomFilter
+
+
+@pytest.fixture
+def email_filter():
+    email_filter = EmailFilter()
+    email_filter._configure()
+    yield email_filter
+    email_filter._configure()
+
+
+def test_counting_bloom_filter():
+    bloom = CountingBloomFilter(capacity=1000, error_rate=0.01)
+    emails = [f'customer{index}@example.com' for index in range(1000)]
+    for email in emails:
+        bloom.add(email)
+
+    assert all(bloom.might_contain(email) for email in emails)
+    assert sum(bloom.might_contain(f'other{index}@example.com') for index in range(10000)) < 300
+
+    for email in emails[:500]:
+        bloom.remove(email)
+    assert all(bloom.might_contain(email) for email in emails[500:])
+    assert bloom.items == 500
+
+
+def test_signup_email_filter(email_filter):
+    client = TestClient(app)
+    faker = Faker()
+
+    payload = {
+        'first_name': 'John',
+        'last_name': 'Doe',
+        'email': faker.email(),
+        'phone': '+1234567890',
+        'password': 'Asdfghjk1'
+    }
+    response = client.post('/api/v1/customers/', json=payload)
+    customer_id = response.json()['data']['customer']['id']
+    token = response.json()['data']['token']
+
+    email_filter.warm(DatabaseConnection)
+    assert email_filter.ready
+
+    duplicates = email_filter.confirmed_duplicates
+    response = client.post('/api/v1/customers/', json=payload)
+    assert response.status_code == 400
+    assert response.json()['message'] == 'Customer already exists'
+    assert email_filter.confirmed_duplicates == duplicates + 1
+
+    checks = email_filter.checks
+    response = client.post('/api/v1/customers/', json={**payload, 'email': faker.email()})
+    assert response.status_code == 201
+    assert email_filter.checks == checks + 1
+
+    client.delete(f'/api/v1/customers/{customer_id}', headers={'Authorization': f'Bearer {token}'})
+    response = client.post('/api/v1/customers/', json=payload)
+    assert response.status_code == 201
+
+
+def test_email_taken_by_another_worker_is_added_once(email_filter):
+    client = TestClient(app)
+    payload = {
+        'first_name': 'John',
+        'last_name': 'Doe',
+        'email': Faker().email(),
+        'phone': '+1234567890',
+        'password': 'Asdfghjk1'
+    }
+    assert client.post('/api/v1/customers/', json=payload).status_code == 201
+
+    # Not warmed: the duplicate reaches the INSERT, as for an email created by another worker.
+    items = email_filter.bloom.items
+    for _ in range(2):
+        assert client.post('/api/v1/customers/', json=payload).status_code == 400
+    assert email_filter.bloom.items == items
@@ -0,0 +1,54 @@
+from fastapi.testclient import TestClient
+from faker import Faker
+
+from main import app
+from src.utils.etag import encoded_etag, etag_matches, version_etag
+
+
+def test_conditional_requests():
+    client = TestClient(app)
+    faker = Faker()
+
+    payload = {
+        'first_name': 'John',
+        'last_name': 'Doe',
+        'email': faker.email(),
+        'phone': '+1234567890',
+        'password': 'Asdfghjk1'
+    }
+    response = client.post('/api/v1/customers/', json=payload)
+    customer_id = response.json()['data']['customer']['id']
+    headers = {'Authorization': f"Bearer {response.json()['data']['token']}"}
+
+    response = client.get(f'/api/v1/customers/{customer_id}', headers=headers)
+    etag = response.headers['ETag']
+    assert etag == f'"{customer_id}.1"'
+    assert 'version' not in response.json()['data']
+
+    response = client.get(f'/api/v1/customers/{customer_id}', headers={**headers, 'If-None-Match': etag})
+    assert response.status_code == 304
+    assert response.content == b''
+
+    response = client.put(f'/api/v1/customers/{customer_id}', json=payload, headers={**headers, 'If-Match': '"0.0"'})
+    assert response.status_code == 412
+
+    response = client.put(f'/api/v1/customers/{customer_id}', json={**payload, 'first_name': 'Jane'}, headers={**headers, 'If-Match': etag})
+    assert response.status_code == 201
+    assert response.headers['ETag'] == f'"{customer_id}.2"'
+
+    response = client.get(f'/api/v1/customers/{customer_id}', headers={**headers, 'If-None-Match': etag})
+    assert response.status_code == 200
+
+    response = client.get('/api/v1/customers/')
+    etag = response.headers['ETag']
+    assert etag.startswith('W/')
+    assert client.get('/api/v1/customers/', headers={'If-None-Match': etag}).status_code == 304
+
+
+def test_encoded_etags():
+    etag = version_etag(1, 2)
+    assert encoded_etag(etag, 'gzip') == '"1.2-gzip"'
+    assert etag_matches(encoded_etag(etag, 'gzip'), etag, weak=False)
+    assert etag_matches(f'"0.1", {encoded_etag(etag, "br")}', etag)
+    assert not etag_matches(encoded_etag(version_etag(1, 1), 'zstd'), etag, weak=False)
+    assert not etag_matches(f'W/{etag}', etag, weak=False)
@@ -0,0 +1,97 @@
+from contextlib import contextmanager
+
+from fastapi.testclient import TestClient
+from faker import Faker
+
+from main import app
+import src.events.publisher
+from src.database.connection import DatabaseConnection, engine
+from src.database.models import CustomerEventModel
+from src.database.repository.customers import CustomerRepository
+from src.events.publisher import LOCK_NAME, OutboxPublisher
+from src.events.sinks import InMemorySink
+
+
+def test_customer_events(monkeypatch):
+    monkeypatch.setattr(CustomerRepository, 'record_events', True)
+    client = TestClient(app)
+    faker = Faker()
+    sink = InMemorySink()
+    publisher = OutboxPublisher(engine, sink, batch_size=2)
+
+    payload = {
+        'first_name': 'John',
+        'last_name': 'Doe',
+        'email': faker.email(),
+        'phone': '+1234567890',
+        'password': 'Asdfghjk1'
+    }
+    response = client.post('/api/v1/customers/', json=payload)
+    customer_id = response.json()['data']['customer']['id']
+    token = response.json()['data']['token']
+
+    response = client.put(f'/api/v1/customers/{customer_id}', json={**payload, 'first_name': 'Jane'}, headers={
+        'Authorization': f'Bearer {token}'
+    })
+    token = response.json()['data']['token']
+    client.delete(f'/api/v1/customers/{customer_id}', headers={'Authorization': f'Bearer {token}'})
+
+    while publisher.publish_batch():
+        pass
+
+    events = [event for event in sink.events if event['customer_id'] == customer_id]
+    assert [event['type'] for event in events] == ['customer.created', 'customer.updated', 'customer.deleted']
+    assert events[1]['data']['first_name'] == 'Jane'
+    assert 'password' not in events[0]['data']
+    assert [event['id'] for event in sink.events] == sorted(event['id'] for event in sink.events)
+    assert publisher.publish_batch() == 0
+    assert publisher.stats()['published'] == len(sink.events)
+
+
+class NamedLocks:
+    """
+    Stands in for MySQL named locks: a lock belongs to the DBAPI connection that took it, and
+    RELEASE_LOCK from another connection leaves it held.
+    """
+
+    def __init__(self):
+        self.owners = {}
+        self.acquired = 0
+
+    @contextmanager
+    def __call__(self, connection, name, timeout=0):
+        owner = connection.connection.dbapi_connection
+        if self.owners.get(name, owner) is not owner:
+            yield False
+            return
+        self.owners[name] = owner
+        self.acquired += 1
+        try:
+            yield True
+        finally:
+            if self.owners.get(name) is connection.connection.dbapi_connection:
+                del self.owners[name]
+
+
+def test_lock_is_released_after_each_batch(monkeypatch):
+    locks = NamedLocks()
+    monkeypatch.setattr(src.events.publisher, 'named_lock', locks)
+    sink = InMemorySink()
+    publisher = OutboxPublisher(engine, sink, batch_size=2)
+    while publisher.publish_batch():
+        pass
+
+    with DatabaseConnection() as db:
+        db.add_all([CustomerEventModel(customer_id=index, type='customer.created', payload='{}') for index in range(4)])
+        db.commit()
+
+    locks.owners[LOCK_NAME] = object()
+    assert publisher.publish_batch() == 0
+    del locks.owners[LOCK_NAME]
+
+    acquired = locks.acquired
+    assert publisher.publish_batch() == 2
+    assert publisher.publish_batch() == 2
+    assert locks.acquired == acquired + 2
+    assert locks.owners == {}
+    assert publisher.publish_batch() == 0
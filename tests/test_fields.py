@@ -0,0 +1,58 @@
+from fastapi.testclient import TestClient
+from faker import Faker
+
+from main import app
+
+
+def test_sparse_fieldsets():
+    client = TestClient(app)
+    faker = Faker()
+
+    response = client.post('/api/v1/customers/', json={
+        'first_name': 'John',
+        'last_name': 'Doe',
+        'email': faker.email(),
+        'phone': '+1234567890',
+        'password': 'Asdfghjk1'
+    })
+    customer = response.json()['data']['customer']
+    headers = {'Authorization': f"Bearer {response.json()['data']['token']}"}
+
+    response = client.get('/api/v1/customers/', params={'fields': 'id,email', 'size': 100})
+    assert response.status_code == 200
+    page = response.json()
+    assert page['total'] >= 1
+    assert all(list(item) == ['id', 'email'] for item in page['items'])
+
+    assert client.get('/api/v1/customers/', params={'fields': 'id,password'}).status_code == 400
+    assert client.get('/api/v1/customers/', params={'fields': ''}).status_code == 400
+
+    response = client.get(f"/api/v1/customers/{customer['id']}", params={'fields': 'email'}, headers=headers)
+    assert response.json()['data'] == {'email': customer['email']}
+
+    response = client.get(f"/api/v1/customers/{customer['id']}", headers=headers)
+    assert set(response.json()['data']) == {'id', 'first_name', 'last_name', 'email', 'phone'}
+
+
+def test_projection_etag():
+    client = TestClient(app)
+
+    response = client.post('/api/v1/customers/', json={
+        'first_name': 'John',
+        'last_name': 'Doe',
+        'email': Faker().email(),
+        'phone': '+1234567890',
+        'password': 'Asdfghjk1'
+    })
+    customer = response.json()['data']['customer']
+    headers = {'Authorization': f"Bearer {response.json()['data']['token']}"}
+
+    projected = client.get(f"/api/v1/customers/{customer['id']}", params={'fields': 'email'}, headers=headers)
+    etag = projected.headers['ETag']
+
+    response = client.get(f"/api/v1/customers/{customer['id']}", headers={**headers, 'If-None-Match': etag})
+    assert response.status_code == 200
+    assert response.headers['ETag'] != etag
+
+    response = client.get(f"/api/v1/customers/{customer['id']}", params={'fields': 'email'}, headers={**headers, 'If-None-Match': etag})
+    assert response.status_code == 304
@@ -0,0 +1,38 @@
+from fastapi.testclient import TestClient
+
+from main import app
+from src.api.health import prober
+
+
+def test_health_endpoints(monkeypatch):
+    client = TestClient(app)
+
+    assert client.get('/health/live').status_code == 200
+
+    monkeypatch.setattr(prober, 'checked_at', None)
+    assert client.get('/health/ready').status_code == 503
+
+    assert prober.probe()
+    response = client.get('/health/ready')
+    assert response.status_code == 200
+    assert response.json()['data']['checks'] == {'database': True, 'pool': True, 'schema': True, 'fresh': True}
+    assert response.json()['data']['schema_version'] == prober.expected_version
+
+    monkeypatch.setattr(prober, 'stale_after', -1)
+    assert client.get('/health/ready').status_code == 503
+
+
+def test_probe_error_is_not_exposed(monkeypatch):
+    def connect():
+        raise RuntimeError("Access denied for user 'admin'@'10.0.0.1'")
+
+    monkeypatch.setattr(prober.engine, 'connect', connect)
+    assert not prober.probe()
+
+    response = TestClient(app).get('/health/ready')
+    assert response.status_code == 503
+    assert response.json()['detail']['error'] == 'RuntimeError'
+    assert 'admin' not in response.text
+
+    monkeypatch.undo()
+    assert prober.probe()
@@ -0,0 +1,52 @@
+import asyncio
+import uuid
+
+from fastapi.testclient import TestClient
+from faker import Faker
+
+from main import app
+from src.utils.idempotency import InMemoryIdempotencyStore
+
+
+def test_retried_signup_is_replayed():
+    client = TestClient(app)
+    payload = {
+        'first_name': 'John',
+        'last_name': 'Doe',
+        'email': Faker().email(),
+        'phone': '+1234567890',
+        'password': 'Asdfghjk1'
+    }
+    headers = {'Idempotency-Key': str(uuid.uuid4())}
+
+    first = client.post('/api/v1/customers/', json=payload, headers=headers)
+    assert first.status_code == 201
+
+    retry = client.post('/api/v1/customers/', json=payload, headers=headers)
+    assert retry.status_code == 201
+    assert retry.headers['Idempotent-Replayed'] == 'true'
+    assert retry.json() == first.json()
+
+    response = client.post('/api/v1/customers/', json={**payload, 'first_name': 'Jane'}, headers=headers)
+    assert response.status_code == 422
+
+    response = client.post('/api/v1/customers/', json=payload, headers={'Idempotency-Key': str(uuid.uuid4())})
+    assert response.status_code == 400
+
+
+def test_waiters_get_the_in_flight_response():
+    async def scenario():
+        store = InMemoryIdempotencyStore(max_entries=2, ttl=60)
+        assert await store.reserve('key', 'fingerprint') is None
+        assert (await store.reserve('key', 'fingerprint'))['status'] is None
+
+        waiter = asyncio.create_task(store.wait('key', timeout=5))
+        await asyncio.sleep(0)
+        await store.complete('key', {'fingerprint': 'fingerprint', 'status': 201, 'headers': [], 'body': b'{}'})
+        assert (await waiter)['status'] == 201
+
+        await store.reserve('other', 'fingerprint')
+        await store.reserve('third', 'fingerprint')
+        assert await store.get('key') is None
+
+    asyncio.run(scenario())
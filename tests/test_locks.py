@@ -0,0 +1,65 @@
+import pytest
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import QueuePool
+
+from src.database.locks import named_lock
+
+
+@pytest.fixture
+def engine(tmp_path):
+    """
+    SQLite engine answering GET_LOCK and RELEASE_LOCK as MySQL does: a lock belongs to the
+    connection that took it, and releasing it from another connection returns 0.
+    """
+    engine = create_engine(f"sqlite:///{tmp_path / 'locks.db'}", poolclass=QueuePool)
+    engine.dialect.name = 'mysql'
+    engine.owners = {}
+    engine.releases = []
+
+    @event.listens_for(engine, 'connect')
+    def register_lock_functions(dbapi_connection, connection_record):
+        def get_lock(name, timeout):
+            if engine.owners.setdefault(name, dbapi_connection) is not dbapi_connection:
+                return 0
+            return 1
+
+        def release_lock(name):
+            released = engine.owners.get(name) is dbapi_connection
+            if released:
+                del engine.owners[name]
+            engine.releases.append(released)
+            return int(released)
+
+        dbapi_connection.create_function('GET_LOCK', 2, get_lock)
+        dbapi_connection.create_function('RELEASE_LOCK', 1, release_lock)
+
+    yield engine
+    engine.dispose()
+
+
+def test_lock_survives_commits_of_a_bound_session(engine):
+    with engine.connect() as connection, named_lock(connection, 'job') as acquired:
+        assert acquired
+        owner = connection.connection.dbapi_connection
+        with Session(connection) as db:
+            db.execute(text('CREATE TABLE jobs (id INTEGER PRIMARY KEY)'))
+            db.commit()
+            db.execute(text('INSERT INTO jobs (id) VALUES (1)'))
+            db.commit()
+        assert engine.owners == {'job': owner}
+
+        with engine.connect() as other, named_lock(other, 'job') as other_acquired:
+            assert not other_acquired
+
+    assert engine.releases == [True]
+    assert engine.owners == {}
+
+    with engine.connect() as connection:
+        assert connection.execute(text('SELECT COUNT(*) FROM jobs')).scalar() == 1
+
+
+def test_session_is_rejected(engine):
+    with Session(engine) as db, pytest.raises(TypeError):
+        with named_lock(db, 'job'):
+            pass
@@ -0,0 +1,27 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from main import app
+
+
+def test_metrics_endpoint():
+    client = TestClient(app)
+
+    response = client.get('/api/v1/customers/')
+
+    assert response.status_code == 200
+
+    response = client.get('/api/v1/customers/6456482840')
+
+    assert response.status_code == 403
+
+    response = client.get('/metrics')
+
+    assert response.status_code == 200
+    assert response.headers['content-type'].startswith('text/plain')
+    assert 'http_requests_total{method="GET",route="/api/v1/customers/",status="2xx"}' in response.text
+    assert 'http_requests_total{method="GET",route="/api/v1/customers/{id}",status="4xx"}' in response.text
+    assert 'http_request_duration_seconds_bucket{method="GET",route="/api/v1/customers/",le="+Inf"}' in response.text
+    assert 'http_requests_in_flight{method="GET",route="/metrics"} 1' in response.text
+    assert 'db_pool_size' in response.text
+    assert 'statement_cache_hit_ratio' in response.text
@@ -0,0 +1,82 @@
+import time
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.api.admin import get_profile_store, router as admin_router
+from src.middleware.profiling import ProfilingMiddleware
+from src.utils import dependencies
+from src.utils.profiling import ProfileStore, install_profiling_hooks, sign, verify_signature
+
+SECRET = 'profiling-secret'
+
+
+@pytest.fixture
+def store(tmp_path):
+    return ProfileStore(str(tmp_path), max_files=2)
+
+
+@pytest.fixture
+def client(store, monkeypatch):
+    monkeypatch.setattr(dependencies.settings, 'profiling_secret', SECRET)
+
+    app = FastAPI()
+    app.add_middleware(ProfilingMiddleware, store=store, secret=SECRET)
+    app.include_router(admin_router)
+    app.dependency_overrides[get_profile_store] = lambda: store
+
+    @app.get('/work')
+    def work():
+        return {'total': sum(range(1000))}
+
+    install_profiling_hooks(app)
+    return TestClient(app)
+
+
+def test_verify_signature():
+    value = sign(SECRET, 'GET', '/work')
+    assert verify_signature(SECRET, value, 'GET', '/work')
+    assert not verify_signature(SECRET, value, 'POST', '/work')
+    assert not verify_signature(SECRET, value, 'GET', '/other')
+    assert not verify_signature('other-secret', value, 'GET', '/work')
+
+    timestamp, _, digest = value.partition(':')
+    assert not verify_signature(SECRET, f'{timestamp}:{digest[::-1]}', 'GET', '/work')
+    assert not verify_signature(SECRET, f'{int(timestamp) + 1}:{digest}', 'GET', '/work')
+    assert not verify_signature(SECRET, sign(SECRET, 'GET', '/work', int(time.time()) - 301), 'GET', '/work')
+    assert not verify_signature(SECRET, 'not-a-signature', 'GET', '/work')
+
+
+def test_profiled_request(client):
+    assert 'X-Profile-Id' not in client.get('/work').headers
+    assert 'X-Profile-Id' not in client.get('/work', headers={'X-Profile': sign('other-secret', 'GET', '/work')}).headers
+    expired = sign(SECRET, 'GET', '/work', int(time.time()) - 301)
+    assert 'X-Profile-Id' not in client.get('/work', headers={'X-Profile': expired}).headers
+
+    response = client.get('/work', headers={'X-Profile': sign(SECRET, 'GET', '/work')})
+    assert response.status_code == 200
+    name = response.headers['X-Profile-Id']
+
+    assert client.get('/admin/profiles/').status_code == 401
+    assert client.get('/admin/profiles/', headers={'X-Admin-Token': 'wrong'}).status_code == 401
+    assert client.get(f'/admin/profiles/{name}', headers={'X-Admin-Token': 'wrong'}).status_code == 401
+
+    headers = {'X-Admin-Token': SECRET}
+    response = client.get('/admin/profiles/', headers=headers)
+    assert response.status_code == 200
+    assert [profile['name'] for profile in response.json()['data']] == [name]
+
+    response = client.get(f'/admin/profiles/{name}', headers=headers)
+    assert response.status_code == 200
+    assert response.content
+
+    assert client.get('/admin/profiles/missing.prof', headers=headers).status_code == 404
+
+
+def test_profile_store_rejects_paths(store, tmp_path):
+    (tmp_path.parent / 'x.prof').write_bytes(b'')
+
+    assert store.path('../x.prof') is None
+    assert store.path('x.prof') is None
+    assert store.path('profile.txt') is None
@@ -0,0 +1,74 @@
+from datetime import datetime, timedelta, timezone
+
+from fastapi.testclient import TestClient
+from faker import Faker
+from sqlalchemy import select
+
+from main import app
+from src.database.connection import DatabaseConnection, engine
+from src.database.models import CustomerModel, CustomerTombstoneModel
+from src.database.purger import SoftDeletePurger
+
+
+def test_soft_delete_and_purge():
+    client = TestClient(app)
+    faker = Faker()
+
+    payload = {
+        'first_name': 'John',
+        'last_name': 'Doe',
+        'email': faker.email(),
+        'phone': '+1234567890',
+        'password': 'Asdfghjk1'
+    }
+    response = client.post('/api/v1/customers/', json=payload)
+    customer_id = response.json()['data']['customer']['id']
+    token = response.json()['data']['token']
+
+    response = client.delete(f'/api/v1/customers/{customer_id}', headers={'Authorization': f'Bearer {token}'})
+    assert response.status_code == 204
+
+    response = client.get(f'/api/v1/customers/{customer_id}', headers={'Authorization': f'Bearer {token}'})
+    assert response.status_code == 404
+
+    response = client.post('/api/v1/auth/login', json={'email': payload['email'], 'password': payload['password']})
+    assert response.status_code == 404
+
+    with DatabaseConnection() as db:
+        customer = db.scalars(select(CustomerModel).where(CustomerModel.id == customer_id)).one()
+        assert customer.deleted_at is not None
+
+    response = client.post('/api/v1/customers/', json=payload)
+    assert response.status_code == 201
+
+    purger = SoftDeletePurger(engine, batch_size=10)
+    while purger.purge_batch():
+        pass
+
+    with DatabaseConnection() as db:
+        assert db.scalars(select(CustomerModel).where(CustomerModel.id == customer_id)).first() is None
+        assert db.scalars(select(CustomerModel).where(CustomerModel.deleted_at.is_not(None))).first() is None
+    assert purger.stats()['purged'] >= 1
+
+
+def test_purge_expired_tombstones():
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    with DatabaseConnection() as db:
+        expired = CustomerTombstoneModel(customer_id=987654321, deleted_at=now - timedelta(days=8))
+        recent = CustomerTombstoneModel(customer_id=987654322, deleted_at=now - timedelta(days=6))
+        db.add_all([expired, recent])
+        db.commit()
+        expired_id, recent_id = expired.id, recent.id
+
+    purger = SoftDeletePurger(engine, batch_size=10, tombstone_retention=timedelta(days=7).total_seconds())
+    while purger.purge_batch():
+        pass
+
+    with DatabaseConnection() as db:
+        assert db.get(CustomerTombstoneModel, expired_id) is None
+        assert db.get(CustomerTombstoneModel, recent_id) is not None
+    assert purger.stats()['tombstones_purged'] >= 1
+
+    with DatabaseConnection() as db:
+        db.delete(db.get(CustomerTombstoneModel, recent_id))
+        db.commit()
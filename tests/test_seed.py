@@ -0,0 +1,14 @@
+from src.database.seed import generate_rows
+from src.schemas.requests import CustomerRequestBody
+
+
+def test_generate_rows():
+    rows = generate_rows(seed=7, start=100, count=500)
+
+    assert rows == generate_rows(seed=7, start=100, count=500)
+    assert rows != generate_rows(seed=8, start=100, count=500)
+    assert len({row['email'] for row in rows}) == len(rows)
+
+    for row in rows:
+        CustomerRequestBody(**{key: row[key] for key in CustomerRequestBody.model_fields})
+        assert row['created_at'] <= row['updated_at']
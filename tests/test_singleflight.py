@@ -0,0 +1,74 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from src.utils.singleflight import SingleFlight
+
+
+def test_concurrent_calls_share_one_execution():
+    flight = SingleFlight(timeout=5)
+    started = threading.Event()
+    release = threading.Event()
+    executions = []
+
+    def load():
+        executions.append(1)
+        started.set()
+        release.wait(5)
+        return {'id': 1}
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        leader = executor.submit(flight.do, 'key', load)
+        started.wait(5)
+        followers = [executor.submit(flight.do, 'key', load) for _ in range(7)]
+        while flight.shared < 7:
+            time.sleep(0.001)
+        release.set()
+        results = [leader.result()] + [follower.result() for follower in followers]
+
+    assert executions == [1]
+    assert all(result == {'id': 1} for result in results)
+    assert flight.stats()['coalescing_ratio'] == 7 / 8
+    assert flight.flights == {}
+
+
+def test_errors_propagate_to_waiters():
+    flight = SingleFlight(timeout=5)
+    release = threading.Event()
+
+    def failing():
+        release.wait(5)
+        raise ValueError('database unavailable')
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        leader = executor.submit(flight.do, 'key', failing)
+        while 'key' not in flight.flights:
+            time.sleep(0.001)
+        follower = executor.submit(flight.do, 'key', lambda: 'unused')
+        while flight.shared < 1:
+            time.sleep(0.001)
+        release.set()
+        for call in (leader, follower):
+            with pytest.raises(ValueError):
+                call.result()
+
+    assert flight.executions == 1
+    assert flight.errors == 1
+
+
+def test_waiting_is_bounded():
+    flight = SingleFlight(timeout=0.05)
+    release = threading.Event()
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        leader = executor.submit(flight.do, 'key', lambda: release.wait(5) and 'leader result')
+        while 'key' not in flight.flights:
+            time.sleep(0.001)
+        assert flight.do('key', lambda: 'own result') == 'own result'
+        release.set()
+        assert leader.result() == 'leader result'
+
+    assert flight.timeouts == 1
+    assert flight.executions == 2
@@ -0,0 +1,61 @@
+import orjson
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from faker import Faker
+
+from main import app as main_app
+from src.api.router import version_router
+from src.middleware.timing import ServerTimingMiddleware
+from src.utils.timing import SpanFileExporter
+
+
+def create_app(**options) -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(ServerTimingMiddleware, **options)
+    app.include_router(version_router)
+    return app
+
+
+def signup(client: TestClient):
+    return client.post('/api/v1/customers/', json={
+        'first_name': 'John',
+        'last_name': 'Doe',
+        'email': Faker().email(),
+        'phone': '+1234567890',
+        'password': 'Asdfghjk1'
+    })
+
+
+def test_server_timing_header():
+    response = signup(TestClient(create_app()))
+    assert response.status_code == 201
+
+    metrics = dict(metric.split(';dur=') for metric in response.headers['Server-Timing'].split(', '))
+    assert {'validate', 'db.commit', 'db.refresh', 'jwt.encode', 'serialize', 'total'} <= set(metrics)
+    assert all(float(duration) >= 0 for duration in metrics.values())
+
+    assert 'Server-Timing' not in signup(TestClient(main_app)).headers
+
+
+def test_span_file_exporter(tmp_path):
+    path = tmp_path / 'spans.jsonl'
+    exporter = SpanFileExporter(str(path), 'customers-api')
+
+    response = signup(TestClient(create_app(emit_header=False, exporter=exporter)))
+    assert response.status_code == 201
+    assert 'Server-Timing' not in response.headers
+    exporter.close()
+
+    lines = path.read_bytes().splitlines()
+    assert len(lines) == 1
+    resource_spans = orjson.loads(lines[0])['resourceSpans'][0]
+    assert resource_spans['resource']['attributes'] == [{'key': 'service.name', 'value': {'stringValue': 'customers-api'}}]
+
+    root, *children = resource_spans['scopeSpans'][0]['spans']
+    assert root['name'] == 'POST /api/v1/customers/'
+    assert {'key': 'http.response.status_code', 'value': {'intValue': '201'}} in root['attributes']
+    assert {'db.commit', 'serialize'} <= {child['name'] for child in children}
+    for child in children:
+        assert child['traceId'] == root['traceId'] and len(child['traceId']) == 32
+        assert child['parentSpanId'] == root['spanId']
+        assert int(root['startTimeUnixNano']) <= int(child['startTimeUnixNano']) <= int(child['endTimeUnixNano'])